@@ -0,0 +1,65 @@
+"""Add (jd_id, lower(name), lower(company)) natural key to search
+
+Revision ID: 27643eda7bb4
+Revises: 287eb216fccf
+Create Date: 2026-10-19 12:21:54.310877
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '27643eda7bb4'
+down_revision: Union[str, None] = '287eb216fccf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Must stay in sync with search_dedup_key() in searcher_apollo_web.py.
+SET_KEY_FN = """
+CREATE OR REPLACE FUNCTION search_set_dedup_key() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.dedup_key := lower(btrim(coalesce(NEW.profile_name, ''))) || '|' || lower(btrim(coalesce(NEW.company, '')));
+    RETURN NEW;
+END;
+$$;
+"""
+
+# Only the earliest row of each existing duplicate group gets a key; later
+# duplicates keep NULL so the unique index can be built without deleting data.
+BACKFILL = """
+UPDATE search s SET dedup_key = k.dedup_key
+FROM (
+    SELECT profile_id,
+           lower(btrim(coalesce(profile_name, ''))) || '|' || lower(btrim(coalesce(company, ''))) AS dedup_key,
+           row_number() OVER (
+               PARTITION BY jd_id, lower(btrim(coalesce(profile_name, ''))), lower(btrim(coalesce(company, '')))
+               ORDER BY created_at, profile_id
+           ) AS rn
+    FROM search
+) k
+WHERE s.profile_id = k.profile_id AND k.rn = 1;
+"""
+
+
+def upgrade() -> None:
+    op.add_column('search', sa.Column('dedup_key', sa.Text(), nullable=True))
+    op.execute(BACKFILL)
+    op.execute(SET_KEY_FN)
+    # BEFORE triggers run ahead of ON CONFLICT arbitration, so upserts can
+    # target (jd_id, dedup_key) without the client sending the key.
+    op.execute(
+        "CREATE TRIGGER trg_search_set_dedup_key BEFORE INSERT OR UPDATE OF profile_name, company "
+        "ON search FOR EACH ROW EXECUTE FUNCTION search_set_dedup_key()"
+    )
+    op.create_index('uq_search_jd_dedup_key', 'search', ['jd_id', 'dedup_key'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_search_jd_dedup_key', table_name='search')
+    op.execute("DROP TRIGGER IF EXISTS trg_search_set_dedup_key ON search")
+    op.execute("DROP FUNCTION IF EXISTS search_set_dedup_key()")
+    op.drop_column('search', 'dedup_key')
@@ -0,0 +1,177 @@
+"""Add trigger-maintained jd_stats table
+
+Revision ID: 287eb216fccf
+Revises: 58b4e7610371
+Create Date: 2026-10-19 11:40:18.902144
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '287eb216fccf'
+down_revision: Union[str, None] = '58b4e7610371'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+APPLY_FN = """
+CREATE OR REPLACE FUNCTION jd_stats_apply(
+    p_jd_id uuid,
+    d_sourced integer,
+    d_resume integer,
+    d_ranked integer,
+    d_favorited integer,
+    d_contacted integer,
+    p_score numeric,
+    d_score integer
+) RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    bucket integer;
+BEGIN
+    IF p_jd_id IS NULL THEN
+        RETURN;
+    END IF;
+
+    -- Skip JDs that are being deleted (cascading child deletes fire these triggers).
+    INSERT INTO jd_stats (jd_id, score_histogram)
+    SELECT p_jd_id, array_fill(0, ARRAY[10])
+    WHERE EXISTS (SELECT 1 FROM jds WHERE jd_id = p_jd_id)
+    ON CONFLICT (jd_id) DO NOTHING;
+
+    UPDATE jd_stats SET
+        sourced_count = sourced_count + d_sourced,
+        resume_count = resume_count + d_resume,
+        ranked_count = ranked_count + d_ranked,
+        favorited_count = favorited_count + d_favorited,
+        contacted_count = contacted_count + d_contacted,
+        updated_at = now()
+    WHERE jd_id = p_jd_id;
+
+    IF d_score <> 0 AND p_score IS NOT NULL THEN
+        bucket := least(greatest(floor(p_score / 10)::integer, 0), 9) + 1;
+        UPDATE jd_stats SET score_histogram[bucket] = score_histogram[bucket] + d_score
+        WHERE jd_id = p_jd_id;
+    END IF;
+END;
+$$;
+"""
+
+RANKED_TRIGGER_FN = """
+CREATE OR REPLACE FUNCTION jd_stats_ranked_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM jd_stats_apply(OLD.jd_id, 0, 0, -1, -(OLD.favorite::integer), -(OLD.outreached::integer),
+                               coalesce(OLD.match_score, 0), -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM jd_stats_apply(NEW.jd_id, 0, 0, 1, NEW.favorite::integer, NEW.outreached::integer,
+                               coalesce(NEW.match_score, 0), 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+"""
+
+SOURCE_TRIGGER_FN = """
+CREATE OR REPLACE FUNCTION jd_stats_source_trigger() RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    is_resume boolean := TG_TABLE_NAME = 'resume';
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM jd_stats_apply(OLD.jd_id, CASE WHEN is_resume THEN 0 ELSE -1 END,
+                               CASE WHEN is_resume THEN -1 ELSE 0 END, 0, 0, 0, NULL, 0);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM jd_stats_apply(NEW.jd_id, CASE WHEN is_resume THEN 0 ELSE 1 END,
+                               CASE WHEN is_resume THEN 1 ELSE 0 END, 0, 0, 0, NULL, 0);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+"""
+
+BACKFILL = """
+INSERT INTO jd_stats (jd_id, sourced_count, resume_count, ranked_count, favorited_count, contacted_count, score_histogram)
+SELECT
+    j.jd_id,
+    coalesce((SELECT count(*) FROM search s WHERE s.jd_id = j.jd_id), 0),
+    coalesce((SELECT count(*) FROM resume r WHERE r.jd_id = j.jd_id), 0),
+    coalesce(rk.ranked, 0),
+    coalesce(rk.favorited, 0),
+    coalesce(rk.contacted, 0),
+    ARRAY(
+        SELECT (
+            SELECT count(*)
+            FROM (
+                SELECT match_score FROM ranked_candidates WHERE jd_id = j.jd_id
+                UNION ALL
+                SELECT match_score FROM ranked_candidates_from_resume WHERE jd_id = j.jd_id
+            ) u
+            WHERE least(greatest(floor(coalesce(u.match_score, 0) / 10)::integer, 0), 9) = b
+        )::integer
+        FROM generate_series(0, 9) AS b
+        ORDER BY b
+    )
+FROM jds j
+LEFT JOIN (
+    SELECT jd_id, count(*) AS ranked, sum(favorite::integer) AS favorited, sum(outreached::integer) AS contacted
+    FROM (
+        SELECT jd_id, favorite, outreached FROM ranked_candidates
+        UNION ALL
+        SELECT jd_id, favorite, outreached FROM ranked_candidates_from_resume
+    ) all_ranked
+    GROUP BY jd_id
+) rk ON rk.jd_id = j.jd_id
+ON CONFLICT (jd_id) DO NOTHING;
+"""
+
+RANKED_TABLES = ("ranked_candidates", "ranked_candidates_from_resume")
+SOURCE_TABLES = ("search", "resume")
+
+
+def upgrade() -> None:
+    op.create_table('jd_stats',
+    sa.Column('jd_id', sa.UUID(), nullable=False),
+    sa.Column('sourced_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('resume_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('ranked_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('favorited_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('contacted_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('score_histogram', postgresql.ARRAY(sa.Integer()), server_default=sa.text('array_fill(0, ARRAY[10])'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['jd_id'], ['jds.jd_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('jd_id')
+    )
+
+    op.execute(APPLY_FN)
+    op.execute(RANKED_TRIGGER_FN)
+    op.execute(SOURCE_TRIGGER_FN)
+
+    # Backfill before the triggers exist so existing rows are counted exactly once.
+    op.execute(BACKFILL)
+
+    for table in RANKED_TABLES:
+        op.execute(
+            f"CREATE TRIGGER trg_jd_stats_{table} AFTER INSERT OR DELETE "
+            f"OR UPDATE OF jd_id, match_score, favorite, outreached ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION jd_stats_ranked_trigger()"
+        )
+    for table in SOURCE_TABLES:
+        op.execute(
+            f"CREATE TRIGGER trg_jd_stats_{table} AFTER INSERT OR DELETE OR UPDATE OF jd_id ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION jd_stats_source_trigger()"
+        )
+
+
+def downgrade() -> None:
+    for table in SOURCE_TABLES + RANKED_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_jd_stats_{table} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS jd_stats_source_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS jd_stats_ranked_trigger()")
+    op.execute("DROP FUNCTION IF EXISTS jd_stats_apply(uuid, integer, integer, integer, integer, integer, numeric, integer)")
+    op.drop_table('jd_stats')
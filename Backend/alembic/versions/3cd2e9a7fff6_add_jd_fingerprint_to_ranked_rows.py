@@ -0,0 +1,49 @@
+"""Add jds.summary_fingerprint and ranked rows' jd_fingerprint
+
+Revision ID: 3cd2e9a7fff6
+Revises: 3d91a6519862
+Create Date: 2026-10-19 13:48:02.551907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3cd2e9a7fff6'
+down_revision: Union[str, None] = '3d91a6519862'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# MD5 of the JD fields the rankers put in their prompts (md5/chr are immutable,
+# as generated columns require). A ranked row whose
+# jd_fingerprint differs from its JD's summary_fingerprint was scored against
+# an older version of the JD and is picked up again by the next rerank.
+FINGERPRINT_SQL = (
+    "md5(coalesce(role, '') || chr(31) || coalesce(experience_required, '') || chr(31) || coalesce(jd_parsed_summary, ''))"
+)
+
+RANKED_TABLES = ("ranked_candidates", "ranked_candidates_from_resume")
+
+
+def upgrade() -> None:
+    op.add_column(
+        'jds',
+        sa.Column('summary_fingerprint', sa.Text(), sa.Computed(FINGERPRINT_SQL, persisted=True), nullable=True),
+    )
+    for table in RANKED_TABLES:
+        op.add_column(table, sa.Column('jd_fingerprint', sa.Text(), nullable=True))
+        # Existing rankings are assumed current; only later JD edits mark them stale.
+        op.execute(
+            f"UPDATE {table} r SET jd_fingerprint = j.summary_fingerprint "
+            f"FROM jds j WHERE j.jd_id = r.jd_id"
+        )
+
+
+def downgrade() -> None:
+    for table in RANKED_TABLES:
+        op.drop_column(table, 'jd_fingerprint')
+    op.drop_column('jds', 'summary_fingerprint')
@@ -0,0 +1,56 @@
+"""Add org-scoped parse_cache and resume.content_hash
+
+Revision ID: 3d91a6519862
+Revises: 27643eda7bb4
+Create Date: 2026-10-19 13:05:27.418330
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d91a6519862'
+down_revision: Union[str, None] = '27643eda7bb4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Cache hits only bump a counter; the function keeps that to one round trip.
+HIT_FN = """
+CREATE OR REPLACE FUNCTION parse_cache_hit(p_scope_id uuid, p_kind text, p_content_hash text)
+RETURNS jsonb LANGUAGE sql AS $$
+    UPDATE parse_cache SET hit_count = hit_count + 1
+    WHERE scope_id = p_scope_id AND kind = p_kind AND content_hash = p_content_hash
+    RETURNING parsed;
+$$;
+"""
+
+
+def upgrade() -> None:
+    op.create_table(
+        'parse_cache',
+        sa.Column('scope_id', sa.UUID(), nullable=False),
+        sa.Column('kind', sa.Text(), nullable=False),
+        sa.Column('content_hash', sa.CHAR(64), nullable=False),
+        sa.Column('parsed', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('hit_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.CheckConstraint("kind IN ('resume', 'jd')", name='ck_parse_cache_kind'),
+        sa.PrimaryKeyConstraint('scope_id', 'kind', 'content_hash'),
+    )
+    op.execute(HIT_FN)
+
+    # Existing rows keep NULL; only new uploads are checked for duplicates.
+    op.add_column('resume', sa.Column('content_hash', sa.CHAR(64), nullable=True))
+    op.create_index('ix_resume_jd_content_hash', 'resume', ['jd_id', 'content_hash'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_resume_jd_content_hash', table_name='resume')
+    op.drop_column('resume', 'content_hash')
+    op.execute("DROP FUNCTION IF EXISTS parse_cache_hit(uuid, text, text)")
+    op.drop_table('parse_cache')
@@ -0,0 +1,36 @@
+"""Add keyset pagination indexes on ranked candidate tables
+
+Revision ID: 58b4e7610371
+Revises: b0e238c1f1ed
+Create Date: 2026-10-19 10:12:04.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '58b4e7610371'
+down_revision: Union[str, None] = 'b0e238c1f1ed'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Matches the ORDER BY in app/services/ranked_candidates_service.py:
+    # (coalesce(match_score, 0) DESC, rank_id DESC) scoped to one jd_id.
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_ranked_candidates_jd_score_keyset "
+        "ON ranked_candidates (jd_id, (coalesce(match_score, 0)) DESC, rank_id DESC)"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_ranked_candidates_from_resume_jd_score_keyset "
+        "ON ranked_candidates_from_resume (jd_id, (coalesce(match_score, 0)) DESC, rank_id DESC)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_ranked_candidates_from_resume_jd_score_keyset")
+    op.execute("DROP INDEX IF EXISTS ix_ranked_candidates_jd_score_keyset")
@@ -39,6 +39,53 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str
     GEMINI_API_KEY: str
 
+    # --- Upload Limits (enforced while streaming to disk) ---
+    MAX_UPLOAD_FILE_BYTES: int = 20 * 1024 * 1024
+    MAX_UPLOAD_REQUEST_BYTES: int = 500 * 1024 * 1024
+    UPLOAD_CHUNK_BYTES: int = 1024 * 1024
+
+    # --- Text Extraction (app/services/text_extraction_service.py) ---
+    TEXT_EXTRACT_WORKERS: int = 4
+    TEXT_EXTRACT_TIMEOUT_SEC: float = 60.0
+    # PDFs longer than this are split into page ranges extracted in parallel.
+    TEXT_EXTRACT_PAGES_PER_TASK: int = 8
+    TEXT_EXTRACT_CACHE_SIZE: int = 256
+    # Optional directory for a persistent extraction cache keyed by file hash.
+    TEXT_EXTRACT_CACHE_DIR: str = ""
+
+    # --- Bulk Resume Ingestion ---
+    # Directory shared by the API and worker containers where uploads are spooled.
+    UPLOAD_SPOOL_DIR: str = "/tmp/aira_spool"
+    # Maximum concurrent Gemini resume-parse calls per ingestion job.
+    RESUME_PARSE_CONCURRENCY: int = 8
+    # ZIP imports: entries decompressed and ingested per window, the most
+    # resumes accepted per archive, and the largest uncompressed/compressed
+    # ratio accepted per entry (zip-bomb guard).
+    ZIP_IMPORT_WINDOW: int = 16
+    ZIP_MAX_ENTRIES: int = 2000
+    ZIP_MAX_COMPRESSION_RATIO: int = 100
+
+    # --- Document Blob Storage (app/services/blob_store.py) ---
+    # "supabase" stores in the uploads' bucket; "local" writes under BLOB_STORE_LOCAL_DIR (dev/testing).
+    BLOB_STORE_BACKEND: str = "supabase"
+    BLOB_STORE_LOCAL_DIR: str = "/tmp/aira_blobs"
+    BLOB_TEXT_ZSTD_LEVEL: int = 10
+
+    # --- Resume Parsing ---
+    # Rule-based extraction first; Gemini only fills missing/low-confidence fields.
+    RESUME_HYBRID_PARSE: bool = True
+    RESUME_RULE_MIN_CONFIDENCE: float = 0.8
+    # Batched parsing for bulk uploads: resumes per Gemini request and the
+    # estimated input-token budget per request. Bigger batches mean fewer
+    # requests but larger retries when a batch answer does not validate.
+    RESUME_BATCH_SIZE: int = 8
+    RESUME_BATCH_TOKEN_BUDGET: int = 24000
+
+    # --- Workflow Metrics (app/services/workflow_metrics_store.py) ---
+    # SQLite file written by the recruitment CLI's WorkflowMonitor; point both at the same path.
+    WORKFLOW_METRICS_DB: str = ".cache/workflow_metrics.sqlite"
+    WORKFLOW_METRICS_RETENTION_DAYS: int = 30
+
     # --- Business Logic Rules ---
     INVITE_ONLY: bool = True
     ALLOW_MULTI_ORG: bool = False
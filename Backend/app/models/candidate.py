@@ -10,6 +10,7 @@ from sqlalchemy import (
     Integer,
     Boolean,
     Numeric,
+    CHAR,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func, expression
@@ -43,6 +44,8 @@ class RankedCandidate(Base):
         DateTime(timezone=False), server_default=func.now()
     )
     linkedin_url: Mapped[str] = mapped_column(Text, nullable=True)
+    # jds.summary_fingerprint at scoring time; a mismatch means the row is stale.
+    jd_fingerprint: Mapped[str] = mapped_column(Text, nullable=True)
 
     # Relationships
     user = relationship("User", foreign_keys=[user_id])
@@ -77,8 +80,56 @@ class RankedCandidateFromResume(Base):
         DateTime(timezone=False), server_default=func.now()
     )
     linkedin_url: Mapped[str] = mapped_column(Text, nullable=True)
+    # jds.summary_fingerprint at scoring time; a mismatch means the row is stale.
+    jd_fingerprint: Mapped[str] = mapped_column(Text, nullable=True)
 
     # Relationships
     user = relationship("User", foreign_keys=[user_id])
     recruiter = relationship("User", foreign_keys=[send_to_recruiter])
     jd = relationship("JD")
+
+
+class SearchProfile(Base):
+    """Read-side mapping of the `search` table written by the search agents."""
+    __tablename__ = "search"
+    # Created outside Alembic; migrations only alter it by hand (see alembic/env.py).
+    __table_args__ = {"info": {"skip_autogenerate": True}}
+
+    profile_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=True)
+    jd_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=True)
+    profile_name: Mapped[str] = mapped_column(Text, nullable=True)
+    role: Mapped[str] = mapped_column(Text, nullable=True)
+    company: Mapped[str] = mapped_column(Text, nullable=True)
+    profile_url: Mapped[str] = mapped_column(Text, nullable=True)
+    # lower(name)|lower(company), set by the search_set_dedup_key trigger;
+    # unique per jd_id so repeated saves upsert instead of duplicating.
+    dedup_key: Mapped[str] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=False), server_default=func.now()
+    )
+
+
+class Resume(Base):
+    """Read-side mapping of the `resume` table written by the upload endpoints."""
+    __tablename__ = "resume"
+    # Created outside Alembic; migrations only alter it by hand (see alembic/env.py).
+    __table_args__ = {"info": {"skip_autogenerate": True}}
+
+    resume_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=True)
+    jd_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=True)
+    person_name: Mapped[str] = mapped_column(Text, nullable=True)
+    role: Mapped[str] = mapped_column(Text, nullable=True)
+    company: Mapped[str] = mapped_column(Text, nullable=True)
+    profile_url: Mapped[str] = mapped_column(Text, nullable=True)
+    file_url: Mapped[str] = mapped_column(Text, nullable=True)
+    # SHA-256 of the normalized resume text (see parse_cache_service).
+    content_hash: Mapped[str] = mapped_column(CHAR(64), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=False), server_default=func.now()
+    )
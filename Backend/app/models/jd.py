@@ -3,7 +3,7 @@
 from __future__ import annotations
 import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime, Text, ForeignKey, UUID, Integer
+from sqlalchemy import String, DateTime, Text, ForeignKey, UUID, Integer, Computed
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
 from ..db.base import Base
@@ -29,6 +29,13 @@ class JD(Base):
     candidates_liked: Mapped[int] = mapped_column(Integer, default=0)
     candidates_contacted: Mapped[int] = mapped_column(Integer, default=0)
 
+    # Hash of role/experience_required/jd_parsed_summary, maintained by Postgres
+    # (see migration for the expression). Ranked rows store the value they were
+    # scored against in jd_fingerprint.
+    summary_fingerprint: Mapped[str | None] = mapped_column(
+        Text, Computed("md5(coalesce(role, '') || chr(31) || coalesce(experience_required, '') || chr(31) || coalesce(jd_parsed_summary, ''))", persisted=True)
+    )
+
 
     # Foreign Key to the User who uploaded it
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
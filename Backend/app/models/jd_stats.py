@@ -0,0 +1,34 @@
+# backend/app/models/jd_stats.py
+
+import uuid
+from datetime import datetime
+from typing import List
+from sqlalchemy import DateTime, ForeignKey, Integer, UUID
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from ..db.base import Base
+
+# Number of equal-width match_score buckets (0-10, 10-20, ..., 90-100).
+SCORE_HISTOGRAM_BUCKETS = 10
+
+
+class JdStats(Base):
+    """
+    Pre-aggregated per-JD pipeline counters. Rows are maintained by database
+    triggers on search, resume, ranked_candidates and
+    ranked_candidates_from_resume (see migration 287eb216fccf), so reads are
+    a single primary-key lookup per JD.
+    """
+    __tablename__ = "jd_stats"
+
+    jd_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("jds.jd_id", ondelete="CASCADE"), primary_key=True
+    )
+    sourced_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    resume_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    ranked_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    favorited_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    contacted_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    score_histogram: Mapped[List[int]] = mapped_column(ARRAY(Integer), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,25 @@
+# backend/app/models/parse_cache.py
+
+import uuid
+from datetime import datetime
+from sqlalchemy import CHAR, DateTime, Integer, Text, UUID
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+from ..db.base import Base
+
+
+class ParseCache(Base):
+    """
+    Parsed resume/JD JSON keyed by the SHA-256 of the normalized document text.
+    `scope_id` is the uploader's organization (or the user when they have none),
+    so everyone in an org reuses each other's parses.
+    """
+    __tablename__ = "parse_cache"
+
+    scope_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    kind: Mapped[str] = mapped_column(Text, primary_key=True)  # "resume" | "jd"
+    content_hash: Mapped[str] = mapped_column(CHAR(64), primary_key=True)
+    parsed: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    hit_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -4,11 +4,14 @@ import tempfile
 from pathlib import Path
 from pydantic import BaseModel
 import datetime
-from app.services.jd_parsing_service import process_jd_file, parse_jd_text
+from app.services.jd_parsing_service import JD_PARSED_FIELDS, process_jd_file, reparse_jd_text
 from app.dependencies import get_current_user, get_supabase_client
 from app.models.user import User
-from app.schemas.jd import JdSummary, JdUpdateContent
+from app.models.jd_stats import SCORE_HISTOGRAM_BUCKETS
+from app.schemas.jd import JdStats, JdSummary, JdUpdateContent
 from app.services.jd_parsing_service import process_jd_file
+from app.services.upload_spooling import UploadTooLargeError, spool_upload
+from app.services.parse_cache_service import KIND_JD, cache_scope, parse_with_cache
 
 router = APIRouter(
     tags=["Roles & JDs"],
@@ -29,10 +32,13 @@ async def get_user_jds(
     """
     try:
         # --- MODIFICATION: Added "jd_text" to the select query ---
+        # Liked/contacted counts come from the trigger-maintained jd_stats row
+        # (one-to-one embed) instead of scanning the ranked tables per role.
         query = supabase.table("jds").select(
             "jd_id", "role", "location", "job_type", "experience_required",
             "jd_parsed_summary", "jd_text", "created_at", "updated_at", "key_requirements",
-            "status", "candidates_liked", "candidates_contacted"
+            "status", "candidates_liked", "candidates_contacted",
+            "jd_stats(favorited_count,contacted_count)"
         ).eq("user_id", str(current_user.id))
 
         if filter and filter != "all":
@@ -49,8 +55,15 @@ async def get_user_jds(
         if not response.data:
             return []
 
-        # Directly pass the data for Pydantic to validate
-        roles_to_return = [JdSummary(**item) for item in response.data]
+        roles_to_return = []
+        for item in response.data:
+            stats = item.pop("jd_stats", None)
+            if isinstance(stats, list):
+                stats = stats[0] if stats else None
+            if stats:
+                item["candidates_liked"] = stats.get("favorited_count") or 0
+                item["candidates_contacted"] = stats.get("contacted_count") or 0
+            roles_to_return.append(JdSummary(**item))
         return roles_to_return
 
     except Exception as e:
@@ -58,6 +71,41 @@ async def get_user_jds(
         raise HTTPException(status_code=500, detail="Could not fetch roles.")
 
 
+@router.get("/{jd_id}/stats", response_model=JdStats)
+def get_jd_stats(
+    jd_id: str,
+    current_user: User = Depends(get_current_user),
+    supabase = Depends(get_supabase_client)
+):
+    """
+    Returns the pre-aggregated pipeline counters (sourced, ranked, favorited,
+    contacted, score histogram) for a Job Description.
+    """
+    try:
+        owner_check = supabase.table("jds").select("user_id").eq("jd_id", jd_id).single().execute()
+
+        if not owner_check.data:
+            raise HTTPException(status_code=404, detail="Role not found")
+
+        if str(owner_check.data.get("user_id")) != str(current_user.id):
+            raise HTTPException(status_code=403, detail="Not authorized to view this role")
+
+        stats_response = supabase.table("jd_stats").select("*").eq("jd_id", jd_id).execute()
+        if not stats_response.data:
+            # No candidates have been sourced or ranked for this JD yet.
+            return JdStats(jd_id=jd_id, score_histogram=[0] * SCORE_HISTOGRAM_BUCKETS)
+
+        row = stats_response.data[0]
+        row["jd_id"] = str(row["jd_id"])
+        return JdStats(**row)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error fetching stats for role {jd_id}: {e}")
+        raise HTTPException(status_code=500, detail="Could not fetch role stats.")
+
+
 @router.post("/", response_model=JdSummary, status_code=201)
 async def create_jd(
     file: UploadFile = File(...),
@@ -73,15 +121,18 @@ async def create_jd(
     tmp_path = ""
     try:
         with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as tmp:
-            tmp.write(await file.read())
             tmp_path = tmp.name
+        await spool_upload(file, Path(tmp_path))
 
         new_jd_data = process_jd_file(
             supabase=supabase,
             file_path=Path(tmp_path),
-            user_id=str(current_user.id)
+            user_id=str(current_user.id),
+            scope_id=cache_scope(current_user),
         )
         return JdSummary(**new_jd_data)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         print(f"An error occurred while creating a role: {e}")
         raise HTTPException(status_code=500, detail="An internal server error occurred.")
@@ -104,7 +155,10 @@ def update_jd_content(
     """
     try:
         # 1. Ownership Check (unchanged)
-        owner_check = supabase.table("jds").select("user_id").eq("jd_id", jd_id).single().execute()
+        # The previous text and parsed fields drive the incremental re-parse below.
+        owner_check = supabase.table("jds").select(
+            "user_id,jd_text," + ",".join(JD_PARSED_FIELDS)
+        ).eq("jd_id", jd_id).single().execute()
 
         if not owner_check.data:
             raise HTTPException(status_code=404, detail="Role not found")
@@ -112,8 +166,18 @@ def update_jd_content(
         if str(owner_check.data.get("user_id")) != str(current_user.id):
             raise HTTPException(status_code=403, detail="Not authorized to update this role")
 
-        # 2. Re-parse the JD text
-        parsed_fields = parse_jd_text(content_update.jd_text)
+        # 2. Re-parse only the changed sections of the JD text (text already
+        # fully parsed in the org hits the parse cache). The incremental result
+        # depends on the previous fields too, so it is not cached under the text
+        # hash. If the parsed summary changes, jds.summary_fingerprint changes
+        # with it and the next rerank rescores only candidates ranked against
+        # the old fingerprint.
+        previous = owner_check.data
+        parsed_fields, _, _ = parse_with_cache(
+            supabase, cache_scope(current_user), KIND_JD, content_update.jd_text,
+            lambda text: reparse_jd_text(previous, text),
+            store_result=False,
+        )
 
         # Safety: ensure parsed_fields is a dict
         if not isinstance(parsed_fields, dict):
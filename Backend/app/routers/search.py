@@ -1,7 +1,8 @@
 import logging
+import uuid
 from typing import Any, Dict, List, Iterable, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
@@ -23,9 +24,18 @@ from supabase import Client
 from ..services.linkedin_finder_service import LinkedInFinder
 
 # DB + ORM
+from sqlalchemy import String, cast, literal, select, union_all
 from sqlalchemy.orm import Session
 from app.db.session import get_db
 from app.models.candidate import RankedCandidate, RankedCandidateFromResume
+from app.models.jd import JD
+from app.services.ranked_candidates_service import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    SOURCE_SEARCH,
+    fetch_ranked_page,
+    parse_fields,
+)
 
 # --- MODELS (Unchanged) ---
 class SearchRequest(BaseModel):
@@ -76,61 +86,75 @@ def _extract_id_values(candidates: Iterable[Any], id_key_candidates: List[str])
     return out
 
 
-def enrich_with_favorites(db: Session, candidates: Iterable[Any]) -> List[Dict]:
+def _favorite_flags(db: Session, profile_ids: List[str], resume_ids: List[str]) -> Dict[tuple, bool]:
     """
-    Given an iterable of candidate items (dicts or objects), query the DB to find
-    favorite flags and attach a 'favorite' boolean to each candidate dict.
-    Returns a list of plain dicts.
+    Resolve favorite flags for both id kinds in one round trip:
+        SELECT 'profile', profile_id, favorite FROM ranked_candidates WHERE profile_id IN (...)
+        UNION ALL
+        SELECT 'resume', resume_id, favorite FROM ranked_candidates_from_resume WHERE resume_id IN (...)
+    Returns {(kind, id): favorite}.
     """
-    candidates_list = list(candidates)
-    # Try to extract profile_ids and resume_ids (if present)
-    profile_ids = set(_extract_id_values(candidates_list, ["profile_id", "id", "profileId"]))
-    resume_ids = set(_extract_id_values(candidates_list, ["resume_id", "resumeId"]))
-
-    fav_by_profile = {}
-    fav_by_resume = {}
-
+    selects = []
     if profile_ids:
-        rows = db.query(RankedCandidate.profile_id, RankedCandidate.favorite).filter(RankedCandidate.profile_id.in_(list(profile_ids))).all()
-        fav_by_profile = {str(r[0]): bool(r[1]) for r in rows}
-
+        selects.append(
+            select(
+                literal("profile").label("kind"),
+                cast(RankedCandidate.profile_id, String).label("candidate_id"),
+                RankedCandidate.favorite,
+            ).where(RankedCandidate.profile_id.in_(profile_ids))
+        )
     if resume_ids:
-        rows = db.query(RankedCandidateFromResume.resume_id, RankedCandidateFromResume.favorite).filter(RankedCandidateFromResume.resume_id.in_(list(resume_ids))).all()
-        fav_by_resume = {str(r[0]): bool(r[1]) for r in rows}
+        selects.append(
+            select(
+                literal("resume").label("kind"),
+                cast(RankedCandidateFromResume.resume_id, String).label("candidate_id"),
+                RankedCandidateFromResume.favorite,
+            ).where(RankedCandidateFromResume.resume_id.in_(resume_ids))
+        )
+    if not selects:
+        return {}
+
+    stmt = selects[0] if len(selects) == 1 else union_all(*selects)
+    flags: Dict[tuple, bool] = {}
+    for kind, candidate_id, favorite in db.execute(stmt).all():
+        # A candidate may be ranked more than once; any favorited row wins.
+        key = (kind, str(candidate_id))
+        flags[key] = flags.get(key, False) or bool(favorite)
+    return flags
 
-    enriched = []
-    for c in candidates_list:
-        # produce a mutable dict representation
+
+def enrich_with_favorites(db: Session, candidates: Iterable[Any]) -> List[Dict]:
+    """
+    Given an iterable of candidate items (dicts or objects), attach a 'favorite'
+    boolean to each candidate dict. Items that already carry `favorite` (rows
+    read from the ranked tables) are passed through untouched; the rest are
+    resolved with a single UNION query.
+    Returns a list of plain dicts.
+    """
+    items: List[Dict] = []
+    for c in candidates:
         if isinstance(c, dict):
-            item = dict(c)  # shallow copy
+            items.append(dict(c))  # shallow copy
         else:
-            # convert object to dict by pulling attributes commonly used
-            item = {}
-            # attempt to include common fields if present
-            for attr in ("profile_id", "resume_id", "profile_name", "name", "role", "company", "match_score", "strengths", "linkedin_url"):
-                if hasattr(c, attr):
-                    item[attr] = getattr(c, attr)
-
-            # include any extra attributes by trying __dict__ if available
-            if hasattr(c, "__dict__"):
-                try:
-                    for k, v in c.__dict__.items():
-                        if k not in item:
-                            item[k] = v
-                except Exception:
-                    pass
-
-        # default favorite = False unless DB says otherwise
-        fav_val = False
-        if "profile_id" in item and item.get("profile_id") is not None:
-            fav_val = fav_by_profile.get(str(item.get("profile_id")), False)
-        elif "resume_id" in item and item.get("resume_id") is not None:
-            fav_val = fav_by_resume.get(str(item.get("resume_id")), False)
+            items.append({k: v for k, v in vars(c).items() if not k.startswith("_")} if hasattr(c, "__dict__") else {})
+
+    pending = [item for item in items if "favorite" not in item]
+    if not pending:
+        return items
 
+    profile_ids = set(_extract_id_values(pending, ["profile_id", "id", "profileId"]))
+    resume_ids = set(_extract_id_values(pending, ["resume_id", "resumeId"]))
+    flags = _favorite_flags(db, list(profile_ids), list(resume_ids))
+
+    for item in pending:
+        fav_val = False
+        if item.get("profile_id") is not None:
+            fav_val = flags.get(("profile", str(item["profile_id"])), False)
+        elif item.get("resume_id") is not None:
+            fav_val = flags.get(("resume", str(item["resume_id"])), False)
         item["favorite"] = bool(fav_val)
-        enriched.append(item)
 
-    return enriched
+    return items
 
 
 # --- NEW ASYNCHRONOUS ENDPOINTS ---
@@ -189,13 +213,38 @@ async def start_apollo_search(
     return {"task_id": task.id, "status": "processing"}
 
 
-@router.get("/search/results/{task_id}")
-async def get_search_results(task_id: str, db: Session = Depends(get_db)):
+def _legacy_enriched_results(db: Session, payload: Dict) -> List[Dict]:
     """
-    Polls for the results of the main search and rank pipeline. The frontend
-    will call this endpoint to check if the background job is complete.
-    This endpoint now enriches returned candidate objects with their `favorite` status
-    from the ranked_candidates / ranked_candidates_from_resume tables.
+    Results of tasks that finished before manifests were introduced carry the
+    full candidate list inline; enrich those with favorites as before.
+    """
+    result_items = payload.get("result") or payload.get("results") or payload.get("data") or []
+    try:
+        return enrich_with_favorites(db, result_items)
+    except Exception as e:
+        logger.exception("Failed to enrich legacy task results with favorites: %s", e)
+        enriched = []
+        for r in result_items:
+            if isinstance(r, dict):
+                item = dict(r)
+                item.setdefault("favorite", False)
+            else:
+                item = {"favorite": False}
+            enriched.append(item)
+        return enriched
+
+
+def _task_results_response(
+    task_id: str,
+    db: Session,
+    cursor: Optional[str],
+    limit: int,
+    fields: Optional[str],
+):
+    """
+    Shared polling logic for the search and resume ranking tasks. Completed tasks
+    return a small manifest (jd_id, source, counts); the candidates are
+    read page by page from Postgres so Redis never holds the ranked rows.
     """
     task_result = AsyncResult(task_id, app=celery_app)
     if not task_result.ready():
@@ -208,23 +257,48 @@ async def get_search_results(task_id: str, db: Session = Depends(get_db)):
             content={"status": "failed", "error": payload.get("error", str(task_result.info))}
         )
 
-    # payload is expected to be a dict with 'status' and 'result' keys (result is iterable)
-    result_items = payload.get("result") or payload.get("results") or payload.get("data") or []
+    if payload.get("status") == "failed":
+        return {"status": "failed", "error": payload.get("error"), "data": []}
+
+    if "jd_id" not in payload:
+        return {"status": payload.get("status", "completed"), "data": _legacy_enriched_results(db, payload)}
+
     try:
-        enriched = enrich_with_favorites(db, result_items)
-    except Exception as e:
-        logger.exception("Failed to enrich search results with favorites: %s", e)
-        # fallback to returning original results but ensure they include favorite=False
-        enriched = []
-        for r in result_items:
-            if isinstance(r, dict):
-                item = dict(r)
-                item.setdefault("favorite", False)
-            else:
-                item = {"favorite": False}
-            enriched.append(item)
+        page = fetch_ranked_page(
+            db,
+            payload["jd_id"],
+            source=payload.get("source", SOURCE_SEARCH),
+            limit=limit,
+            cursor=cursor,
+            fields=parse_fields(fields),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    return {"status": payload.get("status", "completed"), "data": enriched}
+    return {
+        "status": payload.get("status", "completed"),
+        "jd_id": payload["jd_id"],
+        "ranked_count": payload.get("ranked_count"),
+        "data": page["data"],
+        "next_cursor": page["next_cursor"],
+    }
+
+
+@router.get("/search/results/{task_id}")
+async def get_search_results(
+    task_id: str,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """
+    Polls for the results of the main search and rank pipeline. The frontend
+    will call this endpoint to check if the background job is complete.
+    Once complete, ranked candidates (with their `favorite` flag) are paged
+    from ranked_candidates; follow `next_cursor` for further pages.
+    """
+    return _task_results_response(task_id, db, cursor, limit, fields)
 
 
 @router.post("/rank-resumes", status_code=status.HTTP_202_ACCEPTED)
@@ -242,36 +316,60 @@ async def start_rank_resumes(
 
 
 @router.get("/rank-resumes/results/{task_id}")
-async def get_rank_resumes_results(task_id: str, db: Session = Depends(get_db)):
+async def get_rank_resumes_results(
+    task_id: str,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
     """
-    Polls for the results of the resume ranking task and enriches results with favorites.
+    Polls for the results of the resume ranking task. Once complete, ranked
+    resumes are paged from ranked_candidates_from_resume.
     """
-    task_result = AsyncResult(task_id, app=celery_app)
-    if not task_result.ready():
-        return {"status": "processing"}
+    return _task_results_response(task_id, db, cursor, limit, fields)
 
-    payload = task_result.get()
-    if not task_result.successful():
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={"status": "failed", "error": payload.get("error", str(task_result.info))}
-        )
 
-    result_items = payload.get("result") or payload.get("results") or payload.get("data") or []
+@router.get("/ranked/{jd_id}")
+def get_ranked_candidates_page(
+    jd_id: str,
+    source: str = Query(SOURCE_SEARCH, description="'ranked_candidates' or 'ranked_candidates_from_resume'"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    fields: Optional[str] = Query(None, description="Comma separated projection, e.g. 'profile_name,role,company'"),
+    min_score: Optional[float] = Query(None, ge=0, le=100),
+    favorite: Optional[bool] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Keyset-paginated ranked candidates for a JD, ordered by match_score desc.
+    Pass `fields` without `strengths` for list views to keep pages small, and
+    follow `next_cursor` until it is null.
+    """
     try:
-        enriched = enrich_with_favorites(db, result_items)
-    except Exception as e:
-        logger.exception("Failed to enrich rank-resumes results with favorites: %s", e)
-        enriched = []
-        for r in result_items:
-            if isinstance(r, dict):
-                item = dict(r)
-                item.setdefault("favorite", False)
-            else:
-                item = {"favorite": False}
-            enriched.append(item)
+        owner_id = db.scalar(select(JD.user_id).where(JD.jd_id == uuid.UUID(jd_id)))
+    except ValueError:
+        owner_id = None
+    if owner_id is None:
+        raise HTTPException(status_code=404, detail="Role not found")
+    if str(owner_id) != str(current_user.id):
+        raise HTTPException(status_code=403, detail="Not authorized to view this role")
 
-    return {"status": payload.get("status", "completed"), "data": enriched}
+    try:
+        return fetch_ranked_page(
+            db,
+            jd_id,
+            source=source,
+            limit=limit,
+            cursor=cursor,
+            fields=parse_fields(fields),
+            min_score=min_score,
+            favorite=favorite,
+        )
+    except ValueError as e:
+        # Covers InvalidCursorError, unknown fields and unknown sources.
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 # --- PRESERVED ENDPOINTS (Functionality Unchanged) ---
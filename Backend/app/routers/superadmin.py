@@ -1,14 +1,16 @@
 # In backend/app/routers/superadmin.py
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
 
+from app.config import settings
 from app.db.session import get_db
 from app.security.deps import require_superadmin
 from app.models.organization import Organization
 from app.models.invitation import Invitation
 from app.services.invitations import create_invitation_token # We will create this service next
+from app.services.workflow_metrics_store import WorkflowMetricsStore
 
 router = APIRouter()
 
@@ -64,4 +66,25 @@ def invite_organization(
         "message": "Organization created and invitation sent successfully.",
         "org_id": str(new_org.id),
         "invitation_email": invitation.email
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/workflow-metrics")
+def workflow_metrics(
+    window_hours: int = Query(24, ge=1, le=24 * 90),
+    recent: int = Query(10, ge=0, le=100),
+    current_user_ctx: dict = Depends(require_superadmin)
+):
+    """
+    Recruitment workflow run metrics: totals, rolling p50/p90/p99 per metric
+    (step durations, candidates per stage, LLM/API calls and tokens) over the
+    last `window_hours`, and the latest runs with their steps.
+    """
+    store = WorkflowMetricsStore(settings.WORKFLOW_METRICS_DB, settings.WORKFLOW_METRICS_RETENTION_DAYS)
+    window_seconds = window_hours * 3600
+    return {
+        "window_hours": window_hours,
+        "totals": store.totals(window_seconds),
+        "metrics": store.summary(window_seconds),
+        "recent_runs": store.recent_runs(recent),
+    }
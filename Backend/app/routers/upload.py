@@ -1,13 +1,18 @@
-import uuid
-import json
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, status
+from fastapi.responses import JSONResponse
 from typing import List
 import tempfile
 from pathlib import Path
 
+from celery.result import AsyncResult
+from app.worker import celery_app, get_task_owner, ingest_resumes_task, ingest_resume_zip_task, register_task_owner
+
 from app.dependencies import get_current_user, get_supabase_client
 from app.services.jd_parsing_service import process_jd_file
-from app.services.resume_parsing_service import extract_text, parse_resume_text
+from app.services.resume_ingestion_service import create_job_dir, remove_job_dir
+from app.services.upload_spooling import UploadBudget, UploadTooLargeError, spool_upload
+from app.services.parse_cache_service import cache_scope
+from app.services.zip_import_service import InvalidArchiveError, scan_archive
 from app.models.user import User
 from app.config import settings
 
@@ -27,16 +32,20 @@ async def upload_jd(
         raise HTTPException(status_code=400, detail="No file provided.")
 
     with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as tmp:
-        tmp.write(await file.read())
         tmp_path = Path(tmp.name)
 
     try:
+        # Stream to disk; extraction reads this spooled file directly.
+        await spool_upload(file, tmp_path)
         result = process_jd_file(
             supabase=supabase,
             file_path=tmp_path,
-            user_id=str(current_user.id)
+            user_id=str(current_user.id),
+            scope_id=cache_scope(current_user),
         )
         return result
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -45,9 +54,11 @@ async def upload_jd(
         if tmp_path.exists():
             tmp_path.unlink()
 
-# --- FINAL CORRECTED VERSION ---
-# This endpoint now correctly parses resumes and saves them to the 'resume' table.
-@router.post("/resumes")
+# Bulk resume uploads are spooled to disk once and handed to the
+# `ingest_resumes_task` Celery task, which extracts text in a process pool and
+# parses with a bounded number of concurrent Gemini calls. Poll
+# /upload/resumes/jobs/{task_id} for per-file progress.
+@router.post("/resumes", status_code=status.HTTP_202_ACCEPTED)
 async def upload_resumes(
     files: List[UploadFile] = File(...),
     jd_id: str = Form(...),
@@ -57,54 +68,97 @@ async def upload_resumes(
     if not files:
         raise HTTPException(status_code=400, detail="No resume files provided.")
 
-    rows_to_insert = []
-    errors = []
-
-    for file in files:
-        if not file.filename:
-            continue
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(file.filename).suffix) as tmp:
-            tmp.write(await file.read())
-            tmp_path = Path(tmp.name)
-
-        try:
-            # Step 1: Extract text and parse it
-            text_content = extract_text(tmp_path)
-            if not text_content.strip():
-                raise ValueError("No text could be extracted from the resume.")
-            
-            parsed_data = parse_resume_text(text_content)
-
-            # --- Step 2: Map parsed data to the 'resume' table schema ---
-            row = {
-                "resume_id": str(uuid.uuid4()),
-                "jd_id": jd_id,
-                "user_id": str(current_user.id),
-                "json_content": json.dumps(parsed_data.get("json_content", {})),
-                "person_name": parsed_data.get("person_name"),
-                "role": parsed_data.get("role"),
-                "company": parsed_data.get("company"),
-                "profile_url": parsed_data.get("profile_url"),
-                # file_url is left null as we are not storing the file itself in storage
-            }
-            rows_to_insert.append(row)
-
-        except Exception as e:
-            errors.append({"filename": file.filename, "error": str(e)})
-        finally:
-            if tmp_path.exists():
-                tmp_path.unlink()
-
-    # --- Step 3: Batch insert into the correct 'resume' table ---
-    if rows_to_insert:
-        try:
-            supabase.table("resume").insert(rows_to_insert).execute()
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Database insertion into 'resume' table failed: {e}")
-
-    if not rows_to_insert and errors:
-        raise HTTPException(status_code=500, detail={"message": "All resume uploads failed.", "errors": errors})
-
-    return {"successful_uploads": len(rows_to_insert), "failed_uploads": errors}
+    job_dir = create_job_dir()
+    budget = UploadBudget()
+    spooled = []
+    try:
+        for index, file in enumerate(files):
+            if not file.filename:
+                continue
+            dest = job_dir / f"{index:05d}{Path(file.filename).suffix.lower()}"
+            await spool_upload(file, dest, budget)
+            spooled.append({"filename": file.filename, "path": str(dest)})
+    except UploadTooLargeError as e:
+        remove_job_dir(job_dir)
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except Exception as e:
+        remove_job_dir(job_dir)
+        raise HTTPException(status_code=500, detail=f"Failed to spool uploaded files: {e}")
+
+    if not spooled:
+        remove_job_dir(job_dir)
+        raise HTTPException(status_code=400, detail="No resume files provided.")
 
+    task = ingest_resumes_task.delay(
+        jd_id=jd_id,
+        user_id=str(current_user.id),
+        job_dir=str(job_dir),
+        files=spooled,
+        scope_id=cache_scope(current_user),
+    )
+    register_task_owner(task.id, current_user.id)
+    return {"task_id": task.id, "status": "processing", "total": len(spooled)}
+
+
+# ZIP imports: the archive is spooled once and entries are decompressed a
+# window at a time by `ingest_resume_zip_task`. Progress is polled on the same
+# /upload/resumes/jobs/{task_id} endpoint as multi-file uploads.
+@router.post("/resumes/zip", status_code=status.HTTP_202_ACCEPTED)
+async def upload_resume_zip(
+    file: UploadFile = File(...),
+    jd_id: str = Form(...),
+    current_user: User = Depends(get_current_user),
+):
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No ZIP archive provided.")
+
+    job_dir = create_job_dir()
+    zip_path = job_dir / "upload.zip"
+    try:
+        await spool_upload(file, zip_path, max_file_bytes=settings.MAX_UPLOAD_REQUEST_BYTES)
+        entries, rejected = scan_archive(zip_path)
+    except UploadTooLargeError as e:
+        remove_job_dir(job_dir)
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except InvalidArchiveError as e:
+        remove_job_dir(job_dir)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        remove_job_dir(job_dir)
+        raise HTTPException(status_code=500, detail=f"Failed to spool uploaded archive: {e}")
+
+    if not entries:
+        remove_job_dir(job_dir)
+        raise HTTPException(status_code=400, detail="The archive contains no supported resume files.")
+
+    task = ingest_resume_zip_task.delay(
+        jd_id=jd_id,
+        user_id=str(current_user.id),
+        job_dir=str(job_dir),
+        zip_path=str(zip_path),
+        scope_id=cache_scope(current_user),
+    )
+    register_task_owner(task.id, current_user.id)
+    return {"task_id": task.id, "status": "processing", "total": len(entries) + len(rejected)}
+
+
+@router.get("/resumes/jobs/{task_id}")
+async def get_resume_upload_job(task_id: str, current_user: User = Depends(get_current_user)):
+    """
+    Reports progress of a bulk resume upload: overall counts plus the status
+    (queued/extracting/parsing/storing/done/duplicate/failed) of every file.
+    Unknown or expired task ids, and jobs started by another user, are 404s.
+    """
+    if get_task_owner(task_id) != str(current_user.id):
+        raise HTTPException(status_code=404, detail="Upload job not found.")
+    task_result = AsyncResult(task_id, app=celery_app)
+    if task_result.state == "PENDING":
+        return {"status": "queued"}
+    if task_result.state == "PROGRESS":
+        return {"status": "processing", **(task_result.info or {})}
+    if not task_result.successful():
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"status": "failed", "error": str(task_result.info)}
+        )
+    return task_result.get()
@@ -1,7 +1,7 @@
 # schemas/jd.py file
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class JdBase(BaseModel):
     role: str
@@ -51,4 +51,15 @@ class JdSummary(BaseModel):
 class JdUpdateContent(BaseModel):
     """Schema for updating the JD's full text content."""
     # This is the only field the user should be allowed to update via the new endpoint
-    jd_text: str
\ No newline at end of file
+    jd_text: str
+
+class JdStats(BaseModel):
+    """Pre-aggregated pipeline counters for a JD, read from the jd_stats table."""
+    jd_id: str
+    sourced_count: int = 0
+    resume_count: int = 0
+    ranked_count: int = 0
+    favorited_count: int = 0
+    contacted_count: int = 0
+    # Counts of ranked candidates per 10-point match_score bucket (0-10, ..., 90-100).
+    score_histogram: List[int] = []
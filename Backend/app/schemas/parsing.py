@@ -0,0 +1,88 @@
+# schemas/parsing.py file
+# Response schemas for Gemini structured output (resume and JD parsing).
+# The Gemini API does not support default values in response schemas, so every
+# field is required but nullable; dump_filled() turns the nulls into empty
+# values after validation.
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional, Union, get_args, get_origin
+
+
+class ExperienceEntry(BaseModel):
+    title: Optional[str]
+    company: Optional[str]
+    start_date: Optional[str]
+    end_date: Optional[str]
+    description: Optional[str]
+
+
+class EducationEntry(BaseModel):
+    degree: Optional[str]
+    institution: Optional[str]
+    year: Optional[str]
+
+
+class ResumeDetails(BaseModel):
+    email: Optional[str]
+    phone: Optional[str]
+    linkedin_url: Optional[str]
+    location: Optional[str]
+    summary: Optional[str]
+    skills: Optional[List[str]]
+    experience: Optional[List[ExperienceEntry]]
+    education: Optional[List[EducationEntry]]
+    certifications: Optional[List[str]]
+    projects: Optional[List[str]]
+
+
+class ResumeHeadline(BaseModel):
+    person_name: Optional[str]
+    role: Optional[str]
+    company: Optional[str]
+
+
+class ParsedResume(ResumeHeadline):
+    profile_url: Optional[str]
+    json_content: Optional[ResumeDetails]
+
+
+class BatchParsedResume(ResumeHeadline):
+    id: int
+    profile_url: Optional[str]
+    json_content: Optional[ResumeDetails]
+
+
+class ParsedJd(BaseModel):
+    role: Optional[str]
+    location: Optional[str]
+    job_type: Optional[str]
+    experience_required: Optional[str]
+    jd_parsed_summary: Optional[str]
+    key_requirements: Optional[List[str]]
+
+
+def _empty(annotation: Any) -> Any:
+    """Empty value for a field type: "" for strings, [] for lists, an empty dict for models."""
+    if get_origin(annotation) is Union:
+        annotation = next(arg for arg in get_args(annotation) if arg is not type(None))
+    if get_origin(annotation) in (list, List):
+        return []
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return {name: _empty(f.annotation) for name, f in annotation.model_fields.items()}
+    if annotation is str:
+        return ""
+    return None
+
+
+def dump_filled(model: BaseModel) -> Dict[str, Any]:
+    """model_dump() with every null replaced by its field's empty value, recursively."""
+    out = {}
+    for name, f in type(model).model_fields.items():
+        value = getattr(model, name)
+        if value is None:
+            value = _empty(f.annotation)
+        elif isinstance(value, BaseModel):
+            value = dump_filled(value)
+        elif isinstance(value, list):
+            value = [dump_filled(v) if isinstance(v, BaseModel) else v for v in value]
+        out[name] = value
+    return out
@@ -0,0 +1,206 @@
+# backend/app/services/blob_store.py
+"""
+Content-addressed storage for uploaded resumes and JDs.
+
+Objects are named by the SHA-256 of their bytes under the uploader's
+`{user_id}/` prefix, which the bucket policies scope access by. The same file
+uploaded again by the same user (to another JD, or in a re-uploaded folder)
+maps to the same object. The hash is computed locally and the upload is
+skipped when the object already exists, so a re-upload costs no storage or
+transfer.
+
+Next to each original, the extracted text is kept as a zstd-compressed
+sidecar, so the text can be re-parsed later without downloading and
+re-extracting the original.
+
+Backends: Supabase Storage (production) and the local filesystem (dev/tests),
+selected by settings.BLOB_STORE_BACKEND.
+"""
+import abc
+import logging
+import mimetypes
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from supabase import Client
+
+from app.config import settings
+from app.services.text_extraction_service import file_sha256
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+TEXT_SIDECAR_SUFFIX = ".txt.zst"
+
+
+def blob_key(owner_id: str, digest: str, ext: str) -> str:
+    return f"{owner_id}/sha256/{digest[:2]}/{digest}{ext.lower()}"
+
+
+def text_key(owner_id: str, digest: str) -> str:
+    return f"{owner_id}/text/{digest[:2]}/{digest}{TEXT_SIDECAR_SUFFIX}"
+
+
+def compress_text(text: str) -> bytes:
+    return zstandard.ZstdCompressor(level=settings.BLOB_TEXT_ZSTD_LEVEL).compress(text.encode("utf-8"))
+
+
+def decompress_text(data: bytes) -> str:
+    return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+
+
+class BlobStore(abc.ABC):
+    """Minimal object-store interface used by the upload paths."""
+
+    @abc.abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abc.abstractmethod
+    def put_file(self, key: str, path: Path, content_type: str) -> None:
+        ...
+
+    @abc.abstractmethod
+    def put_bytes(self, key: str, data: bytes, content_type: str) -> None:
+        ...
+
+    @abc.abstractmethod
+    def get_bytes(self, key: str) -> bytes:
+        ...
+
+
+class LocalBlobStore(BlobStore):
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def _write(self, key: str, write) -> None:
+        dest = self._path(key)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=dest.parent, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, dest)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def put_file(self, key: str, path: Path, content_type: str) -> None:
+        def write(f):
+            with open(path, "rb") as src:
+                while block := src.read(1024 * 1024):
+                    f.write(block)
+        self._write(key, write)
+
+    def put_bytes(self, key: str, data: bytes, content_type: str) -> None:
+        self._write(key, lambda f: f.write(data))
+
+    def get_bytes(self, key: str) -> bytes:
+        return self._path(key).read_bytes()
+
+
+class SupabaseBlobStore(BlobStore):
+    def __init__(self, supabase: Client, bucket: str):
+        self.supabase = supabase
+        self.bucket = bucket
+
+    def _bucket(self):
+        return self.supabase.storage.from_(self.bucket)
+
+    def exists(self, key: str) -> bool:
+        folder, _, name = key.rpartition("/")
+        try:
+            entries = self._bucket().list(folder, {"search": name, "limit": 1})
+        except Exception as e:
+            logger.warning("[Blob] exists check failed for %s/%s: %s", self.bucket, key, e)
+            return False
+        return any(entry.get("name") == name for entry in entries or [])
+
+    @staticmethod
+    def _is_duplicate(error: Exception) -> bool:
+        message = str(error).lower()
+        return "duplicate" in message or "already exists" in message or "409" in message
+
+    def _upload(self, key: str, body, content_type: str) -> None:
+        try:
+            self._bucket().upload(path=key, file=body, file_options={"contentType": content_type})
+        except Exception as e:
+            # A concurrent upload of the same content won the race; same bytes, nothing to do.
+            if not self._is_duplicate(e):
+                raise
+
+    def put_file(self, key: str, path: Path, content_type: str) -> None:
+        with open(path, "rb") as f:
+            self._upload(key, f, content_type)
+
+    def put_bytes(self, key: str, data: bytes, content_type: str) -> None:
+        self._upload(key, data, content_type)
+
+    def get_bytes(self, key: str) -> bytes:
+        return self._bucket().download(key)
+
+
+def get_blob_store(supabase: Optional[Client], bucket: str) -> BlobStore:
+    if settings.BLOB_STORE_BACKEND == "local":
+        return LocalBlobStore(os.path.join(settings.BLOB_STORE_LOCAL_DIR, bucket))
+    if supabase is None:
+        raise ValueError("A Supabase client is required for the 'supabase' blob store backend.")
+    return SupabaseBlobStore(supabase, bucket)
+
+
+@dataclass
+class StoredDocument:
+    digest: str
+    key: str
+    text_key: Optional[str]
+    uploaded: bool  # False when the object already existed
+
+
+def store_document(
+    store: BlobStore, owner_id: str, path: Path, text: Optional[str] = None, digest: Optional[str] = None
+) -> StoredDocument:
+    """
+    Store `path` under `owner_id`'s prefix by content hash (and `text` as a
+    compressed sidecar). Existing objects are not uploaded again.
+    """
+    path = Path(path)
+    digest = digest or file_sha256(path)
+    key = blob_key(owner_id, digest, path.suffix)
+
+    uploaded = False
+    if not store.exists(key):
+        content_type, _ = mimetypes.guess_type(path.name)
+        store.put_file(key, path, content_type or "application/octet-stream")
+        uploaded = True
+
+    sidecar = None
+    if text is not None and ZSTD_AVAILABLE:
+        sidecar = text_key(owner_id, digest)
+        if uploaded or not store.exists(sidecar):
+            store.put_bytes(sidecar, compress_text(text), "application/zstd")
+
+    return StoredDocument(digest=digest, key=key, text_key=sidecar, uploaded=uploaded)
+
+
+def load_text(store: BlobStore, owner_id: str, digest: str) -> Optional[str]:
+    """Return the stored extracted text for one of `owner_id`'s documents, if present."""
+    if not ZSTD_AVAILABLE:
+        return None
+    key = text_key(owner_id, digest)
+    if not store.exists(key):
+        return None
+    return decompress_text(store.get_bytes(key))
@@ -100,8 +100,11 @@ class DatabaseProfileRanker:
         """Run synchronous supabase client calls in a threadpool to avoid blocking."""
         return await asyncio.to_thread(fn, *args, **kwargs)
 
-    async def get_unranked_resumes(self, jd_id: str) -> List[Dict]:
-        """Fetch resumes for jd_id and exclude those already ranked."""
+    async def get_unranked_resumes(self, jd_id: str, jd_fingerprint: Optional[str] = None) -> List[Dict]:
+        """
+        Fetch resumes for jd_id that need scoring: never ranked, or ranked against
+        a different JD fingerprint (those carry the stale row's `_rank_id`).
+        """
         logger.info(f"[DBRanker] get_unranked_resumes for jd={jd_id}")
 
         def fetch_resumes():
@@ -114,13 +117,29 @@ class DatabaseProfileRanker:
         logger.info(f"[DBRanker] Found {len(resumes)} resumes for JD {jd_id} (before filtering).")
 
         def fetch_ranked():
-            return self.supabase.table("ranked_candidates_from_resume").select("resume_id").eq("jd_id", jd_id).execute()
+            return self.supabase.table("ranked_candidates_from_resume").select(
+                "rank_id,resume_id,jd_fingerprint"
+            ).eq("jd_id", jd_id).execute()
 
         ranked_resp = await self._supabase_execute(fetch_ranked)
-        ranked_ids = {r["resume_id"] for r in (getattr(ranked_resp, "data", None) or [])}
-        logger.info(f"[DBRanker] Already ranked {len(ranked_ids)} resumes for JD {jd_id}")
-
-        unranked = [r for r in resumes if r.get("resume_id") not in ranked_ids]
+        ranked_rows = getattr(ranked_resp, "data", None) or []
+        current_ids = {
+            r["resume_id"] for r in ranked_rows
+            if jd_fingerprint is None or r.get("jd_fingerprint") == jd_fingerprint
+        }
+        stale_rank_ids = {r["resume_id"]: r["rank_id"] for r in ranked_rows if r["resume_id"] not in current_ids}
+        logger.info(
+            f"[DBRanker] JD {jd_id}: {len(current_ids)} rankings current, {len(stale_rank_ids)} stale"
+        )
+
+        unranked = []
+        for r in resumes:
+            resume_id = r.get("resume_id")
+            if resume_id in current_ids:
+                continue
+            if resume_id in stale_rank_ids:
+                r = {**r, "_rank_id": stale_rank_ids[resume_id]}
+            unranked.append(r)
         logger.info(f"[DBRanker] {len(unranked)} resumes remain to be processed for JD {jd_id}")
         return unranked
 
@@ -225,10 +244,17 @@ Return a single JSON object only with the schema:
             logger.exception("[DBRanker] Gemini call failed: %s", e)
             return None
 
-    async def _insert_ranked_row(self, row: Dict):
-        """Insert the ranked row into DB via thread-wrapped supabase call."""
+    async def _insert_ranked_row(self, row: Dict, rank_id: Optional[str] = None):
+        """
+        Insert the ranked row via thread-wrapped supabase call. With `rank_id`
+        (a stale ranking) the existing row is rescored in place, which keeps its
+        favorite/outreach flags.
+        """
         def insert():
-            return self.supabase.table("ranked_candidates_from_resume").insert(row).execute()
+            table = self.supabase.table("ranked_candidates_from_resume")
+            if rank_id:
+                return table.update(row).eq("rank_id", rank_id).execute()
+            return table.insert(row).execute()
         return await self._supabase_execute(insert)
 
     async def _insert_error_row(self, candidate: Dict, jd: Dict, error_message: str):
@@ -239,9 +265,11 @@ Return a single JSON object only with the schema:
             "resume_id": candidate.get("resume_id"),
             "match_score": 0.00,
             "strengths": f"Evaluation failed: {error_message[:1000]}",
+            # No jd_fingerprint: failed evaluations count as stale and are retried by the next rerank.
+            "jd_fingerprint": None,
         }
         try:
-            await self._insert_ranked_row(err_row)
+            await self._insert_ranked_row(err_row, candidate.get("_rank_id"))
             logger.info(f"[DBRanker] Inserted error row for resume {candidate.get('resume_id')}")
         except Exception as db_e:
             logger.error(f"[DBRanker] Failed to insert error row for resume {candidate.get('resume_id')}: {db_e}")
@@ -302,10 +330,11 @@ Return a single JSON object only with the schema:
                 "rank": None,
                 "match_score": score_rounded,
                 "strengths": formatted_summary,
+                "jd_fingerprint": jd.get("summary_fingerprint"),
             }
 
             try:
-                await self._insert_ranked_row(row)
+                await self._insert_ranked_row(row, candidate.get("_rank_id"))
                 logger.info(f"[DBRanker] Inserted ranked row for resume {resume_id} (score={score_rounded})")
                 return {"resume_id": resume_id, "match_score": score_rounded}
             except Exception as e:
@@ -336,7 +365,7 @@ Return a single JSON object only with the schema:
         logger.info(f"[DBRanker] run start for jd={jd_id}")
 
         def fetch_jd():
-            return self.supabase.table("jds").select("jd_id,jd_parsed_summary").eq("jd_id", jd_id).single().execute()
+            return self.supabase.table("jds").select("jd_id,jd_parsed_summary,summary_fingerprint").eq("jd_id", jd_id).single().execute()
 
         jd_resp = await self._supabase_execute(fetch_jd)
         if not getattr(jd_resp, "data", None):
@@ -345,7 +374,7 @@ Return a single JSON object only with the schema:
             raise RuntimeError(msg)
 
         jd = jd_resp.data
-        candidates = await self.get_unranked_resumes(jd_id)
+        candidates = await self.get_unranked_resumes(jd_id, jd.get("summary_fingerprint"))
         if not candidates:
             logger.info(f"[DBRanker] No unranked resumes to process for JD {jd_id}.")
             return []
@@ -0,0 +1,43 @@
+# backend/app/services/gemini_client.py
+"""
+Shared google-genai client for structured-output parsing calls.
+
+Requests set response_mime_type="application/json" with a Pydantic
+response_schema, so the model returns schema-shaped JSON and the SDK
+validates it; callers never scrape JSON out of free text.
+"""
+from functools import lru_cache
+from typing import Any
+
+from google import genai
+from google.genai import types
+from pydantic import TypeAdapter
+
+from app.config import settings
+
+PARSE_MODEL = "gemini-2.5-flash"
+
+
+@lru_cache(maxsize=1)
+def get_client() -> genai.Client:
+    return genai.Client(api_key=settings.GEMINI_API_KEY)
+
+
+def generate_structured(prompt: str, schema: Any, model: str = PARSE_MODEL) -> Any:
+    """
+    Run `prompt` with `schema` (a Pydantic model, or e.g. list[Model]) as the
+    response schema and return the validated result.
+    """
+    response = get_client().models.generate_content(
+        model=model,
+        contents=prompt,
+        config=types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=schema,
+        ),
+    )
+    if response.parsed is not None:
+        return response.parsed
+    # The SDK leaves `parsed` empty when its own validation fails; validate once
+    # more so the caller gets a precise error.
+    return TypeAdapter(schema).validate_json(response.text or "")
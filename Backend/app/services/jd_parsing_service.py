@@ -7,31 +7,17 @@ from datetime import datetime
 import tempfile
 import re
 
-import google.generativeai as genai
 from supabase import Client
-import docx2txt
-import fitz  # ✅ Import PyMuPDF
+from typing import Dict, List, Optional, Tuple
 from app.config import settings
+from app.schemas.parsing import ParsedJd, dump_filled
+from app.services.blob_store import get_blob_store, store_document
+from app.services.gemini_client import generate_structured
+from app.services.parse_cache_service import KIND_JD, parse_with_cache
 
-# --- MODIFIED FUNCTION ---
-def extract_text(path: Path) -> str:
-    """
-    Extracts text from various file types, using PyMuPDF for PDFs
-    to preserve formatting and line breaks.
-    """
-    ext = path.suffix.lower()
-    if ext == ".txt":
-        return path.read_text(encoding="utf-8", errors="ignore")
-    elif ext == ".docx":
-        return docx2txt.process(str(path)) or ""
-    elif ext == ".pdf":
-        # ✅ SWITCHED to PyMuPDF (fitz) for superior layout preservation
-        full_text = ""
-        with fitz.open(path) as doc:
-            for page in doc:
-                full_text += page.get_text()
-        return full_text.strip()
-    raise ValueError(f"Unsupported file type: {ext}")
+# Text extraction is shared with resume parsing: PyMuPDF in a process pool,
+# with per-file timeouts and a hash cache (see text_extraction_service).
+from app.services.text_extraction_service import extract_text
 
 
 def _normalize_key_requirements(value):
@@ -134,6 +120,57 @@ def _strip_experience_from_requirement(req: str) -> str:
     return s
 
 
+_JD_FIELD_INSTRUCTIONS = """- role: Short job title (e.g. 'Senior Backend Engineer', 'Data Scientist') if present; else null/empty
+- location: City/State/Country if present; else null/empty
+- job_type: One of ['Full Time', 'Part Time', 'Internship', 'Contract'] if you can infer, else null/empty
+- experience_required: Return as short free text, e.g. '2-3 years', '5+ years', or null/empty
+- jd_parsed_summary: 2-4 sentence summary capturing the role, seniority, key responsibilities, and core skills.
+- key_requirements: A short array/list of the most important requirements or qualifications (each as a short string), e.g. ["Python", "SQL", "Experience with AWS"].
+
+IMPORTANT: Do NOT include experience durations, numeric year ranges, or the word "experience" inside key_requirements.
+All experience/years MUST go into the `experience_required` field only. If a requirement mentions experience, extract the skill itself (for example "3+ years Python" -> "Python"; "Experience with AWS" -> "AWS"). Return key_requirements as an array of short skill/requirement strings WITHOUT any experience text.
+
+If a field is not present, return it as an empty string for scalar fields or an empty array for key_requirements.
+"""
+
+
+def _normalize_parsed_jd(data: dict) -> dict:
+    """Clean a ParsedJd dump: trim strings, validate job_type, strip experience from key_requirements."""
+    normalized_data = {
+        "role": (data.get("role") or "").strip() if isinstance(data.get("role"), str) else (str(data.get("role")).strip() if data.get("role") is not None else ""),
+        "location": (data.get("location") or "").strip(),
+        "job_type": (data.get("job_type") or "").strip(),
+        "experience_required": (data.get("experience_required") or "").strip(),
+        "jd_parsed_summary": (data.get("jd_parsed_summary") or "").strip(),
+        "key_requirements_raw": data.get("key_requirements") if "key_requirements" in data else None,
+    }
+
+    # Normalize job_type
+    allowed_job_types = {"Full Time", "Part Time", "Internship", "Contract"}
+    if normalized_data["job_type"] not in allowed_job_types:
+        normalized_data["job_type"] = ""
+
+    # Normalize key_requirements into a list of strings
+    key_reqs = _normalize_key_requirements(normalized_data.pop("key_requirements_raw"))
+
+    # Remove/strip any experience mentions from individual key requirements
+    cleaned_key_reqs = []
+    seen = set()
+    for kr in key_reqs:
+        stripped = _strip_experience_from_requirement(kr)
+        if not stripped:
+            continue
+        # dedupe preserving order
+        if stripped.lower() in seen:
+            continue
+        seen.add(stripped.lower())
+        cleaned_key_reqs.append(stripped)
+
+    normalized_data["key_requirements"] = cleaned_key_reqs
+
+    return normalized_data
+
+
 def parse_jd_text(text: str) -> dict:
     """
     Calls the Google Gemini API to parse text and normalizes the response.
@@ -146,112 +183,153 @@ def parse_jd_text(text: str) -> dict:
       - key_requirements (list of short strings) -- note: experience-related text removed
     """
     try:
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        
-        # --- START: CORRECTION ---
-        # The model name has been updated to the latest stable version.
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        # --- END: CORRECTION ---
-
         prompt = f"""You are an expert job description parser. Extract the following fields from the provided job description text:
 
-- role: Short job title (e.g. 'Senior Backend Engineer', 'Data Scientist') if present; else null/empty
-- location: City/State/Country if present; else null/empty
-- job_type: One of ['Full Time', 'Part Time', 'Internship', 'Contract'] if you can infer, else null/empty
-- experience_required: Return as short free text, e.g. '2-3 years', '5+ years', or null/empty
-- jd_parsed_summary: 2-4 sentence summary capturing the role, seniority, key responsibilities, and core skills.
-- key_requirements: A short array/list of the most important requirements or qualifications (each as a short string), e.g. ["Python", "SQL", "Experience with AWS"].
-
-IMPORTANT: Do NOT include experience durations, numeric year ranges, or the word "experience" inside key_requirements.
-All experience/years MUST go into the `experience_required` field only. If a requirement mentions experience, extract the skill itself (for example "3+ years Python" -> "Python"; "Experience with AWS" -> "AWS"). Return key_requirements as an array of short skill/requirement strings WITHOUT any experience text.
-
-If a field is not present, return it as an empty string for scalar fields or an empty array for key_requirements.
-Return strictly as compact JSON with keys: role, location, job_type, experience_required, jd_parsed_summary, key_requirements.
-
+{_JD_FIELD_INSTRUCTIONS}
 Job Description Text:
 ---
 {text[:120000]}
 ---"""
 
-        response = model.generate_content(prompt)
-        
-        content = response.text.strip()
-        # strip possible markdown fences
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.endswith("```"):
-            content = content[:-3]
-        content = content.strip()
-
-        data = json.loads(content)
-
-        normalized_data = {
-            "role": (data.get("role") or "").strip() if isinstance(data.get("role"), str) else (str(data.get("role")).strip() if data.get("role") is not None else ""),
-            "location": (data.get("location") or "").strip(),
-            "job_type": (data.get("job_type") or "").strip(),
-            "experience_required": (data.get("experience_required") or "").strip(),
-            "jd_parsed_summary": (data.get("jd_parsed_summary") or "").strip(),
-            "key_requirements_raw": data.get("key_requirements") if "key_requirements" in data else None,
-        }
-
-        # Normalize job_type
-        allowed_job_types = {"Full Time", "Part Time", "Internship", "Contract"}
-        if normalized_data["job_type"] not in allowed_job_types:
-            normalized_data["job_type"] = ""
-
-        # Normalize key_requirements into a list of strings
-        key_reqs = _normalize_key_requirements(normalized_data.pop("key_requirements_raw"))
-
-        # Remove/strip any experience mentions from individual key requirements
-        cleaned_key_reqs = []
-        seen = set()
-        for kr in key_reqs:
-            stripped = _strip_experience_from_requirement(kr)
-            if not stripped:
-                continue
-            # dedupe preserving order
-            if stripped.lower() in seen:
-                continue
-            seen.add(stripped.lower())
-            cleaned_key_reqs.append(stripped)
-
-        normalized_data["key_requirements"] = cleaned_key_reqs
-
-        return normalized_data
+        # Structured output: the response is validated against ParsedJd by the SDK.
+        data = dump_filled(generate_structured(prompt, ParsedJd))
+
+        return _normalize_parsed_jd(data)
 
     except Exception as e:
         print(f"Error during Gemini API call: {e}")
         raise
 
 
+# --- Incremental re-parse for edited JDs ---
+# Edited JD text is split into sections and diffed against the previous text;
+# only changed/added/removed sections go to Gemini, together with the fields
+# parsed from the previous version.
+
+JD_PARSED_FIELDS = ("role", "location", "job_type", "experience_required", "jd_parsed_summary", "key_requirements")
+
+_JD_SECTION_KEYWORDS = (
+    "about", "overview", "summary", "role", "responsibilities", "what you", "duties",
+    "requirements", "qualifications", "skills", "experience", "nice to have",
+    "preferred", "benefits", "perks", "compensation", "salary", "location", "who you are",
+    "what we", "why join", "education", "tech stack",
+)
+# Re-parse everything when more than this share of the text changed.
+_JD_INCREMENTAL_MAX_CHANGED = 0.5
+
+
+def _is_jd_heading(line: str) -> bool:
+    if line.lstrip().startswith(("-", "•", "·", "▪", "●", "* ")):
+        return False
+    stripped = line.strip().strip("#*").strip()
+    if not stripped or len(stripped) > 60 or stripped.endswith((".", ",")):
+        return False
+    if stripped.endswith(":") or (stripped.isupper() and any(c.isalpha() for c in stripped)):
+        return True
+    lowered = stripped.lower()
+    return len(stripped.split()) <= 6 and any(lowered.startswith(k) for k in _JD_SECTION_KEYWORDS)
+
+
+def split_jd_sections(text: str) -> List[Tuple[str, str]]:
+    """Split JD text into [(heading, body)]; text before the first heading has heading ''."""
+    sections: List[Tuple[str, List[str]]] = [("", [])]
+    for line in (text or "").splitlines():
+        if _is_jd_heading(line):
+            sections.append((line.strip().strip("#*").strip().rstrip(":"), []))
+        else:
+            sections[-1][1].append(line)
+    return [(h, "\n".join(body).strip()) for h, body in sections if h or "\n".join(body).strip()]
+
+
+def _keyed_sections(text: str) -> Dict[str, Tuple[str, str]]:
+    """{heading key: (heading, body)}; repeated headings get an occurrence index."""
+    counts: Dict[str, int] = {}
+    keyed = {}
+    for heading, body in split_jd_sections(text):
+        base = re.sub(r"\s+", " ", heading.lower())
+        counts[base] = counts.get(base, 0) + 1
+        keyed[f"{base}#{counts[base]}"] = (heading, body)
+    return keyed
+
+
+def diff_jd_sections(old_text: str, new_text: str) -> Dict[str, list]:
+    """Return {"changed": [(heading, body)], "removed": [heading]} between two JD texts."""
+    def norm(body: str) -> str:
+        return re.sub(r"\s+", " ", body).strip()
+
+    old, new = _keyed_sections(old_text), _keyed_sections(new_text)
+    changed = [
+        (heading, body) for key, (heading, body) in new.items()
+        if key not in old or norm(old[key][1]) != norm(body)
+    ]
+    removed = [heading for key, (heading, _) in old.items() if key not in new]
+    return {"changed": changed, "removed": removed}
+
+
+def reparse_jd_text(previous: dict, new_text: str) -> dict:
+    """
+    Parse an edited JD. `previous` is the stored jds row (jd_text plus the
+    parsed fields). Unchanged text reuses the stored fields; a small edit sends
+    only the changed sections; large rewrites fall back to parse_jd_text.
+    """
+    old_text = previous.get("jd_text") or ""
+    previous_fields = {f: previous.get(f) for f in JD_PARSED_FIELDS}
+    if not old_text or not previous.get("jd_parsed_summary"):
+        return parse_jd_text(new_text)
+
+    diff = diff_jd_sections(old_text, new_text)
+    if not diff["changed"] and not diff["removed"]:
+        return _normalize_parsed_jd(previous_fields)
+
+    changed_chars = sum(len(body) for _, body in diff["changed"])
+    if len(split_jd_sections(old_text)) < 2 or changed_chars > _JD_INCREMENTAL_MAX_CHANGED * max(1, len(new_text)):
+        return parse_jd_text(new_text)
+
+    changed_text = "\n\n".join(f"## {heading or '(untitled)'}\n{body}" for heading, body in diff["changed"])
+    removed_text = ", ".join(h or "(untitled)" for h in diff["removed"]) or "none"
+    try:
+        prompt = f"""You are an expert job description parser. A job description was edited.
+Below are the fields parsed from the previous version, the sections that were added or changed,
+and the headings of removed sections. Return the updated fields for the edited job description,
+keeping previous values wherever the edits do not affect them.
+
+{_JD_FIELD_INSTRUCTIONS}
+Previous fields:
+{json.dumps(previous_fields, default=str)}
+
+Added or changed sections:
+---
+{changed_text[:60000]}
+---
+
+Removed sections: {removed_text}"""
+        data = dump_filled(generate_structured(prompt, ParsedJd))
+        return _normalize_parsed_jd(data)
+    except Exception as e:
+        print(f"Error during incremental Gemini JD parse: {e}")
+        raise
+
+
 # --- MODIFIED FUNCTION ---
-def process_jd_file(supabase: Client, file_path: Path, user_id: str) -> dict:
+def process_jd_file(supabase: Client, file_path: Path, user_id: str, scope_id: Optional[str] = None) -> dict:
     """
     Processes a JD file:
     1. Extracts raw text with formatting preserved using PyMuPDF.
-    2. Calls an AI model to parse the raw text into structured data.
-    3. Saves the original file to storage.
+    2. Calls an AI model to parse the raw text into structured data, unless the
+       same text was already parsed within `scope_id` (the uploader's org).
+    3. Saves the original file (and a compressed text sidecar) to the content-addressed blob store.
     4. Inserts both the raw text and the parsed data into the database.
     """
     text = extract_text(file_path)
     if not text.strip():
         raise ValueError("No text could be extracted from the JD file.")
 
-    # Get structured data from the AI parser
-    parsed_data = parse_jd_text(text)
+    # Get structured data from the AI parser (or the org's parse cache)
+    parsed_data, _, _ = parse_with_cache(supabase, scope_id or user_id, KIND_JD, text, parse_jd_text)
 
-    # Upload the original file to Supabase storage
-    bucket = "jds"
-    ts = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-    object_name = f"{user_id}/{ts}_{file_path.name}"
-    
-    with open(file_path, "rb") as f:
-        content_type, _ = mimetypes.guess_type(file_path.name)
-        supabase.storage.from_(bucket).upload(
-            path=object_name, 
-            file=f, 
-            file_options={"contentType": content_type or "application/octet-stream"}
-        )
+    # Store the original file, content-addressed so re-uploads are not sent again
+    stored = store_document(get_blob_store(supabase, "jds"), user_id, file_path, text)
+    object_name = stored.key
 
     # Prepare the complete row for insertion into the 'jds' table
     row = {
@@ -0,0 +1,86 @@
+# backend/app/services/parse_cache_service.py
+"""
+Content-hash cache for parsed resumes and JDs.
+
+Documents are keyed by the SHA-256 of their normalized text, so re-uploading
+the same resume (to another JD, or as part of a re-uploaded folder) reuses the
+parsed JSON instead of paying for another Gemini call. Entries live in the
+`parse_cache` table and are scoped to the uploader's organization.
+"""
+import hashlib
+import logging
+import re
+import unicodedata
+from typing import Callable, Dict, Optional, Tuple
+
+from supabase import Client
+
+logger = logging.getLogger(__name__)
+
+KIND_RESUME = "resume"
+KIND_JD = "jd"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """NFKC-normalize and collapse whitespace so trivial re-exports hash the same."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text or "")).strip()
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def cache_scope(user) -> str:
+    """Parses are shared across the user's organization, or kept per user without one."""
+    return str(user.organization_id or user.id)
+
+
+def lookup(supabase: Client, scope_id: str, kind: str, digest: str) -> Optional[Dict]:
+    try:
+        res = supabase.rpc(
+            "parse_cache_hit",
+            {"p_scope_id": scope_id, "p_kind": kind, "p_content_hash": digest},
+        ).execute()
+    except Exception as e:
+        logger.warning("[ParseCache] lookup failed for %s %s: %s", kind, digest[:12], e)
+        return None
+    return res.data if isinstance(res.data, dict) else None
+
+
+def store(supabase: Client, scope_id: str, kind: str, digest: str, parsed: Dict) -> None:
+    try:
+        supabase.table("parse_cache").upsert(
+            {"scope_id": scope_id, "kind": kind, "content_hash": digest, "parsed": parsed},
+            on_conflict="scope_id,kind,content_hash",
+            ignore_duplicates=True,
+        ).execute()
+    except Exception as e:
+        logger.warning("[ParseCache] store failed for %s %s: %s", kind, digest[:12], e)
+
+
+def parse_with_cache(
+    supabase: Client,
+    scope_id: str,
+    kind: str,
+    text: str,
+    parse_fn: Callable[[str], Dict],
+    store_result: bool = True,
+) -> Tuple[Dict, str, bool]:
+    """
+    Return (parsed, content_hash, cache_hit). Cache errors are logged and fall
+    through to `parse_fn`, so a cache outage never blocks an upload.
+    Pass store_result=False when `parse_fn` depends on more than the text
+    (e.g. an incremental re-parse), so its result is not cached under the text hash.
+    """
+    digest = content_hash(text)
+    cached = lookup(supabase, scope_id, kind, digest)
+    if cached is not None:
+        logger.info("[ParseCache] %s cache hit %s", kind, digest[:12])
+        return cached, digest, True
+
+    parsed = parse_fn(text)
+    if store_result:
+        store(supabase, scope_id, kind, digest, parsed)
+    return parsed, digest, False
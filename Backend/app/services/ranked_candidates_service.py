@@ -0,0 +1,197 @@
+# backend/app/services/ranked_candidates_service.py
+"""
+Keyset-paginated reads over the ranked candidate tables.
+
+Rows are ordered by (match_score DESC, rank_id DESC) and pages are addressed by
+an opaque cursor holding the last (match_score, rank_id) pair that was returned,
+so every page costs one index range scan no matter how deep the client pages.
+"""
+import base64
+import json
+import logging
+import uuid
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Numeric, cast, func, literal, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.candidate import (
+    RankedCandidate,
+    RankedCandidateFromResume,
+    Resume,
+    SearchProfile,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 200
+
+SOURCE_SEARCH = "ranked_candidates"
+SOURCE_RESUME = "ranked_candidates_from_resume"
+SOURCES = (SOURCE_SEARCH, SOURCE_RESUME)
+
+# Fields that are always returned because the client needs them to address
+# the row (favorite toggle) and to build the next cursor.
+_KEY_FIELDS = ("rank_id", "match_score")
+
+# Projectable fields shared by both sources. `strengths` is the long markdown
+# evaluation; list views should leave it out.
+SELECTABLE_FIELDS = (
+    "rank_id",
+    "match_score",
+    "strengths",
+    "favorite",
+    "save_for_future",
+    "outreached",
+    "linkedin_url",
+    "created_at",
+    "profile_name",
+    "role",
+    "company",
+    "profile_url",
+)
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(match_score: Optional[Decimal], rank_id: uuid.UUID) -> str:
+    payload = {"s": str(match_score if match_score is not None else 0), "r": str(rank_id)}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Decimal, uuid.UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return Decimal(payload["s"]), uuid.UUID(payload["r"])
+    except (ValueError, KeyError, TypeError, InvalidOperation) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from e
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Parse a comma separated `fields=` value. Returns None when every field
+    should be returned. Raises ValueError on unknown field names.
+    """
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in SELECTABLE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return requested
+
+
+def _source_columns(source: str) -> Tuple[type, type, object, object, Dict[str, object]]:
+    """Return (ranked model, detail model, join clause, id column, field -> column map)."""
+    if source == SOURCE_RESUME:
+        ranked, detail, id_col = RankedCandidateFromResume, Resume, RankedCandidateFromResume.resume_id
+        detail_cols = {
+            "profile_name": Resume.person_name,
+            "role": Resume.role,
+            "company": Resume.company,
+            "profile_url": Resume.profile_url,
+        }
+        join_on = Resume.resume_id == RankedCandidateFromResume.resume_id
+    else:
+        ranked, detail, id_col = RankedCandidate, SearchProfile, RankedCandidate.profile_id
+        detail_cols = {
+            "profile_name": SearchProfile.profile_name,
+            "role": SearchProfile.role,
+            "company": SearchProfile.company,
+            "profile_url": SearchProfile.profile_url,
+        }
+        join_on = SearchProfile.profile_id == RankedCandidate.profile_id
+
+    columns = {
+        "rank_id": ranked.rank_id,
+        "match_score": ranked.match_score,
+        "strengths": ranked.strengths,
+        "favorite": ranked.favorite,
+        "save_for_future": ranked.save_for_future,
+        "outreached": ranked.outreached,
+        "linkedin_url": ranked.linkedin_url,
+        "created_at": ranked.created_at,
+        **detail_cols,
+    }
+    return ranked, detail, join_on, id_col, columns
+
+
+def fetch_ranked_page(
+    db: Session,
+    jd_id: str,
+    *,
+    source: str = SOURCE_SEARCH,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    fields: Optional[Sequence[str]] = None,
+    min_score: Optional[float] = None,
+    favorite: Optional[bool] = None,
+) -> Dict:
+    """
+    Return one page of ranked candidates for a JD:
+        {"data": [...], "next_cursor": str | None, "source": source}
+
+    Each item always carries its candidate id (`profile_id` or `resume_id`),
+    `rank_id`, `match_score` and `source`; other keys follow `fields`.
+    """
+    if source not in SOURCES:
+        raise ValueError(f"source must be one of {', '.join(SOURCES)}")
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+
+    ranked, detail, join_on, id_col, columns = _source_columns(source)
+    wanted = list(fields) if fields else list(SELECTABLE_FIELDS)
+    for key in reversed(_KEY_FIELDS):
+        if key not in wanted:
+            wanted.insert(0, key)
+
+    # coalesce() matches the expression index created for this ordering.
+    score_key = func.coalesce(ranked.match_score, 0)
+    selected = [id_col.label(id_col.key)] + [columns[f].label(f) for f in wanted]
+    stmt = select(*selected, score_key.label("_score_key")).select_from(ranked)
+    if any(f in wanted for f in ("profile_name", "role", "company", "profile_url")):
+        stmt = stmt.outerjoin(detail, join_on)
+
+    stmt = stmt.where(ranked.jd_id == uuid.UUID(str(jd_id)))
+    if min_score is not None:
+        stmt = stmt.where(score_key >= cast(literal(Decimal(str(min_score))), Numeric(5, 2)))
+    if favorite is not None:
+        stmt = stmt.where(ranked.favorite.is_(favorite))
+    if cursor:
+        after_score, after_rank_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(score_key, ranked.rank_id)
+            < tuple_(cast(literal(after_score), Numeric(5, 2)), literal(after_rank_id, ranked.rank_id.type))
+        )
+
+    # Fetch one extra row to know whether another page exists.
+    stmt = stmt.order_by(score_key.desc(), ranked.rank_id.desc()).limit(limit + 1)
+    rows = db.execute(stmt).mappings().all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    data = []
+    for row in rows:
+        item = {id_col.key: str(row[id_col.key]) if row[id_col.key] is not None else None}
+        for f in wanted:
+            value = row[f]
+            if f == "match_score" and value is not None:
+                value = float(value)
+            elif f == "rank_id" and value is not None:
+                value = str(value)
+            item[f] = value
+        item["source"] = source
+        data.append(item)
+
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = encode_cursor(last["_score_key"], last["rank_id"])
+
+    return {"data": data, "next_cursor": next_cursor, "source": source}
@@ -0,0 +1,240 @@
+# backend/app/services/resume_ingestion_service.py
+"""
+Bulk resume ingestion used by the `ingest_resumes_task` Celery task.
+
+Uploaded files are spooled once into a per-job directory under
+settings.UPLOAD_SPOOL_DIR by the API. The task then:
+  1. extracts text through the shared process-pool extraction engine,
+  2. hashes the normalized text; files already stored for this JD are skipped,
+     the rest are saved to the content-addressed blob store, and texts already
+     parsed in the org reuse the cached JSON,
+  3. parses the rest in batched Gemini requests (ResumeParseStream), with at
+     most settings.RESUME_PARSE_CONCURRENCY requests in flight; a batch is sent
+     as soon as it fills, while later files are still being extracted,
+  4. batch-inserts the resulting rows into the `resume` table,
+reporting per-file progress through a callback as each file moves along.
+"""
+import asyncio
+import json
+import logging
+import shutil
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from supabase import Client
+
+from app.config import settings
+from app.services import parse_cache_service
+from app.services.blob_store import get_blob_store, store_document
+from app.services.resume_parsing_service import ResumeParseStream
+from app.services.text_extraction_service import extract_text
+
+logger = logging.getLogger(__name__)
+
+# Rows per insert request into the `resume` table.
+INSERT_CHUNK_SIZE = 100
+
+STATUS_QUEUED = "queued"
+STATUS_EXTRACTING = "extracting"
+STATUS_PARSING = "parsing"
+STATUS_STORING = "storing"
+STATUS_DONE = "done"
+STATUS_DUPLICATE = "duplicate"
+STATUS_FAILED = "failed"
+FINAL_STATUSES = (STATUS_DONE, STATUS_DUPLICATE, STATUS_FAILED)
+
+
+def create_job_dir() -> Path:
+    """Create a fresh spool directory for one ingestion job."""
+    job_dir = Path(settings.UPLOAD_SPOOL_DIR) / uuid.uuid4().hex
+    job_dir.mkdir(parents=True, exist_ok=False)
+    return job_dir
+
+
+def remove_job_dir(job_dir: Path) -> None:
+    shutil.rmtree(job_dir, ignore_errors=True)
+
+
+def build_resume_row(
+    parsed_data: Dict, jd_id: str, user_id: str,
+    content_hash: Optional[str] = None, file_url: Optional[str] = None,
+) -> Dict:
+    """Map a parse_resume_text result onto the `resume` table schema."""
+    return {
+        "resume_id": str(uuid.uuid4()),
+        "jd_id": jd_id,
+        "user_id": user_id,
+        "json_content": json.dumps(parsed_data.get("json_content", {})),
+        "person_name": parsed_data.get("person_name"),
+        "role": parsed_data.get("role"),
+        "company": parsed_data.get("company"),
+        "profile_url": parsed_data.get("profile_url"),
+        "content_hash": content_hash,
+        # Content-addressed object key in the `resumes` bucket (see blob_store)
+        "file_url": file_url,
+    }
+
+
+class IngestionProgress:
+    """
+    Per-file status for one job; `on_change` receives a snapshot after every
+    transition, and `on_final(indexes, status, error)` is called when files
+    reach a final status (used for checkpointing).
+    """
+
+    def __init__(self, filenames: List[str], on_change: Optional[Callable[[Dict], None]] = None):
+        self.files = [{"filename": name, "status": STATUS_QUEUED, "error": None} for name in filenames]
+        self.on_change = on_change
+        self.on_final: Optional[Callable[[List[int], str, Optional[str]], None]] = None
+
+    def set(self, index: int, status: str, error: Optional[str] = None) -> None:
+        self.set_many([index], status, error)
+
+    def set_many(self, indexes: List[int], status: str, error: Optional[str] = None) -> None:
+        for index in indexes:
+            self.files[index]["status"] = status
+            self.files[index]["error"] = error
+        if self.on_final and status in FINAL_STATUSES:
+            try:
+                self.on_final(indexes, status, error)
+            except Exception:
+                logger.exception("[Ingest] final-status callback failed")
+        if self.on_change:
+            try:
+                self.on_change(self.snapshot())
+            except Exception:
+                logger.exception("[Ingest] progress callback failed")
+
+    def snapshot(self) -> Dict:
+        done = sum(1 for f in self.files if f["status"] == STATUS_DONE)
+        duplicates = sum(1 for f in self.files if f["status"] == STATUS_DUPLICATE)
+        failed = sum(1 for f in self.files if f["status"] == STATUS_FAILED)
+        return {
+            "total": len(self.files),
+            "done": done,
+            "duplicates": duplicates,
+            "failed": failed,
+            "files": [dict(f) for f in self.files],
+        }
+
+
+def _already_stored(supabase: Client, jd_id: str, digest: str) -> bool:
+    res = (
+        supabase.table("resume").select("resume_id")
+        .eq("jd_id", jd_id).eq("content_hash", digest).limit(1).execute()
+    )
+    return bool(res.data)
+
+
+def _insert_rows(supabase: Client, rows: List[Dict]) -> None:
+    for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+        supabase.table("resume").insert(rows[i:i + INSERT_CHUNK_SIZE]).execute()
+
+
+async def ingest_resumes(
+    supabase: Client,
+    files: List[Dict],
+    jd_id: str,
+    user_id: str,
+    progress: IngestionProgress,
+    scope_id: Optional[str] = None,
+) -> Dict:
+    """
+    Extract, parse and store spooled resume files.
+    `files` is a list of {"filename": original name, "path": spooled path}, plus an
+    optional "progress_index" when `progress` tracks more files than this call
+    (windowed ZIP imports); counts in the returned summary cover all of `progress`.
+    `scope_id` selects the shared parse cache (the uploader's org; defaults to the user).
+    Returns {"successful_uploads": int, "duplicate_uploads": int,
+    "failed_uploads": [{"filename", "error"}]}.
+    """
+    scope_id = scope_id or user_id
+    # Hashes claimed by this job; checked and set without awaiting in between.
+    seen_hashes = set()
+    # Cache misses go to the parser as they are found; {index: content hash}.
+    parser = ResumeParseStream(settings.RESUME_PARSE_CONCURRENCY)
+    to_parse: Dict[int, str] = {}
+    blobs = get_blob_store(supabase, "resumes")
+    file_urls: Dict[int, str] = {}
+
+    def slot(index: int) -> int:
+        return files[index].get("progress_index", index)
+
+    async def prepare(index: int, entry: Dict) -> Optional[Dict]:
+        path = Path(entry["path"])
+        try:
+            progress.set(slot(index), STATUS_EXTRACTING)
+            # The engine runs the parse in its process pool; the thread only waits.
+            text_content = await asyncio.to_thread(extract_text, path)
+            if not text_content.strip():
+                raise ValueError("No text could be extracted from the resume.")
+
+            digest = parse_cache_service.content_hash(text_content)
+            if digest in seen_hashes or await asyncio.to_thread(_already_stored, supabase, jd_id, digest):
+                progress.set(slot(index), STATUS_DUPLICATE)
+                return None
+            seen_hashes.add(digest)
+
+            try:
+                stored = await asyncio.to_thread(store_document, blobs, user_id, path, text_content)
+                file_urls[index] = stored.key
+            except Exception as e:
+                logger.warning("[Ingest] Could not store original of %s: %s", entry.get("filename"), e)
+
+            progress.set(slot(index), STATUS_PARSING)
+            parsed_data = await asyncio.to_thread(
+                parse_cache_service.lookup, supabase, scope_id, parse_cache_service.KIND_RESUME, digest
+            )
+            if parsed_data is None:
+                await parser.add(index, text_content)
+                to_parse[index] = digest
+                return None
+
+            progress.set(slot(index), STATUS_STORING)
+            return build_resume_row(parsed_data, jd_id, user_id, digest, file_urls.get(index))
+        except Exception as e:
+            logger.warning("[Ingest] %s failed: %s", entry.get("filename"), e)
+            progress.set(slot(index), STATUS_FAILED, str(e))
+            return None
+        finally:
+            path.unlink(missing_ok=True)
+
+    results = list(await asyncio.gather(*(prepare(i, entry) for i, entry in enumerate(files))))
+
+    parsed_results = await parser.finish()
+    for index, digest in to_parse.items():
+        parsed_data = parsed_results.get(index)
+        if isinstance(parsed_data, Exception):
+            logger.warning("[Ingest] %s failed: %s", files[index].get("filename"), parsed_data)
+            progress.set(slot(index), STATUS_FAILED, str(parsed_data))
+            continue
+        await asyncio.to_thread(
+            parse_cache_service.store,
+            supabase, scope_id, parse_cache_service.KIND_RESUME, digest, parsed_data,
+        )
+        results[index] = build_resume_row(parsed_data, jd_id, user_id, digest, file_urls.get(index))
+        progress.set(slot(index), STATUS_STORING)
+
+    parsed = [(i, r) for i, r in enumerate(results) if r]
+    rows = [r for _, r in parsed]
+    if rows:
+        try:
+            await asyncio.to_thread(_insert_rows, supabase, rows)
+            final_status, final_error = STATUS_DONE, None
+        except Exception as e:
+            logger.exception("[Ingest] Database insertion into 'resume' table failed")
+            final_status, final_error = STATUS_FAILED, f"Database insertion into 'resume' table failed: {e}"
+            rows = []
+        progress.set_many([slot(index) for index, _ in parsed], final_status, final_error)
+
+    failed = [
+        {"filename": f["filename"], "error": f["error"]}
+        for f in progress.files if f["status"] == STATUS_FAILED
+    ]
+    duplicates = sum(1 for f in progress.files if f["status"] == STATUS_DUPLICATE)
+    logger.info(
+        "[Ingest] JD %s: %d resumes stored, %d duplicates skipped, %d failed",
+        jd_id, len(rows), duplicates, len(failed),
+    )
+    return {"successful_uploads": len(rows), "duplicate_uploads": duplicates, "failed_uploads": failed}
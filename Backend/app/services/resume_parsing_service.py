@@ -1,111 +1,361 @@
 # backend/app/services/resume_parsing_service.py
 import os
-import json
+import asyncio
 import mimetypes
 from pathlib import Path
 from datetime import datetime
 import tempfile
-import re
 
-# --- START: MODIFICATION ---
-# Replaced OpenAI with the Gemini client and imported settings
-import google.generativeai as genai
 from app.config import settings
-# --- END: MODIFICATION ---
 
 from supabase import Client
-import docx2txt
-from pypdf import PdfReader
-
-# --- Text Extraction Logic (This is your original code, UNCHANGED) ---
-def extract_text(path: Path) -> str:
-    ext = path.suffix.lower()
-    if ext == ".txt":
-        return path.read_text(encoding="utf-8", errors="ignore")
-    elif ext == ".docx":
-        return docx2txt.process(str(path)) or ""
-    elif ext == ".pdf":
-        text_parts = []
-        with open(path, "rb") as f:
-            reader = PdfReader(f)
-            for page in reader.pages:
-                text_parts.append(page.extract_text() or "")
-        return "\n".join(text_parts).strip()
-    raise ValueError(f"Unsupported file type: {ext}")
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+from app.schemas.parsing import BatchParsedResume, ParsedResume, ResumeDetails, ResumeHeadline, dump_filled
+from app.services.blob_store import get_blob_store, store_document
+from app.services.gemini_client import generate_structured
+from app.services.parse_cache_service import KIND_RESUME, parse_with_cache
+from app.services.resume_rule_parser import parse_resume_rules, resume_details
+
+# --- Text Extraction Logic ---
+# Shared with JD parsing: PyMuPDF in a process pool, with timeouts and a hash cache.
+from app.services.text_extraction_service import extract_text
 
 # --- START: MODIFIED SECTION ---
-# This is the only section that has been changed to use the Gemini API.
+# Gemini is only called for what the rule-based extractor cannot fill.
 
-def parse_resume_text(text: str) -> dict:
+# Top-level fields every parse must return; Gemini is asked for those the rules miss.
+HEADLINE_FIELDS = ["person_name", "role", "company"]
+
+
+def _parse_resume_with_llm(text: str) -> dict:
     """
-    Calls the Google Gemini API to parse resume text.
-    This version includes robust JSON extraction to handle imperfect model output.
+    Full Gemini parse, used for resumes the rules cannot structure.
+    The response is constrained to the ParsedResume schema.
     """
     try:
-        genai.configure(api_key=settings.GEMINI_API_KEY)
-        model = genai.GenerativeModel('gemini-2.5-flash')
-
-        prompt = f"""You are an expert resume parser. Extract a comprehensive JSON profile from the resume text.
+        prompt = f"""You are an expert resume parser. Extract a comprehensive profile from the resume text.
 
-Return strictly valid JSON with these top-level keys:
-- person_name: string (best guess, full name; empty if unknown)
-- role: string (current or most recent role title; empty if unknown)
-- company: string (current or most recent company; empty if unknown)
-- profile_url: string (LinkedIn or personal site if present; empty if unknown)
-- json_content: object with detailed fields.
+- person_name: full name
+- role: current or most recent role title
+- company: current or most recent company
+- profile_url: LinkedIn or personal site if present
+- json_content: contact details, summary, skills, experience, education, certifications and projects
 
 Rules:
-- Use empty strings, empty arrays, or nulls where information is missing.
+- Use empty strings or empty arrays where information is missing.
 - Do not invent data; infer conservatively from the text.
 
 Resume Text:
 ---
 {text[:120000]}
 ---"""
+        return dump_filled(generate_structured(prompt, ParsedResume))
 
-        response = model.generate_content(prompt)
-        content = response.text.strip()
+    except Exception as e:
+        print(f"Error during Gemini API call for resume: {e}")
+        raise
 
-        # --- START: ROBUST JSON EXTRACTION ---
-        # Use a regular expression to find the JSON block, even with markdown backticks
-        json_match = re.search(r'```(?:json)?\s*({.*?})\s*```', content, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(1)
-        else:
-            # Fallback for cases where there are no backticks
-            json_str = content[content.find('{'):content.rfind('}')+1]
-        
-        return json.loads(json_str)
-        # --- END: ROBUST JSON EXTRACTION ---
 
+def _parse_resume_gaps_with_llm(text: str, gaps: list) -> dict:
+    """
+    Ask Gemini only for `gaps` (a subset of HEADLINE_FIELDS). The header and the
+    experience section carry these fields, so only the start of the resume is sent.
+    """
+    descriptions = {
+        "person_name": "full name",
+        "role": "current or most recent role title",
+        "company": "current or most recent company",
+    }
+    keys = "\n".join(f"- {g}: {descriptions[g]}" for g in gaps)
+    try:
+        prompt = f"""From the resume below, fill in only these fields:
+{keys}
+Leave every other field empty. Use an empty string when unknown. Do not invent data.
+
+Resume:
+---
+{text[:6000]}
+---"""
+        return dump_filled(generate_structured(prompt, ResumeHeadline))
     except Exception as e:
-        print(f"Error during Gemini API call for resume: {e}")
+        print(f"Error during Gemini gap-fill call for resume: {e}")
         raise
 
+
+def _rule_parse(text: str) -> Tuple[Optional[dict], List[str]]:
+    """
+    Return (parsed, gaps): the rule-based result and the headline fields Gemini
+    still has to fill. `parsed` is None when the resume needs a full LLM parse.
+    """
+    if not settings.RESUME_HYBRID_PARSE:
+        return None, []
+
+    rules = parse_resume_rules(text)
+    if "experience" not in rules.sections and "skills" not in rules.values:
+        return None, []
+
+    parsed = {f: rules.values.get(f, "") for f in HEADLINE_FIELDS}
+    parsed["profile_url"] = rules.values.get("profile_url", "")
+    # Same json_content schema as the LLM path.
+    parsed["json_content"] = dump_filled(ResumeDetails.model_validate(resume_details(rules)))
+    return parsed, rules.gaps(HEADLINE_FIELDS, settings.RESUME_RULE_MIN_CONFIDENCE)
+
+
+# Values models put in place of "unknown"; treated as empty.
+_PLACEHOLDERS = {"", "n/a", "na", "none", "null", "unknown", "not available", "not specified", "not provided", "-"}
+
+
+def _is_blank(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in _PLACEHOLDERS
+    if isinstance(value, dict):
+        return all(_is_blank(v) for v in value.values())
+    if isinstance(value, list):
+        return all(_is_blank(v) for v in value)
+    return value is None
+
+
+def _merge_gaps(parsed: dict, filled: dict, gaps: List[str]) -> dict:
+    for g in gaps:
+        value = filled.get(g)
+        if isinstance(value, str) and not _is_blank(value):
+            parsed[g] = value.strip()
+    return parsed
+
+
+def parse_resume_text(text: str) -> dict:
+    """
+    Parse resume text into {person_name, role, company, profile_url, json_content}.
+    Rules extract what they can with confidence scores; Gemini is only called for
+    missing/low-confidence headline fields (small prompt), or for a full parse when
+    the resume has no recognizable experience/skills sections.
+    """
+    parsed, gaps = _rule_parse(text)
+    if parsed is None:
+        return _parse_resume_with_llm(text)
+    if gaps:
+        _merge_gaps(parsed, _parse_resume_gaps_with_llm(text, gaps), gaps)
+    return parsed
+
+
+# --- Batched parsing for multi-resume uploads ---
+# One request carries several resumes so the extraction instructions are paid
+# once. Batches are packed under settings.RESUME_BATCH_TOKEN_BUDGET (estimated
+# input tokens) and settings.RESUME_BATCH_SIZE items; larger resumes go alone.
+
+_FULL_FIELDS = HEADLINE_FIELDS + ["profile_url", "json_content"]
+_GAP_TEXT_CHARS = 6000
+_FULL_TEXT_CHARS = 120000
+
+
+def _estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _pack_batches(items: List[dict]) -> List[List[dict]]:
+    budget = max(1, settings.RESUME_BATCH_TOKEN_BUDGET)
+    max_items = max(1, settings.RESUME_BATCH_SIZE)
+    batches, current, used = [], [], 0
+    for item in sorted(items, key=lambda it: it["tokens"]):
+        if current and (used + item["tokens"] > budget or len(current) >= max_items):
+            batches.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += item["tokens"]
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _parse_batch_with_llm(batch: List[dict]) -> Dict[int, dict]:
+    """Send several resumes in one request; returns {item id: returned object}."""
+    blocks = "\n\n".join(
+        f'<resume id="{item["id"]}" fields="{",".join(item["fields"])}">\n{item["excerpt"]}\n</resume>'
+        for item in batch
+    )
+    prompt = f"""You are an expert resume parser. Below are {len(batch)} resumes.
+Return exactly one object per resume, with `id` copied from the resume tag.
+Fill only the fields listed in that resume's `fields` attribute and leave the rest empty:
+  - person_name: full name
+  - role: current or most recent role title
+  - company: current or most recent company
+  - profile_url: LinkedIn or personal site
+  - json_content: contact details, summary, skills, experience, education, certifications and projects
+
+Rules:
+- Use empty strings or empty arrays where information is missing.
+- Do not invent data, and never mix information between resumes.
+
+{blocks}"""
+    answers = generate_structured(prompt, list[BatchParsedResume])
+    return {answer.id: dump_filled(answer) for answer in answers or []}
+
+
+def _matches_source(answer: Optional[dict], item: dict) -> bool:
+    """
+    Reject answers that leave every requested field empty (or a placeholder such
+    as "N/A"), or that carry details absent from their own resume.
+    """
+    if not isinstance(answer, dict) or all(_is_blank(answer.get(f)) for f in item["fields"]):
+        return False
+    if "json_content" in item["fields"] and _is_blank(answer.get("json_content")):
+        return False
+    source = item["text"].lower()
+    name = answer.get("person_name")
+    if isinstance(name, str) and not _is_blank(name):
+        if not all(token in source for token in name.lower().split()):
+            return False
+    if "json_content" in item["fields"]:
+        content = answer.get("json_content")
+        if not isinstance(content, dict):
+            return False
+        email = content.get("email")
+        if isinstance(email, str) and not _is_blank(email) and email.strip().lower() not in source:
+            return False
+    return True
+
+
+def _finish_item(item: dict, answer: dict) -> dict:
+    if item["parsed"] is None:
+        return {f: "" if isinstance(answer.get(f), str) and _is_blank(answer[f]) else answer.get(f) for f in _FULL_FIELDS}
+    return _merge_gaps(item["parsed"], answer, item["fields"])
+
+
+def _parse_single_item(item: dict):
+    try:
+        if item["parsed"] is None:
+            return _parse_resume_with_llm(item["text"])
+        return _merge_gaps(item["parsed"], _parse_resume_gaps_with_llm(item["text"], item["fields"]), item["fields"])
+    except Exception as e:
+        return e
+
+
+def _run_batch(batch: List[dict]) -> Dict[int, object]:
+    if len(batch) == 1:
+        return {batch[0]["id"]: _parse_single_item(batch[0])}
+    try:
+        answers = _parse_batch_with_llm(batch)
+    except Exception as e:
+        print(f"Batched Gemini resume parse failed ({len(batch)} items), retrying singly: {e}")
+        answers = {}
+    results = {}
+    for item in batch:
+        answer = answers.get(item["id"])
+        if _matches_source(answer, item):
+            results[item["id"]] = _finish_item(item, answer)
+        else:
+            # Missing or mismatched object: retry just this resume on its own.
+            results[item["id"]] = _parse_single_item(item)
+    return results
+
+
+def _plan_item(item_id: int, text: str) -> Tuple[Optional[dict], Optional[dict]]:
+    """
+    Rule-parse one resume. Returns (parsed, None) when the rules filled every
+    headline field, else (None, item) with the item to send to Gemini.
+    """
+    try:
+        parsed, gaps = _rule_parse(text)
+    except Exception as e:
+        parsed, gaps = None, []
+        print(f"Rule-based resume parse failed, using full LLM parse: {e}")
+    if parsed is not None and not gaps:
+        return parsed, None
+    fields = gaps if parsed is not None else _FULL_FIELDS
+    excerpt = text[:_GAP_TEXT_CHARS] if parsed is not None else text[:_FULL_TEXT_CHARS]
+    return None, {
+        "id": item_id, "text": text, "parsed": parsed, "fields": fields,
+        "excerpt": excerpt, "tokens": _estimate_tokens(excerpt),
+    }
+
+
+def parse_resume_texts(texts: List[str], max_workers: int = 1) -> List[Union[dict, Exception]]:
+    """
+    Batch variant of parse_resume_text for multi-resume uploads. Returns one
+    entry per input: the parsed dict, or the Exception that item failed with.
+    Up to `max_workers` batch requests run concurrently.
+    """
+    results: List[Union[dict, Exception, None]] = [None] * len(texts)
+    pending = []
+    for i, text in enumerate(texts):
+        parsed, item = _plan_item(i, text)
+        if item is None:
+            results[i] = parsed
+        else:
+            pending.append(item)
+
+    batches = _pack_batches(pending)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        for batch_results in pool.map(_run_batch, batches):
+            for i, result in batch_results.items():
+                results[i] = result
+    return results
+
+class ResumeParseStream:
+    """
+    parse_resume_texts for texts that arrive over time (bulk ingestion). add()
+    rule-parses a text right away and sends a Gemini batch as soon as
+    RESUME_BATCH_SIZE items or RESUME_BATCH_TOKEN_BUDGET tokens are waiting, so
+    parsing overlaps with the extraction of later files. finish() flushes the
+    rest and returns {item id: parsed dict or Exception}.
+    """
+
+    def __init__(self, max_workers: int = 1):
+        self._semaphore = asyncio.Semaphore(max(1, max_workers))
+        self._waiting: List[dict] = []
+        self._waiting_tokens = 0
+        self._tasks: List[asyncio.Task] = []
+        self._results: Dict[int, Union[dict, Exception]] = {}
+
+    async def add(self, item_id: int, text: str) -> None:
+        parsed, item = await asyncio.to_thread(_plan_item, item_id, text)
+        if item is None:
+            self._results[item_id] = parsed
+            return
+        self._waiting.append(item)
+        self._waiting_tokens += item["tokens"]
+        if (len(self._waiting) >= max(1, settings.RESUME_BATCH_SIZE)
+                or self._waiting_tokens >= settings.RESUME_BATCH_TOKEN_BUDGET):
+            self._flush()
+
+    def _flush(self) -> None:
+        for batch in _pack_batches(self._waiting):
+            self._tasks.append(asyncio.create_task(self._run(batch)))
+        self._waiting, self._waiting_tokens = [], 0
+
+    async def _run(self, batch: List[dict]) -> None:
+        async with self._semaphore:
+            try:
+                self._results.update(await asyncio.to_thread(_run_batch, batch))
+            except Exception as e:
+                self._results.update({item["id"]: e for item in batch})
+
+    async def finish(self) -> Dict[int, Union[dict, Exception]]:
+        self._flush()
+        await asyncio.gather(*self._tasks)
+        return self._results
+
 # --- END: MODIFIED SECTION ---
 
 
 # --- This is your original process_resume_file function, modified to remove the OpenAI client ---
-def process_resume_file(supabase: Client, file_path: Path, user_id: str, jd_id: str) -> dict:
+def process_resume_file(
+    supabase: Client, file_path: Path, user_id: str, jd_id: str, scope_id: Optional[str] = None
+) -> dict:
     text = extract_text(file_path)
     if not text.strip():
         raise ValueError(f"No text could be extracted from the resume: {file_path.name}")
 
-    # This now calls our modified Gemini function
-    parsed_data = parse_resume_text(text)
+    # Identical resumes already parsed in this org (scope_id) skip the Gemini call.
+    parsed_data, digest, _ = parse_with_cache(
+        supabase, scope_id or user_id, KIND_RESUME, text, parse_resume_text
+    )
 
-    # The rest of your logic for uploading and storing remains the same.
-    bucket = "resumes"
-    ts = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
-    object_name = f"{user_id}/{ts}_{file_path.name}"
-    
-    with open(file_path, "rb") as f:
-        content_type, _ = mimetypes.guess_type(file_path.name)
-        supabase.storage.from_(bucket).upload(
-            path=object_name, 
-            file=f, 
-            file_options={"contentType": content_type or "application/octet-stream"}
-        )
+    # Content-addressed storage: a file that was uploaded before is not sent again.
+    stored = store_document(get_blob_store(supabase, "resumes"), user_id, file_path, text)
+    object_name = stored.key
 
     row = {
         "jd_id": jd_id,
@@ -116,6 +366,7 @@ def process_resume_file(supabase: Client, file_path: Path, user_id: str, jd_id:
         "role": (parsed_data.get("role") or "").strip() or None,
         "company": (parsed_data.get("company") or "").strip() or None,
         "profile_url": (parsed_data.get("profile_url") or "").strip() or None,
+        "content_hash": digest,
     }
     
     # --- THIS IS THE FIX ---
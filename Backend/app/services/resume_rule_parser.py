@@ -0,0 +1,325 @@
+# backend/app/services/resume_rule_parser.py
+"""
+Deterministic resume field extraction.
+
+Pulls the fields that well-structured resumes state plainly (name, email,
+phone, LinkedIn/profile URL, current title and company, skills and the main
+sections) with regexes and layout rules. Every field carries a confidence in
+[0, 1]; resume_parsing_service only asks Gemini for fields that come back
+missing or below settings.RESUME_RULE_MIN_CONFIDENCE.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+PHONE_RE = re.compile(r"(?<![\w/])\+?\(?\d[\d\s().-]{7,}\d(?!\w)")
+LINKEDIN_RE = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/([A-Za-z0-9_%-]+)/?", re.IGNORECASE)
+URL_RE = re.compile(r"\b(?:https?://|www\.)[^\s<>()|,;]+", re.IGNORECASE)
+GITHUB_RE = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[A-Za-z0-9_-]+/?", re.IGNORECASE)
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s*,?\s*)?(?:\d{{1,2}}/)?\d{{4}}"
+DATE_RANGE_RE = re.compile(
+    rf"\(?\s*{_DATE}\s*(?:-|–|—|to)\s*(?:{_DATE}|present|current|now|till date|date)\s*\)?",
+    re.IGNORECASE,
+)
+
+# Heading text (lowercased, trailing colon removed) -> canonical section name.
+SECTION_HEADINGS = {
+    "summary": "summary",
+    "professional summary": "summary",
+    "profile": "summary",
+    "profile summary": "summary",
+    "about me": "summary",
+    "objective": "summary",
+    "career objective": "summary",
+    "experience": "experience",
+    "work experience": "experience",
+    "professional experience": "experience",
+    "employment history": "experience",
+    "employment": "experience",
+    "work history": "experience",
+    "career history": "experience",
+    "education": "education",
+    "academic background": "education",
+    "education and training": "education",
+    "academics": "education",
+    "skills": "skills",
+    "technical skills": "skills",
+    "key skills": "skills",
+    "core competencies": "skills",
+    "skills & tools": "skills",
+    "skills and tools": "skills",
+    "technologies": "skills",
+    "projects": "projects",
+    "personal projects": "projects",
+    "key projects": "projects",
+    "certifications": "certifications",
+    "certificates": "certifications",
+    "licenses & certifications": "certifications",
+    "achievements": "achievements",
+    "awards": "achievements",
+    "languages": "languages",
+}
+
+TITLE_WORDS = {
+    "engineer", "developer", "manager", "analyst", "designer", "scientist",
+    "consultant", "director", "lead", "intern", "architect", "specialist",
+    "head", "officer", "vp", "president", "founder", "co-founder", "associate",
+    "administrator", "coordinator", "executive", "recruiter", "programmer",
+    "researcher", "product", "sde", "sre", "devops", "accountant", "partner",
+    "principal", "staff", "technician", "trainee", "fellow", "owner", "cto", "ceo",
+}
+
+# Document titles and header labels that look like "First Last" but are not names.
+NOT_NAME_WORDS = {
+    "curriculum", "vitae", "resume", "résumé", "cv", "biodata", "bio-data",
+    "profile", "personal", "details", "information", "contact", "portfolio",
+    "summary", "objective", "page", "confidential",
+}
+
+_NAME_TOKEN_RE = re.compile(r"^[A-Z][A-Za-z'.-]*$")
+_SKILL_SPLIT_RE = re.compile(r"\s*(?:,|;|\||•|·|▪|●|\n|\t|\s-\s)\s*")
+
+
+@dataclass
+class RuleParse:
+    """Values found by rules plus a confidence per field (absent = not found)."""
+    values: Dict[str, object] = field(default_factory=dict)
+    confidence: Dict[str, float] = field(default_factory=dict)
+    sections: Dict[str, str] = field(default_factory=dict)
+
+    def set(self, name: str, value, confidence: float) -> None:
+        if value and confidence > self.confidence.get(name, 0.0):
+            self.values[name] = value
+            self.confidence[name] = confidence
+
+    def gaps(self, fields: List[str], min_confidence: float) -> List[str]:
+        return [f for f in fields if self.confidence.get(f, 0.0) < min_confidence]
+
+
+def _clean_lines(text: str) -> List[str]:
+    return [line.strip(" \t•·▪●-*") for line in text.splitlines() if line.strip(" \t•·▪●-*")]
+
+
+def _heading(line: str) -> Optional[str]:
+    if len(line) > 40:
+        return None
+    key = re.sub(r"\s+", " ", line.rstrip(":").strip().lower())
+    return SECTION_HEADINGS.get(key)
+
+
+def split_sections(lines: List[str]) -> Tuple[List[str], Dict[str, str]]:
+    """Return (header lines before the first section, {section: body text})."""
+    header: List[str] = []
+    bodies: Dict[str, List[str]] = {}
+    current = None
+    for line in lines:
+        name = _heading(line)
+        if name:
+            current = name
+            bodies.setdefault(current, [])
+        elif current is None:
+            header.append(line)
+        else:
+            bodies[current].append(line)
+    return header, {name: "\n".join(body) for name, body in bodies.items() if body}
+
+
+def _looks_like_name(line: str) -> bool:
+    if any(ch.isdigit() for ch in line) or "@" in line or "/" in line:
+        return False
+    tokens = line.split()
+    if not 2 <= len(tokens) <= 4:
+        return False
+    words = [t.lower().strip(",.:") for t in tokens]
+    if any(w in TITLE_WORDS or w in NOT_NAME_WORDS for w in words) or _heading(line):
+        return False
+    return all(_NAME_TOKEN_RE.match(t) for t in tokens)
+
+
+def _is_document_title(line: str) -> bool:
+    """"Curriculum Vitae", "RESUME", "Personal Profile": a label above the name."""
+    words = [w.strip(",.:-") for w in line.lower().split()]
+    return bool(words) and all(w in NOT_NAME_WORDS for w in words if w)
+
+
+def _is_title(text: str) -> bool:
+    words = re.findall(r"[a-z-]+", text.lower())
+    return any(w in TITLE_WORDS for w in words)
+
+
+def _split_role_company(line: str) -> Optional[Tuple[str, str, float]]:
+    """Split an experience entry line into (role, company, confidence)."""
+    line = DATE_RANGE_RE.sub("", line).strip(" ,|–—-")
+    match = re.match(r"^(.+?)\s+(?:at|@)\s+(.+)$", line, re.IGNORECASE)
+    if match and _is_title(match.group(1)):
+        return match.group(1).strip(), match.group(2).strip(" ,"), 0.9
+    parts = [p.strip() for p in re.split(r"\s+[|–—-]\s+|\s*\|\s*|,\s+", line) if p.strip()]
+    if len(parts) >= 2:
+        first, second = parts[0], parts[1]
+        if _is_title(first) and not _is_title(second):
+            return first, second, 0.85
+        if _is_title(second) and not _is_title(first):
+            return second, first, 0.85
+    return None
+
+
+def _current_position(parse: RuleParse, header: List[str]) -> None:
+    experience = _clean_lines(parse.sections.get("experience", ""))
+    # First experience entry: usually "Title at Company", "Company | Title",
+    # or the title on one line with the company on the next.
+    for i, line in enumerate(experience[:3]):
+        split = _split_role_company(line)
+        if split:
+            role, company, confidence = split
+            parse.set("role", role, confidence)
+            parse.set("company", company, confidence)
+            return
+        stripped = DATE_RANGE_RE.sub("", line).strip(" ,|–—-")
+        nxt = DATE_RANGE_RE.sub("", experience[i + 1]).strip(" ,|–—-") if i + 1 < len(experience) else ""
+        if stripped and nxt and _is_title(stripped) != _is_title(nxt):
+            role, company = (stripped, nxt) if _is_title(stripped) else (nxt, stripped)
+            parse.set("role", role, 0.75)
+            parse.set("company", company, 0.7)
+            return
+    # Headline under the name, e.g. "Senior Data Engineer at Acme".
+    for line in header[1:4]:
+        split = _split_role_company(line)
+        if split:
+            role, company, _ = split
+            parse.set("role", role, 0.8)
+            parse.set("company", company, 0.75)
+            return
+
+
+def _skills(body: str) -> List[str]:
+    seen, skills = set(), []
+    for line in body.splitlines():
+        # "Languages: Python, Go" -> keep the list after the label
+        if ":" in line and len(line.split(":", 1)[0]) < 30:
+            line = line.split(":", 1)[1]
+        for item in _SKILL_SPLIT_RE.split(line):
+            item = item.strip(" .")
+            if 1 < len(item) <= 40 and item.lower() not in seen:
+                seen.add(item.lower())
+                skills.append(item)
+    return skills
+
+
+def _date_bounds(line: str) -> Tuple[str, str]:
+    match = DATE_RANGE_RE.search(line)
+    if not match:
+        return "", ""
+    start, _, end = re.split(r"\s*(-|–|—|\bto\b)\s*", match.group(0).strip(" ()"), maxsplit=1)
+    return start.strip(), end.strip()
+
+
+def _experience_entries(body: str) -> List[Dict[str, str]]:
+    """Group experience lines into entries, starting one at each "role/company" line."""
+    entries: List[Dict[str, str]] = []
+    description: List[str] = []
+
+    def close() -> None:
+        if entries:
+            entries[-1]["description"] = "\n".join(description)
+        description.clear()
+
+    for line in _clean_lines(body):
+        # Long lines are bullet text, even when they mention a title.
+        split = _split_role_company(line) if len(line) <= 100 else None
+        start, end = _date_bounds(line)
+        if split:
+            close()
+            role, company, _ = split
+            entries.append({"title": role, "company": company, "start_date": start, "end_date": end, "description": ""})
+        elif start and entries and not entries[-1]["start_date"] and not description:
+            entries[-1]["start_date"], entries[-1]["end_date"] = start, end
+        else:
+            description.append(line)
+    if not entries and description:
+        # No recognizable entry lines: keep the text rather than dropping it.
+        return [{"title": "", "company": "", "start_date": "", "end_date": "", "description": "\n".join(description)}]
+    close()
+    return entries
+
+
+def _education_entries(body: str) -> List[Dict[str, str]]:
+    entries = []
+    for line in _clean_lines(body):
+        year = re.findall(r"\b(?:19|20)\d{2}\b", line)
+        text = DATE_RANGE_RE.sub("", line).strip(" ,|–—-")
+        parts = [p.strip() for p in re.split(r"\s+[|–—-]\s+|\s*\|\s*|,\s+", text) if p.strip()]
+        degree = parts[0] if parts else text
+        institution = parts[1] if len(parts) > 1 else ""
+        entries.append({"degree": degree, "institution": institution, "year": year[-1] if year else ""})
+    return entries
+
+
+def resume_details(parse: RuleParse) -> Dict[str, object]:
+    """
+    The rule results in the json_content shape the LLM path returns
+    (app.schemas.parsing.ResumeDetails), so both paths store the same schema.
+    """
+    sections = parse.sections
+    return {
+        "email": parse.values.get("email", ""),
+        "phone": parse.values.get("phone", ""),
+        "linkedin_url": parse.values.get("linkedin_url", ""),
+        "location": "",
+        "summary": sections.get("summary", ""),
+        "skills": parse.values.get("skills", []),
+        "experience": _experience_entries(sections.get("experience", "")),
+        "education": _education_entries(sections.get("education", "")),
+        "certifications": _clean_lines(sections.get("certifications", "")),
+        "projects": _clean_lines(sections.get("projects", "")),
+    }
+
+
+def parse_resume_rules(text: str) -> RuleParse:
+    parse = RuleParse()
+    lines = _clean_lines(text)
+    header, parse.sections = split_sections(lines)
+
+    email = EMAIL_RE.search(text)
+    if email:
+        parse.set("email", email.group(0), 0.99)
+
+    for match in PHONE_RE.finditer("\n".join(header or lines[:10])):
+        digits = re.sub(r"\D", "", match.group(0))
+        if 10 <= len(digits) <= 15:
+            parse.set("phone", match.group(0).strip(), 0.9)
+            break
+
+    linkedin = LINKEDIN_RE.search(text)
+    if linkedin:
+        url = f"https://www.linkedin.com/in/{linkedin.group(1)}"
+        parse.set("linkedin_url", url, 0.99)
+        parse.set("profile_url", url, 0.99)
+    else:
+        github = GITHUB_RE.search(text)
+        other = github or URL_RE.search("\n".join(header))
+        if other:
+            url = other.group(0).rstrip("/.")
+            parse.set("profile_url", url if url.startswith("http") else f"https://{url}", 0.8)
+
+    # A document title above the name does not count against its position.
+    position = 0
+    for line in (header or lines)[:6]:
+        candidate = re.split(r"\s*[|,]\s*", line)[0]
+        if _is_document_title(candidate):
+            continue
+        if _looks_like_name(candidate):
+            name = candidate.title() if candidate.isupper() else candidate
+            parse.set("person_name", name, 0.9 if position == 0 else 0.75)
+            break
+        position += 1
+
+    _current_position(parse, header)
+
+    skills = _skills(parse.sections.get("skills", ""))
+    if skills:
+        parse.set("skills", skills, 0.9 if len(skills) >= 3 else 0.6)
+
+    return parse
@@ -0,0 +1,275 @@
+# backend/app/services/text_extraction_service.py
+"""
+Single text extraction engine for resumes and JDs.
+
+- PDFs are read with PyMuPDF (fitz); DOCX with docx2txt; TXT directly.
+- All parsing runs in dedicated worker processes so a slow or pathological
+  file never blocks the calling worker's event loop or thread.
+- Long PDFs are split into page ranges that are extracted in parallel, and the
+  page texts are joined once at the end.
+- Every file gets a hard deadline. When it is missed only that file fails:
+  its queued tasks are cancelled and the process running its current task is
+  killed and replaced, so a hung parser never keeps a worker and other files
+  keep theirs. A worker that crashes is replaced the same way.
+- Workers are started with billiard, so this also works inside daemonic
+  Celery prefork workers, where multiprocessing may not start children.
+- Results are cached by SHA-256 of the file bytes, so re-uploads skip parsing.
+"""
+import hashlib
+import logging
+import os
+import signal
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import billiard
+import docx2txt
+import fitz  # PyMuPDF
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_EXTENSIONS = {".txt", ".docx", ".pdf"}
+
+
+class ExtractionTimeoutError(TimeoutError):
+    """Raised when a file cannot be extracted within the configured deadline."""
+
+
+# --- Worker-side functions (run inside the pool; must be module level to pickle) ---
+
+def _read_pdf_pages(path: str, start: int, stop: int) -> List[str]:
+    with fitz.open(path) as doc:
+        return [doc[i].get_text() for i in range(start, min(stop, doc.page_count))]
+
+
+def _read_pdf_head(path: str, stop: int) -> Tuple[int, List[str]]:
+    """First pages plus the total page count, so short PDFs need a single task."""
+    with fitz.open(path) as doc:
+        return doc.page_count, [doc[i].get_text() for i in range(min(stop, doc.page_count))]
+
+
+def _extract_whole(path: str) -> str:
+    ext = Path(path).suffix.lower()
+    if ext == ".txt":
+        return Path(path).read_text(encoding="utf-8", errors="ignore")
+    if ext == ".docx":
+        return docx2txt.process(path) or ""
+    if ext == ".pdf":
+        return "".join(_read_pdf_pages(path, 0, 1 << 30))
+    raise ValueError(f"Unsupported file type: {ext}")
+
+
+# --- Hash cache ---
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class _TextCache:
+    """Bounded in-memory LRU, optionally backed by one file per hash on disk."""
+
+    def __init__(self, max_entries: int, disk_dir: Optional[str]):
+        self.max_entries = max(0, max_entries)
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        return self.disk_dir / key[:2] / f"{key}.txt" if self.disk_dir else None
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        disk_path = self._disk_path(key)
+        if disk_path and disk_path.exists():
+            text = disk_path.read_text(encoding="utf-8")
+            self._remember(key, text)
+            return text
+        return None
+
+    def put(self, key: str, text: str) -> None:
+        self._remember(key, text)
+        disk_path = self._disk_path(key)
+        if disk_path:
+            try:
+                disk_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = disk_path.with_suffix(".tmp")
+                tmp.write_text(text, encoding="utf-8")
+                tmp.replace(disk_path)
+            except OSError:
+                logger.warning("[Extract] Could not write cache entry %s", key, exc_info=True)
+
+    def _remember(self, key: str, text: str) -> None:
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[key] = text
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+# --- Pool management ---
+
+def _worker_loop(conn) -> None:
+    """Body of an extraction process: run (fn, args) requests until the pipe closes."""
+    while True:
+        try:
+            fn, args = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            reply = (True, fn(*args))
+        except Exception as e:
+            reply = (False, e)
+        try:
+            conn.send(reply)
+        except Exception:
+            # The exception itself may not pickle; send its text instead.
+            conn.send((False, RuntimeError(f"{type(reply[1]).__name__}: {reply[1]}")))
+
+
+class _Worker:
+    """One extraction process, fed over a pipe and used by one task at a time."""
+
+    def __init__(self):
+        self._conn, child_conn = billiard.Pipe()
+        # billiard (Celery's multiprocessing fork) also starts children from
+        # daemonic processes such as prefork workers, where multiprocessing refuses.
+        self.process = billiard.Process(target=_worker_loop, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def run(self, fn, args, timeout: float) -> Tuple[bool, object]:
+        """(True, result) or (False, exception). Raises on timeout or if the process died."""
+        try:
+            self._conn.send((fn, args))
+            if not self._conn.poll(timeout):
+                raise ExtractionTimeoutError(f"Extraction task exceeded its {timeout:.3g}s budget")
+            return self._conn.recv()
+        except (EOFError, BrokenPipeError, ConnectionResetError) as e:
+            raise BrokenProcessPool(f"Extraction worker {self.process.pid} exited unexpectedly") from e
+
+    def kill(self) -> None:
+        self._conn.close()
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=1)
+        if self.process.is_alive():
+            # Native code can sit out SIGTERM; SIGKILL cannot be ignored.
+            os.kill(self.process.pid, signal.SIGKILL)
+        self.process.join(timeout=5)
+
+
+class ExtractionPool:
+    """
+    Up to `workers` extraction processes, started on demand. A task that misses
+    its deadline, or whose process crashes, has that process killed; the next
+    task starts a fresh one. Other tasks keep their workers.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = max(1, workers)
+        # Each thread drives one worker process and only waits on its pipe.
+        self._threads = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="extract")
+        self._idle: List[_Worker] = []
+        self._lock = threading.Lock()
+
+    def submit(self, deadline: float, fn, *args) -> Future:
+        """Run fn(*args) in a worker process; the task fails with ExtractionTimeoutError at `deadline` (monotonic)."""
+        return self._threads.submit(self._call, deadline, fn, args)
+
+    def _checkout(self) -> _Worker:
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.process.is_alive():
+                    return worker
+                worker.kill()
+        return _Worker()
+
+    def _call(self, deadline: float, fn, args):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise ExtractionTimeoutError("Extraction task was still queued at its deadline")
+        worker = self._checkout()
+        try:
+            ok, value = worker.run(fn, args, remaining)
+        except BaseException:
+            # Timed out or crashed: reclaim the slot by killing the process.
+            worker.kill()
+            raise
+        with self._lock:
+            self._idle.append(worker)
+        if not ok:
+            raise value
+        return value
+
+
+_pool = ExtractionPool(settings.TEXT_EXTRACT_WORKERS)
+_cache = _TextCache(settings.TEXT_EXTRACT_CACHE_SIZE, settings.TEXT_EXTRACT_CACHE_DIR or None)
+
+
+def _wait(futures: List[Future], deadline: float, path: Path) -> List:
+    try:
+        return [f.result(timeout=max(0.0, deadline - time.monotonic())) for f in futures]
+    except (ExtractionTimeoutError, FutureTimeoutError):
+        # Fail this file only: queued tasks are dropped, and a running task
+        # kills its own worker process when the same deadline passes.
+        for f in futures:
+            f.cancel()
+        raise ExtractionTimeoutError(
+            f"Text extraction for {path.name} exceeded {settings.TEXT_EXTRACT_TIMEOUT_SEC:g}s"
+        )
+
+
+def _extract_uncached(path: Path, deadline: float) -> str:
+    ext = path.suffix.lower()
+    if ext != ".pdf":
+        return _wait([_pool.submit(deadline, _extract_whole, str(path))], deadline, path)[0]
+
+    pages_per_task = max(1, settings.TEXT_EXTRACT_PAGES_PER_TASK)
+    page_count, head = _wait([_pool.submit(deadline, _read_pdf_head, str(path), pages_per_task)], deadline, path)[0]
+    futures = [
+        _pool.submit(deadline, _read_pdf_pages, str(path), start, start + pages_per_task)
+        for start in range(pages_per_task, page_count, pages_per_task)
+    ]
+    chunks = [head] + _wait(futures, deadline, path)
+    return "".join(page for chunk in chunks for page in chunk)
+
+
+def extract_text(path: Path, timeout: Optional[float] = None) -> str:
+    """
+    Extract plain text from a .txt, .docx or .pdf file.
+    Raises ValueError for unsupported types and ExtractionTimeoutError when the
+    file is not done within `timeout` (default settings.TEXT_EXTRACT_TIMEOUT_SEC).
+    """
+    path = Path(path)
+    ext = path.suffix.lower()
+    if ext not in SUPPORTED_EXTENSIONS:
+        raise ValueError(f"Unsupported file type: {ext}")
+
+    key = f"{file_sha256(path)}{ext}"
+    cached = _cache.get(key)
+    if cached is not None:
+        logger.debug("[Extract] cache hit for %s", path.name)
+        return cached
+
+    deadline = time.monotonic() + (timeout if timeout is not None else settings.TEXT_EXTRACT_TIMEOUT_SEC)
+    text = _extract_uncached(path, deadline).strip()
+    _cache.put(key, text)
+    return text
@@ -0,0 +1,65 @@
+# backend/app/services/upload_spooling.py
+"""
+Streams `UploadFile` bodies to disk in fixed-size chunks so an upload is never
+held in memory whole. Size limits are enforced while streaming: a file (or a
+whole request) that goes over its cap is rejected as soon as the cap is
+crossed, and the partially written file is removed.
+"""
+from pathlib import Path
+from typing import Optional
+
+from fastapi import UploadFile
+
+from app.config import settings
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds the per-file or per-request size cap."""
+
+
+class UploadBudget:
+    """Tracks bytes written across all files of one request."""
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes if max_bytes is not None else settings.MAX_UPLOAD_REQUEST_BYTES
+        self.used = 0
+
+    def consume(self, n: int) -> None:
+        self.used += n
+        if self.used > self.max_bytes:
+            raise UploadTooLargeError(
+                f"Upload exceeds the request limit of {self.max_bytes // (1024 * 1024)} MB."
+            )
+
+
+async def spool_upload(
+    file: UploadFile,
+    dest: Path,
+    budget: Optional[UploadBudget] = None,
+    max_file_bytes: Optional[int] = None,
+) -> int:
+    """
+    Stream `file` into `dest` chunk by chunk. Returns the number of bytes written.
+    Raises UploadTooLargeError (and removes `dest`) when a cap is exceeded.
+    """
+    max_file_bytes = max_file_bytes if max_file_bytes is not None else settings.MAX_UPLOAD_FILE_BYTES
+    chunk_size = max(64 * 1024, settings.UPLOAD_CHUNK_BYTES)
+    written = 0
+    try:
+        with open(dest, "wb") as out:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_file_bytes:
+                    raise UploadTooLargeError(
+                        f"{file.filename} exceeds the per-file limit of {max_file_bytes // (1024 * 1024)} MB."
+                    )
+                if budget is not None:
+                    budget.consume(len(chunk))
+                out.write(chunk)
+    except BaseException:
+        dest.unlink(missing_ok=True)
+        raise
+    return written
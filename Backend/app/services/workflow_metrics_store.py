@@ -0,0 +1,291 @@
+"""
+Persistent metrics store for recruitment workflow runs.
+
+Written by WorkflowMonitor (app/src/workflows) after each run and read by the
+CLI --performance-metrics / --workflow-status commands and the superadmin
+/workflow-metrics endpoint, so history survives restarts and is shared by
+every process pointed at the same file (WORKFLOW_METRICS_DB).
+
+Besides one row per run and per step, every numeric metric (step durations,
+tokens, candidates per stage, ...) is folded into log-spaced histogram
+buckets per hourly window as it is recorded. Rolling percentiles are then
+read from the bucket counts of the windows in range, without rescanning
+runs; estimates are within ~5% of the true value.
+
+Standard library only: the CLI imports this module outside the app package.
+"""
+
+import json
+import logging
+import math
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 3600
+# Bucket b holds values in [GROWTH**b, GROWTH**(b+1)); zero and negatives go to ZERO_BUCKET.
+GROWTH = 1.1
+ZERO_BUCKET = -10_000
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workflow_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recorded_at REAL NOT NULL,
+    job_title TEXT,
+    success INTEGER NOT NULL,
+    execution_time REAL NOT NULL,
+    candidates_found INTEGER NOT NULL DEFAULT 0,
+    candidates_ranked INTEGER NOT NULL DEFAULT 0,
+    llm_calls INTEGER NOT NULL DEFAULT 0,
+    llm_tokens INTEGER NOT NULL DEFAULT 0,
+    api_calls INTEGER NOT NULL DEFAULT 0,
+    usage TEXT
+);
+CREATE INDEX IF NOT EXISTS workflow_runs_recorded_at ON workflow_runs (recorded_at);
+CREATE TABLE IF NOT EXISTS workflow_steps (
+    run_id INTEGER NOT NULL REFERENCES workflow_runs (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    duration REAL,
+    success INTEGER NOT NULL,
+    candidates INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS workflow_steps_run_id ON workflow_steps (run_id);
+CREATE TABLE IF NOT EXISTS metric_windows (
+    metric TEXT NOT NULL,
+    window_start INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    total REAL NOT NULL,
+    min REAL NOT NULL,
+    max REAL NOT NULL,
+    PRIMARY KEY (metric, window_start)
+);
+CREATE TABLE IF NOT EXISTS metric_buckets (
+    metric TEXT NOT NULL,
+    window_start INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (metric, window_start, bucket)
+);
+"""
+
+
+def bucket_for(value: float) -> int:
+    if value <= 0:
+        return ZERO_BUCKET
+    return math.floor(math.log(value, GROWTH))
+
+
+def bucket_value(bucket: int) -> float:
+    """Representative (geometric midpoint) value of a bucket."""
+    if bucket == ZERO_BUCKET:
+        return 0.0
+    return GROWTH ** (bucket + 0.5)
+
+
+class WorkflowMetricsStore:
+    """SQLite-backed run history with incrementally maintained percentile histograms."""
+
+    def __init__(self, path: str, retention_days: int = 30):
+        self.path = Path(path)
+        self.retention_seconds = retention_days * 24 * 3600
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    # --- writing ---
+
+    def record_run(
+        self,
+        execution_time: float,
+        success: bool,
+        job_title: Optional[str] = None,
+        candidates_found: int = 0,
+        candidates_ranked: int = 0,
+        steps: Iterable[Dict[str, Any]] = (),
+        usage: Optional[Dict[str, int]] = None,
+        recorded_at: Optional[float] = None,
+    ) -> int:
+        """
+        Store one run. `steps` are dicts with name, duration, success and
+        optionally candidates / error; `usage` is a counter delta such as
+        {"llm_calls": 3, "llm_tokens": 5120, "api_calls": 2, "openai_calls": 3}.
+        Returns the run id.
+        """
+        now = recorded_at if recorded_at is not None else time.time()
+        usage = usage or {}
+        steps = list(steps)
+
+        metrics = {
+            "run.execution_time": execution_time,
+            "run.candidates_found": candidates_found,
+            "run.candidates_ranked": candidates_ranked,
+            "run.llm_calls": usage.get("llm_calls", 0),
+            "run.llm_tokens": usage.get("llm_tokens", 0),
+            "run.api_calls": usage.get("api_calls", 0),
+        }
+        for step in steps:
+            if step.get("duration") is not None:
+                metrics[f"step.{step['name']}.duration"] = step["duration"]
+            if step.get("candidates") is not None:
+                metrics[f"step.{step['name']}.candidates"] = step["candidates"]
+
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                """
+                INSERT INTO workflow_runs (recorded_at, job_title, success, execution_time, candidates_found,
+                                           candidates_ranked, llm_calls, llm_tokens, api_calls, usage)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    now, job_title, int(success), execution_time, candidates_found, candidates_ranked,
+                    usage.get("llm_calls", 0), usage.get("llm_tokens", 0), usage.get("api_calls", 0),
+                    json.dumps(usage),
+                ),
+            )
+            run_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO workflow_steps (run_id, name, duration, success, candidates, error) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, s["name"], s.get("duration"), int(bool(s.get("success"))), s.get("candidates"), s.get("error"))
+                    for s in steps
+                ],
+            )
+            self._observe(conn, metrics, now)
+            self._purge(conn, now)
+        return run_id
+
+    def _observe(self, conn: sqlite3.Connection, metrics: Dict[str, float], now: float) -> None:
+        window = int(now // WINDOW_SECONDS) * WINDOW_SECONDS
+        for metric, value in metrics.items():
+            value = float(value)
+            conn.execute(
+                """
+                INSERT INTO metric_windows VALUES (?, ?, 1, ?, ?, ?)
+                ON CONFLICT (metric, window_start) DO UPDATE SET
+                    count = count + 1, total = total + excluded.total,
+                    min = MIN(min, excluded.min), max = MAX(max, excluded.max)
+                """,
+                (metric, window, value, value, value),
+            )
+            conn.execute(
+                """
+                INSERT INTO metric_buckets VALUES (?, ?, ?, 1)
+                ON CONFLICT (metric, window_start, bucket) DO UPDATE SET count = count + 1
+                """,
+                (metric, window, bucket_for(value)),
+            )
+
+    def _purge(self, conn: sqlite3.Connection, now: float) -> None:
+        cutoff = now - self.retention_seconds
+        conn.execute("DELETE FROM workflow_runs WHERE recorded_at < ?", (cutoff,))
+        conn.execute("DELETE FROM metric_windows WHERE window_start < ?", (cutoff - WINDOW_SECONDS,))
+        conn.execute("DELETE FROM metric_buckets WHERE window_start < ?", (cutoff - WINDOW_SECONDS,))
+
+    # --- reading ---
+
+    def summary(
+        self,
+        window_seconds: int = 24 * 3600,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+        metric_prefix: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Rolling stats for the last `window_seconds`, one entry per metric:
+        {"count", "mean", "min", "max", "p50", "p90", "p99"}.
+        Resolution is one hourly window.
+        """
+        since = int((time.time() - window_seconds) // WINDOW_SECONDS) * WINDOW_SECONDS
+        with closing(self._connect()) as conn:
+            windows = conn.execute(
+                """
+                SELECT metric, SUM(count) AS count, SUM(total) AS total, MIN(min) AS min, MAX(max) AS max
+                FROM metric_windows WHERE window_start >= ? GROUP BY metric
+                """,
+                (since,),
+            ).fetchall()
+            buckets = conn.execute(
+                """
+                SELECT metric, bucket, SUM(count) AS count FROM metric_buckets
+                WHERE window_start >= ? GROUP BY metric, bucket ORDER BY metric, bucket
+                """,
+                (since,),
+            ).fetchall()
+
+        histograms: Dict[str, List[tuple]] = {}
+        for row in buckets:
+            histograms.setdefault(row["metric"], []).append((row["bucket"], row["count"]))
+
+        stats = {}
+        for row in windows:
+            if metric_prefix and not row["metric"].startswith(metric_prefix):
+                continue
+            entry = {
+                "count": row["count"],
+                "mean": row["total"] / row["count"],
+                "min": row["min"],
+                "max": row["max"],
+            }
+            for q in quantiles:
+                entry[f"p{round(q * 100):g}"] = self._quantile(histograms.get(row["metric"], []), row["count"], q, row["min"], row["max"])
+            stats[row["metric"]] = entry
+        return stats
+
+    @staticmethod
+    def _quantile(histogram: List[tuple], count: int, q: float, low: float, high: float) -> float:
+        target = max(1, math.ceil(q * count))
+        seen = 0
+        for bucket, bucket_count in histogram:
+            seen += bucket_count
+            if seen >= target:
+                return min(max(bucket_value(bucket), low), high)
+        return high
+
+    def recent_runs(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Latest runs, newest first, each with its steps."""
+        with closing(self._connect()) as conn:
+            runs = [dict(row) for row in conn.execute(
+                "SELECT * FROM workflow_runs ORDER BY recorded_at DESC, id DESC LIMIT ?", (limit,)
+            )]
+            for run in runs:
+                run["usage"] = json.loads(run["usage"] or "{}")
+                run["steps"] = [dict(row) for row in conn.execute(
+                    "SELECT name, duration, success, candidates, error FROM workflow_steps WHERE run_id = ?", (run["id"],)
+                )]
+        return runs
+
+    def totals(self, window_seconds: Optional[int] = None) -> Dict[str, Any]:
+        """Run counts, success rate and usage totals, over all retained runs or the last `window_seconds`."""
+        since = time.time() - window_seconds if window_seconds else 0
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                """
+                SELECT COUNT(*) AS total_executions, COALESCE(SUM(success), 0) AS successful_executions,
+                       AVG(execution_time) AS average_execution_time,
+                       AVG(candidates_found) AS average_candidates_found,
+                       COALESCE(SUM(llm_calls), 0) AS llm_calls, COALESCE(SUM(llm_tokens), 0) AS llm_tokens,
+                       COALESCE(SUM(api_calls), 0) AS api_calls
+                FROM workflow_runs WHERE recorded_at >= ?
+                """,
+                (since,),
+            ).fetchone()
+        totals = dict(row)
+        runs = totals["total_executions"]
+        totals["success_rate"] = totals["successful_executions"] / runs if runs else 0.0
+        return totals
+
+    def clear(self) -> None:
+        with closing(self._connect()) as conn, conn:
+            for table in ("workflow_steps", "workflow_runs", "metric_windows", "metric_buckets"):
+                conn.execute(f"DELETE FROM {table}")
@@ -0,0 +1,212 @@
+# backend/app/services/zip_import_service.py
+"""
+Bulk resume import from a ZIP archive, used by `ingest_resume_zip_task`.
+
+The archive is spooled to disk once by the API. The task reads the central
+directory, then streams entries out of the archive a window at a time
+(settings.ZIP_IMPORT_WINDOW entries), runs each window through
+ingest_resumes, and deletes the window's files before the next one. Disk and
+memory use stay bounded by the window size, however large the archive is.
+
+Every entry is appended to a checkpoint log in the job directory as soon as
+it reaches a final status (done, duplicate or failed). If the worker dies
+mid-import, the redelivered task skips the entries already recorded. Entries
+are keyed by central-directory position and CRC, so entries that share a name
+are tracked separately. Resumes that were already stored are also skipped as
+duplicates by content hash, so re-importing the same archive is cheap as well.
+"""
+import json
+import logging
+import shutil
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from supabase import Client
+
+from app.config import settings
+from app.services.resume_ingestion_service import (
+    STATUS_DONE,
+    STATUS_DUPLICATE,
+    STATUS_FAILED,
+    FINAL_STATUSES,
+    IngestionProgress,
+    ingest_resumes,
+)
+from app.services.text_extraction_service import SUPPORTED_EXTENSIONS
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILE = "checkpoint.jsonl"
+
+
+class InvalidArchiveError(ValueError):
+    """Raised when an uploaded file is not a usable ZIP archive."""
+
+
+def _skip_reason(info: zipfile.ZipInfo) -> Optional[str]:
+    """Why an entry is not imported, or None. Silent skips return ''."""
+    name = info.filename
+    base = name.rsplit("/", 1)[-1]
+    if info.is_dir() or name.startswith("__MACOSX/") or base.startswith((".", "~$")):
+        return ""
+    if Path(base).suffix.lower() not in SUPPORTED_EXTENSIONS:
+        return f"Unsupported file type: {Path(base).suffix or base}"
+    if info.flag_bits & 0x1:
+        return "Encrypted entries are not supported."
+    if info.file_size > settings.MAX_UPLOAD_FILE_BYTES:
+        return f"File exceeds the {settings.MAX_UPLOAD_FILE_BYTES // (1024 * 1024)} MB per-file limit."
+    if info.compress_size and info.file_size / info.compress_size > settings.ZIP_MAX_COMPRESSION_RATIO:
+        return "Suspicious compression ratio."
+    return None
+
+
+def scan_archive(zip_path: Path) -> Tuple[List[Tuple[int, zipfile.ZipInfo]], List[Tuple[str, str]]]:
+    """
+    Read the central directory only. Returns ([(central-directory position,
+    importable entry)], [(entry name, rejection reason)]). Raises InvalidArchiveError.
+    """
+    try:
+        with zipfile.ZipFile(zip_path) as zf:
+            infos = zf.infolist()
+    except (zipfile.BadZipFile, OSError) as e:
+        raise InvalidArchiveError(f"Not a valid ZIP archive: {e}")
+
+    entries, rejected = [], []
+    for position, info in enumerate(infos):
+        reason = _skip_reason(info)
+        if reason is None:
+            entries.append((position, info))
+        elif reason:
+            rejected.append((info.filename, reason))
+    if len(entries) > settings.ZIP_MAX_ENTRIES:
+        raise InvalidArchiveError(
+            f"Archive has {len(entries)} resumes; the limit is {settings.ZIP_MAX_ENTRIES}."
+        )
+    return entries, rejected
+
+
+def _stream_entry(zf: zipfile.ZipFile, info: zipfile.ZipInfo, dest: Path) -> None:
+    """Copy one entry to `dest` in chunks, enforcing the size cap on the actual bytes."""
+    written = 0
+    with zf.open(info) as src, open(dest, "wb") as out:
+        while chunk := src.read(settings.UPLOAD_CHUNK_BYTES):
+            written += len(chunk)
+            if written > settings.MAX_UPLOAD_FILE_BYTES:
+                raise ValueError("File exceeds the per-file size limit once decompressed.")
+            out.write(chunk)
+
+
+def entry_key(position: int, info: zipfile.ZipInfo) -> str:
+    """Checkpoint key: unique per entry even when names repeat, and stable across rescans."""
+    return f"{position}:{info.CRC:08x}"
+
+
+def _load_checkpoint(job_dir: Path) -> Dict[str, Dict]:
+    """{entry key: {"status", "error"}}; the last record per key wins."""
+    finished: Dict[str, Dict] = {}
+    try:
+        lines = (job_dir / CHECKPOINT_FILE).read_text().splitlines()
+    except OSError:
+        return finished
+    for line in lines:
+        try:
+            record = json.loads(line)
+            finished[record["key"]] = {"status": record["status"], "error": record.get("error")}
+        except (ValueError, KeyError, TypeError):
+            # A line cut short by a crash mid-write; that entry simply reruns.
+            continue
+    return finished
+
+
+class _CheckpointLog:
+    """Appends one record per entry as soon as it reaches a final status."""
+
+    def __init__(self, job_dir: Path, keys: List[str]):
+        self.path = job_dir / CHECKPOINT_FILE
+        self.keys = keys
+
+    def record(self, indexes: List[int], status: str, error: Optional[str]) -> None:
+        lines = "".join(
+            json.dumps({"key": self.keys[i], "status": status, "error": error}) + "\n"
+            for i in indexes if i < len(self.keys)
+        )
+        with open(self.path, "a") as f:
+            f.write(lines)
+            f.flush()
+
+
+async def import_resume_zip(
+    supabase: Client,
+    zip_path: Path,
+    job_dir: Path,
+    jd_id: str,
+    user_id: str,
+    progress_factory,
+    scope_id: Optional[str] = None,
+) -> Tuple[Dict, IngestionProgress]:
+    """
+    Import every resume in `zip_path` for `jd_id`. `progress_factory(filenames)`
+    builds the IngestionProgress used for per-entry reporting.
+    Returns (summary, progress).
+    """
+    entries, rejected = scan_archive(zip_path)
+    names = [info.filename for _, info in entries] + [name for name, _ in rejected]
+    keys = [entry_key(position, info) for position, info in entries]
+    progress: IngestionProgress = progress_factory(names)
+
+    for offset, (_, reason) in enumerate(rejected, start=len(entries)):
+        progress.files[offset]["status"] = STATUS_FAILED
+        progress.files[offset]["error"] = reason
+
+    checkpoint = _load_checkpoint(job_dir)
+    for index, key in enumerate(keys):
+        if key in checkpoint:
+            progress.files[index].update(checkpoint[key])
+    if checkpoint:
+        logger.info("[ZipImport] Resuming JD %s import: %d entries already processed", jd_id, len(checkpoint))
+    # Rejected entries (indexes past `keys`) are re-derived from the scan, not logged.
+    progress.on_final = _CheckpointLog(job_dir, keys).record
+
+    pending = [i for i, key in enumerate(keys) if key not in checkpoint]
+    window = max(1, settings.ZIP_IMPORT_WINDOW)
+    successful = sum(1 for f in progress.files if f["status"] == STATUS_DONE)
+    work_dir = job_dir / "entries"
+
+    with zipfile.ZipFile(zip_path) as zf:
+        for start in range(0, len(pending), window):
+            work_dir.mkdir(exist_ok=True)
+            batch = []
+            for index in pending[start:start + window]:
+                info = entries[index][1]
+                dest = work_dir / f"{index:06d}{Path(info.filename).suffix.lower()}"
+                try:
+                    _stream_entry(zf, info, dest)
+                    batch.append({"filename": info.filename, "path": str(dest), "progress_index": index})
+                except Exception as e:
+                    dest.unlink(missing_ok=True)
+                    progress.set(index, STATUS_FAILED, str(e))
+
+            if batch:
+                try:
+                    summary = await ingest_resumes(supabase, batch, jd_id, user_id, progress, scope_id)
+                    successful += summary["successful_uploads"]
+                except Exception as e:
+                    # Entries already finished in this window keep their status;
+                    # fail the rest and carry on with the next window.
+                    logger.exception("[ZipImport] Window starting at entry %d failed", pending[start])
+                    unfinished = [
+                        item["progress_index"] for item in batch
+                        if progress.files[item["progress_index"]]["status"] not in FINAL_STATUSES
+                    ]
+                    if unfinished:
+                        progress.set_many(unfinished, STATUS_FAILED, str(e))
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    failed = [{"filename": f["filename"], "error": f["error"]} for f in progress.files if f["status"] == STATUS_FAILED]
+    duplicates = sum(1 for f in progress.files if f["status"] == STATUS_DUPLICATE)
+    logger.info(
+        "[ZipImport] JD %s: %d resumes stored, %d duplicates skipped, %d failed",
+        jd_id, successful, duplicates, len(failed),
+    )
+    return {"successful_uploads": successful, "duplicate_uploads": duplicates, "failed_uploads": failed}, progress
@@ -0,0 +1,108 @@
+"""
+Micro-benchmark: construction and serialization cost of candidate objects.
+
+Compares validated Pydantic models, model_construct and the slotted records
+in src.core.records, per N candidates (10k by default).
+
+    cd Backend/app && python -m src.benchmarks.bench_models --n 10000
+"""
+
+import argparse
+import json
+import time
+from typing import Callable, List, Tuple
+
+from src.core.models import (
+    CandidateProfile, CandidateRanking, ConfidenceLevel, DimensionScores,
+    JobDescription, SearchMetadata, WorkflowResult
+)
+from src.core.records import DimensionScoresRecord, RankingRecord
+
+
+def _profile_dicts(n: int) -> List[dict]:
+    return [
+        {
+            'candidate_id': f'pdl_{i}',
+            'full_name': f'Candidate {i}',
+            'current_title': 'Senior Software Engineer',
+            'current_company': f'Company {i % 97}',
+            'linkedin_url': f'https://linkedin.com/in/candidate-{i}',
+            'email': f'candidate{i}@example.org',
+            'skills': ['Python', 'Django', 'PostgreSQL', 'AWS', 'Docker', 'Kubernetes'],
+            'experience_years': i % 20,
+            'education': ['BSc Computer Science'],
+            'previous_companies': ['Acme', 'Globex'],
+        }
+        for i in range(n)
+    ]
+
+
+def _ranking_kwargs(profile: dict, score: float) -> dict:
+    return {
+        'candidate_id': profile['candidate_id'],
+        'candidate_name': profile['full_name'],
+        'current_title': profile['current_title'],
+        'current_company': profile['current_company'],
+        'linkedin_url': profile['linkedin_url'],
+        'overall_score': score,
+        'strengths': ['Profile available for review'],
+        'concerns': ['Limited automated analysis available'],
+        'recommendations': ['Manual review recommended'],
+        'confidence_level': ConfidenceLevel.LOW,
+        'match_explanation': 'Fallback analysis applied due to AI processing limitations.',
+        'interview_focus_areas': ['General background review'],
+    }
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(n: int, repeat: int) -> List[Tuple[str, float]]:
+    profiles = _profile_dicts(n)
+    scores = [1.0 - i / n for i in range(n)]  # already sorted best first
+    kwargs = [_ranking_kwargs(p, s) for p, s in zip(profiles, scores)]
+
+    models = [CandidateRanking(dimension_scores=DimensionScores(**DimensionScoresRecord.uniform(k['overall_score']).to_dict()), **k) for k in kwargs]
+    records = [RankingRecord(dimension_scores=DimensionScoresRecord.uniform(k['overall_score']), **k) for k in kwargs]
+    job = JobDescription(title='Senior Python Developer', required_skills=['Python', 'AWS'])
+    metadata = SearchMetadata(processing_time_seconds=1.0, candidates_found=n, candidates_ranked=n)
+
+    cases = [
+        ('CandidateProfile(**data)  [validated]', lambda: [CandidateProfile(**p) for p in profiles]),
+        ('CandidateProfile.model_construct', lambda: [CandidateProfile.model_construct(**p) for p in profiles]),
+        ('CandidateRanking(...)  [validated]', lambda: [
+            CandidateRanking(dimension_scores=DimensionScores(**DimensionScoresRecord.uniform(k['overall_score']).to_dict()), **k)
+            for k in kwargs
+        ]),
+        ('RankingRecord(...)', lambda: [RankingRecord(dimension_scores=DimensionScoresRecord.uniform(k['overall_score']), **k) for k in kwargs]),
+        ('RankingRecord(...).to_model()', lambda: [
+            RankingRecord(dimension_scores=DimensionScoresRecord.uniform(k['overall_score']), **k).to_model() for k in kwargs
+        ]),
+        ('CandidateRanking.model_dump(mode=json)', lambda: [m.model_dump(mode='json') for m in models]),
+        ('CandidateRanking.model_dump_json', lambda: [m.model_dump_json() for m in models]),
+        ('RankingRecord.to_dict', lambda: [r.to_dict() for r in records]),
+        ('json.dumps(RankingRecord.to_dict())', lambda: [json.dumps(r.to_dict()) for r in records]),
+        ('WorkflowResult(rankings=N)', lambda: WorkflowResult(job_data=job, candidates=[], rankings=models, metadata=metadata)),
+    ]
+    return [(name, _time(fn, repeat)) for name, fn in cases]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--n', type=int, default=10000, help='Candidates per measurement')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per case; the best is reported')
+    args = parser.parse_args()
+
+    print(f"{'case':<42} {'ms per ' + str(args.n):>14} {'us each':>10}")
+    for name, seconds in run(args.n, args.repeat):
+        print(f"{name:<42} {seconds * 1000:>14.1f} {seconds * 1e6 / args.n:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
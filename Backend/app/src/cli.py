@@ -1,5 +1,6 @@
 
 import argparse
+import asyncio
 import csv
 import json
 import sys
@@ -497,13 +498,18 @@ class CLIApplication:
             print(" Starting recruitment workflow...")
             start_time = datetime.now()
             
-            result = self.workflow.run_workflow(job_description_text, args.max_candidates)
+            if getattr(args, 'async_workflow', False):
+                result = asyncio.run(self.workflow.run_workflow_async(job_description_text, args.max_candidates))
+            else:
+                result = self.workflow.run_workflow(job_description_text, args.max_candidates)
             
             end_time = datetime.now()
             execution_time = (end_time - start_time).total_seconds()
             
             # Record execution for monitoring
-            workflow_monitor.record_execution(result, execution_time)
+            workflow_monitor.record_execution(
+                result, execution_time, self.workflow.workflow_steps, self.workflow.last_run_usage
+            )
             
             # Display initial results
             self.formatter.print_executive_summary(result)
@@ -1112,25 +1118,33 @@ class CLIApplication:
         
         print(f"   Total Executions: {status['total_executions']}")
         print(f"   Success Rate: {status['success_rate']:.1%}")
-        print(f"   Average Processing Time: {status['avg_processing_time']:.1f}s")
+        if status['average_execution_time'] is not None:
+            print(f"   Average Processing Time: {status['average_execution_time']:.1f}s")
         
         if status['recent_executions']:
             print(f"\n Recent Performance:")
-            for execution in status['recent_executions'][-5:]:
-                timestamp = execution['timestamp'].strftime('%Y-%m-%d %H:%M:%S')
-                print(f"   {timestamp}: {execution['candidates_found']} candidates, {execution['processing_time']:.1f}s")
+            for execution in status['recent_executions'][:5]:
+                timestamp = datetime.fromtimestamp(execution['recorded_at']).strftime('%Y-%m-%d %H:%M:%S')
+                print(f"   {timestamp}: {execution['candidates_found']} candidates, {execution['execution_time']:.1f}s")
         
         return 0
     
     def _handle_performance_metrics(self) -> int:
         """Handle performance metrics command."""
-        print(" Performance Metrics:")
+        print(" Performance Metrics (last 24h):")
         
         metrics = workflow_monitor.get_performance_metrics()
+        if 'message' in metrics:
+            print(f"   {metrics['message']}")
+            return 0
+        
+        print(f"   Executions: {metrics['total_executions']} ({metrics['success_rate']:.1%} successful)")
+        print(f"   Average Candidates Found: {metrics['average_candidates_found']:.1f}")
+        print(f"   LLM Calls: {metrics['llm_calls']} ({metrics['llm_tokens']} tokens), API Calls: {metrics['api_calls']}")
         
-        print(f"   Average Candidates Found: {metrics['avg_candidates_found']:.1f}")
-        print(f"   Average Success Score: {metrics['avg_success_score']:.3f}")
-        print(f"   Processing Time Trend: {metrics['processing_time_trend']}")
+        print(f"\n   {'Metric':<40} {'p50':>10} {'p90':>10} {'p99':>10} {'count':>7}")
+        for name, stats in sorted(metrics['metrics'].items()):
+            print(f"   {name:<40} {stats['p50']:>10.2f} {stats['p90']:>10.2f} {stats['p99']:>10.2f} {stats['count']:>7}")
         
         return 0
     
@@ -1190,6 +1204,8 @@ Examples:
     # Search parameters
     parser.add_argument("--max-candidates", type=int, default=10, 
                        help="Maximum number of candidates to retrieve (default: 10)")
+    parser.add_argument("--async-workflow", action="store_true",
+                       help="Run steps on the async engine (overlapping search, conversion and ranking)")
     
     # Discovery options
     parser.add_argument("--with-discovery", action="store_true", 
@@ -34,6 +34,13 @@ class RecruitmentSettings(BaseModel):
     pdl_base_url: str = Field(default_factory=lambda: os.getenv("PDL_BASE_URL", "https://api.peopledatalabs.com/v5/"))
     pdl_timeout: int = Field(default_factory=lambda: int(os.getenv("PDL_TIMEOUT", "60")))
     pdl_max_retries: int = Field(default_factory=lambda: int(os.getenv("PDL_MAX_RETRIES", "3")))
+    # Send all PDL search strategies at once instead of one after another
+    pdl_concurrent_strategies: bool = Field(default_factory=lambda: os.getenv("PDL_CONCURRENT_STRATEGIES", "false").lower() == "true")
+    # Persistent cache of AI-generated PDL search terms (keyed by JD hash + prompt version)
+    search_terms_cache_enabled: bool = Field(default_factory=lambda: os.getenv("SEARCH_TERMS_CACHE_ENABLED", "true").lower() == "true")
+    search_terms_cache_path: str = Field(default_factory=lambda: os.getenv("SEARCH_TERMS_CACHE_PATH", ".cache/search_terms.sqlite"))
+    search_terms_cache_ttl_seconds: int = Field(default_factory=lambda: int(os.getenv("SEARCH_TERMS_CACHE_TTL_SECONDS", "604800")))
+    search_terms_cache_max_entries: int = Field(default_factory=lambda: int(os.getenv("SEARCH_TERMS_CACHE_MAX_ENTRIES", "1000")))
     
     # Search Configuration
     default_max_candidates: int = Field(default_factory=lambda: int(os.getenv("DEFAULT_MAX_CANDIDATES", "10")))
@@ -59,7 +66,17 @@ class RecruitmentSettings(BaseModel):
     # Performance Configuration
     concurrent_ranking_limit: int = Field(default_factory=lambda: int(os.getenv("CONCURRENT_RANKING_LIMIT", "5")))
     request_delay_seconds: float = Field(default_factory=lambda: float(os.getenv("REQUEST_DELAY_SECONDS", "0.1")))
-    
+    discovery_concurrency: int = Field(default_factory=lambda: int(os.getenv("DISCOVERY_CONCURRENCY", "6")))
+    discovery_seed_timeout_seconds: float = Field(default_factory=lambda: float(os.getenv("DISCOVERY_SEED_TIMEOUT_SECONDS", "300")))
+    # Rank only the best N candidates of larger pools with AI (heuristic pre-filter; 0 = rank all)
+    ranking_prefilter_limit: int = Field(default_factory=lambda: int(os.getenv("RANKING_PREFILTER_LIMIT", "0")))
+    # Per-step timeout for RecruitmentWorkflow.run_workflow_async
+    workflow_step_timeout_seconds: float = Field(default_factory=lambda: float(os.getenv("WORKFLOW_STEP_TIMEOUT_SECONDS", "600")))
+    # Persistent run metrics read by --performance-metrics and /superadmin/workflow-metrics
+    workflow_metrics_enabled: bool = Field(default_factory=lambda: os.getenv("WORKFLOW_METRICS_ENABLED", "true").lower() == "true")
+    workflow_metrics_db: str = Field(default_factory=lambda: os.getenv("WORKFLOW_METRICS_DB", ".cache/workflow_metrics.sqlite"))
+    workflow_metrics_retention_days: int = Field(default_factory=lambda: int(os.getenv("WORKFLOW_METRICS_RETENTION_DAYS", "30")))
+
     @validator('log_level')
     def validate_log_level(cls, v):
         valid_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
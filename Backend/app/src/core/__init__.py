@@ -14,6 +14,8 @@ from .models import (
     PDLSearchQuery,
     APIResponse
 )
+from .candidate_pool import CandidatePool, normalize_linkedin_url
+from .records import DimensionScoresRecord, RankingRecord
 
 __all__ = [
     'JobDescription',
@@ -29,6 +31,10 @@ __all__ = [
     'DimensionScores',
     'SearchMetadata',
     'PDLSearchQuery',
-    'APIResponse'
+    'APIResponse',
+    'CandidatePool',
+    'normalize_linkedin_url',
+    'DimensionScoresRecord',
+    'RankingRecord'
 ]
 
@@ -0,0 +1,122 @@
+"""
+Indexed candidate pool.
+
+Keeps candidates in insertion order with hash indexes on candidate_id,
+normalized LinkedIn URL, email and (name, company), so duplicate checks and
+lookups by id stay O(1) as the pool grows. Works with CandidateProfile
+objects, wrappers exposing `candidate_profile` (resume candidates) and raw
+PDL person dicts.
+"""
+
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Emails generated as placeholders when a profile has none; they carry no identity.
+PLACEHOLDER_EMAIL_DOMAINS = ("placeholder.email", "example.com")
+
+_LINKEDIN_SLUG = re.compile(r"linkedin\.com/(in|pub|company)/([^/?#\s]+)", re.IGNORECASE)
+
+
+def _field(candidate: Any, *names: str) -> Any:
+    """First non-empty attribute (or dict key) among `names`."""
+    if hasattr(candidate, 'candidate_profile'):
+        candidate = candidate.candidate_profile
+    for name in names:
+        value = candidate.get(name) if isinstance(candidate, dict) else getattr(candidate, name, None)
+        if value:
+            return value
+    return None
+
+
+def normalize_linkedin_url(url: Optional[str]) -> Optional[str]:
+    """'https://www.LinkedIn.com/in/Jane-Doe/?x=1' -> 'linkedin.com/in/jane-doe'."""
+    if not url or not isinstance(url, str):
+        return None
+    match = _LINKEDIN_SLUG.search(url)
+    if match:
+        return f"linkedin.com/{match.group(1).lower()}/{match.group(2).lower()}"
+    url = re.sub(r"^https?://(www\.)?", "", url.strip().lower())
+    return url.split("?")[0].rstrip("/") or None
+
+
+def candidate_keys(candidate: Any) -> List[Tuple[str, str]]:
+    """All identity keys of a candidate, e.g. [('id', 'pdl_1'), ('linkedin', ...)]."""
+    keys = []
+    candidate_id = _field(candidate, 'candidate_id', 'id', 'person_id')
+    if candidate_id:
+        keys.append(('id', str(candidate_id)))
+
+    linkedin = normalize_linkedin_url(_field(candidate, 'linkedin_url', 'linkedin', 'profile_url'))
+    if linkedin:
+        keys.append(('linkedin', linkedin))
+
+    email = _field(candidate, 'email', 'work_email')
+    if isinstance(email, str) and '@' in email:
+        email = email.strip().lower()
+        if not email.endswith(PLACEHOLDER_EMAIL_DOMAINS):
+            keys.append(('email', email))
+
+    name = _field(candidate, 'full_name', 'name')
+    if isinstance(name, str) and name.strip():
+        company = _field(candidate, 'current_company', 'job_company_name', 'company')
+        company = company.strip().lower() if isinstance(company, str) and company.strip() else 'unknown'
+        keys.append(('name_company', f"{name.strip().lower()}_{company}"))
+
+    return keys
+
+
+class CandidatePool:
+    """
+    Insertion-ordered candidate collection with O(1) dedup and id lookup.
+
+    The constructor seeds the pool with `candidates` as given, without deduping
+    them, so every seed stays retrievable by its id; add() and extend() dedup
+    later candidates against everything pooled.
+    """
+
+    def __init__(self, candidates: Iterable[Any] = ()):
+        self._candidates: List[Any] = []
+        self._index: Dict[Tuple[str, str], Any] = {}
+        for candidate in candidates:
+            self._candidates.append(candidate)
+            for key in candidate_keys(candidate):
+                # The first seed owning a key keeps it for find()
+                self._index.setdefault(key, candidate)
+
+    def __len__(self) -> int:
+        return len(self._candidates)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._candidates)
+
+    def __contains__(self, candidate: Any) -> bool:
+        return self.find(candidate) is not None
+
+    @property
+    def candidates(self) -> List[Any]:
+        return list(self._candidates)
+
+    def get(self, candidate_id: str) -> Optional[Any]:
+        return self._index.get(('id', str(candidate_id)))
+
+    def find(self, candidate: Any) -> Optional[Any]:
+        """The pooled candidate sharing any identity key with `candidate`, if any."""
+        for key in candidate_keys(candidate):
+            existing = self._index.get(key)
+            if existing is not None:
+                return existing
+        return None
+
+    def add(self, candidate: Any) -> bool:
+        """Add `candidate` unless it duplicates one already pooled. Returns True if added."""
+        keys = candidate_keys(candidate)
+        if any(key in self._index for key in keys):
+            return False
+        self._candidates.append(candidate)
+        for key in keys:
+            self._index[key] = candidate
+        return True
+
+    def extend(self, candidates: Iterable[Any]) -> List[Any]:
+        """Add each new candidate; returns the ones that were not duplicates."""
+        return [candidate for candidate in candidates if self.add(candidate)]
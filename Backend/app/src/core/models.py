@@ -216,9 +216,9 @@ class WorkflowResult(BaseModel):
     @validator('rankings')
     def validate_rankings_sorted(cls, v):
         """Ensure rankings are sorted by overall_score in descending order."""
-        if len(v) > 1:
-            scores = [ranking.overall_score for ranking in v]
-            if scores != sorted(scores, reverse=True):
+        # Single linear pass; rankings arrive pre-sorted from the ranker
+        for previous, current in zip(v, v[1:]):
+            if current.overall_score > previous.overall_score:
                 raise ValueError('Rankings must be sorted by overall_score in descending order')
         return v
     
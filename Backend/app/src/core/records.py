@@ -0,0 +1,93 @@
+"""
+Lightweight internal records for hot-path ranking objects.
+
+Rankings the system computes itself (fallback, emergency and pre-filter
+scoring) are built as slotted dataclasses, which cost about a tenth of a
+validated CandidateRanking to create, and are converted with `to_model()`
+only when they leave the ranker. That conversion is the Pydantic boundary:
+it goes through `model_validate` on a plain dict, which under pydantic v2
+is faster than both keyword construction and `model_construct`.
+Run src/benchmarks/bench_models.py for numbers.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .models import CandidateRanking, ConfidenceLevel, DimensionScores
+
+DIMENSIONS = (
+    'technical_skills',
+    'experience_relevance',
+    'seniority_match',
+    'education_fit',
+    'industry_experience',
+    'location_compatibility',
+)
+
+
+@dataclass(slots=True)
+class DimensionScoresRecord:
+    technical_skills: float
+    experience_relevance: float
+    seniority_match: float
+    education_fit: float
+    industry_experience: float
+    location_compatibility: float
+
+    @classmethod
+    def uniform(cls, score: float) -> 'DimensionScoresRecord':
+        return cls(score, score, score, score, score, score)
+
+    def to_dict(self) -> Dict[str, float]:
+        return {name: getattr(self, name) for name in DIMENSIONS}
+
+    def to_model(self) -> DimensionScores:
+        return DimensionScores.model_validate(self.to_dict())
+
+
+@dataclass(slots=True)
+class RankingRecord:
+    candidate_id: str
+    candidate_name: str
+    overall_score: float
+    dimension_scores: DimensionScoresRecord
+    match_explanation: str
+    confidence_level: ConfidenceLevel = ConfidenceLevel.LOW
+    current_title: Optional[str] = None
+    current_company: Optional[str] = None
+    linkedin_url: Optional[str] = None
+    strengths: List[str] = field(default_factory=list)
+    concerns: List[str] = field(default_factory=list)
+    recommendations: List[str] = field(default_factory=list)
+    key_differentiators: List[str] = field(default_factory=list)
+    interview_focus_areas: List[str] = field(default_factory=list)
+    candidate_description: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Same shape as CandidateRanking.model_dump(mode='json')."""
+        return {
+            'candidate_id': self.candidate_id,
+            'candidate_name': self.candidate_name,
+            'current_title': self.current_title,
+            'current_company': self.current_company,
+            'linkedin_url': self.linkedin_url,
+            'overall_score': self.overall_score,
+            'dimension_scores': self.dimension_scores.to_dict(),
+            'strengths': self.strengths,
+            'concerns': self.concerns,
+            'recommendations': self.recommendations,
+            'confidence_level': self.confidence_level.value,
+            'match_explanation': self.match_explanation,
+            'key_differentiators': self.key_differentiators,
+            'interview_focus_areas': self.interview_focus_areas,
+            'candidate_description': self.candidate_description,
+        }
+
+    def to_model(self) -> CandidateRanking:
+        return CandidateRanking.model_validate(self.to_dict())
+
+
+def to_rankings(records: List[RankingRecord]) -> List[CandidateRanking]:
+    """Sort records best first and convert them to CandidateRanking models."""
+    records.sort(key=lambda record: record.overall_score, reverse=True)
+    return [record.to_model() for record in records]
@@ -0,0 +1,55 @@
+"""
+Process-wide counters for outbound LLM and data API calls.
+
+Clients call record_llm_call / record_api_call after each request. The
+workflow snapshots the counters at the start of a run and reports the
+difference to WorkflowMonitor; runs overlapping in one process share the
+same counters, so their usage is only approximately separated.
+"""
+
+import threading
+from collections import Counter
+from typing import Any, Dict
+
+
+class UsageCounter:
+    """Thread-safe named counters (llm_calls, llm_tokens, api_calls, <provider>_calls, ...)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+
+    def add(self, **amounts: int) -> None:
+        with self._lock:
+            self._counts.update({name: amount for name, amount in amounts.items() if amount})
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def since(self, before: Dict[str, int]) -> Dict[str, int]:
+        """Counts added since `before` (a snapshot)."""
+        delta = {name: count - before.get(name, 0) for name, count in self.snapshot().items()}
+        return {name: count for name, count in delta.items() if count}
+
+
+usage_counter = UsageCounter()
+
+
+def _total_tokens(response: Any) -> int:
+    """Token usage from an OpenAI SDK response, a raw OpenAI JSON body or a Gemini response."""
+    if isinstance(response, dict):
+        return int((response.get('usage') or {}).get('total_tokens') or 0)
+    usage = getattr(response, 'usage', None)
+    if usage is not None:
+        return int(getattr(usage, 'total_tokens', 0) or 0)
+    metadata = getattr(response, 'usage_metadata', None)
+    return int(getattr(metadata, 'total_token_count', 0) or 0)
+
+
+def record_llm_call(provider: str, response: Any = None) -> None:
+    usage_counter.add(**{'llm_calls': 1, 'llm_tokens': _total_tokens(response), f'{provider}_calls': 1})
+
+
+def record_api_call(provider: str) -> None:
+    usage_counter.add(**{'api_calls': 1, f'{provider}_calls': 1})
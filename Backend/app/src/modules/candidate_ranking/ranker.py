@@ -1372,12 +1372,14 @@ This module provides comprehensive candidate ranking capabilities with AI-powere
 
 """
 
+import hashlib
+import heapq
 import json
 import logging
 import os
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Any, Optional, Union
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple, Union
 import requests
 from datetime import datetime
 import fitz
@@ -1387,6 +1389,10 @@ from src.core.models import (
     CandidateProfile, CandidateRanking, JobDescription, 
     ConfidenceLevel, DimensionScores
 )
+from src.core.candidate_pool import CandidatePool
+from src.core.records import DimensionScoresRecord, RankingRecord, to_rankings
+from src.modules.candidate_ranking.vector_scorer import emergency_scores, fallback_scores, pool_features, top_indices
+from src.core.usage import record_llm_call
 
 logger = logging.getLogger(__name__)
 
@@ -1394,6 +1400,9 @@ logger = logging.getLogger(__name__)
 class CandidateRanker:
     """AI-powered candidate ranking with discovery capabilities."""
     
+    # Candidates per OpenAI ranking request
+    RANK_BATCH_SIZE = 5
+    
     def __init__(self):
         """Initialize the ranker with settings and configur ations."""
         self.settings = get_settings()
@@ -1416,6 +1425,17 @@ class CandidateRanker:
         self.discovery_max_iterations = getattr(self.settings, 'discovery_max_iterations', 2)
         self.discovery_candidates_per_seed = getattr(self.settings, 'discovery_candidates_per_seed', 2)
         self.discovery_top_seeds = getattr(self.settings, 'discovery_top_seeds', 6)
+        # Seeds explored concurrently, and the wall-clock budget for one iteration's seeds
+        self.discovery_concurrency = getattr(self.settings, 'discovery_concurrency', 6)
+        self.discovery_seed_timeout = getattr(self.settings, 'discovery_seed_timeout_seconds', 300)
+        
+        # Pools larger than this are cut to their best heuristic scores before AI ranking (0 = off)
+        self.prefilter_limit = getattr(self.settings, 'ranking_prefilter_limit', 0)
+        
+        # Rankings already paid for, keyed by (JD fingerprint, candidate_id)
+        self._ranking_memo: Dict[Tuple[str, str], CandidateRanking] = {}
+        # Candidates given heuristic (fallback/emergency) scores since the last reset
+        self._heuristic_ids: Set[str] = set()
         
         # Enable discovery if API key is available
         if self.gemini_api_key and not self.discovery_enabled:
@@ -1476,11 +1496,14 @@ class CandidateRanker:
             logger.error("No valid candidates after validation")
             return []
         
+        if self.prefilter_limit and len(validated_candidates) > self.prefilter_limit:
+            validated_candidates = self._prefilter_candidates(job_data, validated_candidates, self.prefilter_limit)
+        
         logger.info(f"Ranking {len(validated_candidates)} candidates with AI-powered analysis...")
         
         try:
             # Process candidates in batches for better performance
-            batch_size = 5
+            batch_size = self.RANK_BATCH_SIZE
             all_rankings = []
             
             for i in range(0, len(validated_candidates), batch_size):
@@ -1504,13 +1527,74 @@ class CandidateRanker:
             # Return emergency rankings
             return self._create_emergency_rankings(validated_candidates, job_data)
     
+    def _prefilter_candidates(self, job_data: JobDescription, candidates: List[CandidateProfile], keep: int) -> List[CandidateProfile]:
+        """Keep the `keep` candidates with the best heuristic scores, best first."""
+        scores = fallback_scores(pool_features(job_data, candidates))
+        kept = [candidates[i] for i in top_indices(scores, keep)]
+        logger.info(f"Pre-filter kept {len(kept)} of {len(candidates)} candidates for AI ranking")
+        return kept
+    
+    def iter_rank_batches(self, job_data: JobDescription, candidates: Iterable[Any]) -> Iterator[List[CandidateRanking]]:
+        """
+        Rank candidates pulled from any iterable (e.g. a conversion stream),
+        one batch as soon as RANK_BATCH_SIZE candidates have arrived.
+        Yields each batch's rankings, sorted best first.
+        """
+        batch = []
+        for candidate in candidates:
+            batch.append(candidate)
+            if len(batch) >= self.RANK_BATCH_SIZE:
+                yield self.rank_candidates(job_data, batch)
+                batch = []
+        if batch:
+            yield self.rank_candidates(job_data, batch)
+    
+    def _jd_fingerprint(self, job_data: JobDescription) -> str:
+        """Stable hash of the JD; memoized rankings are only valid for the same JD."""
+        return hashlib.sha256(job_data.model_dump_json().encode("utf-8")).hexdigest()
+    
+    def _rank_incremental(self, job_data: JobDescription, candidates: List[CandidateProfile], current_rankings: List[CandidateRanking]) -> Tuple[List[CandidateRanking], int]:
+        """
+        Rank only candidates that have no memoized ranking for this JD and merge
+        them into `current_rankings` (sorted best first).
+        Returns (merged rankings, number of candidates sent to the AI ranker).
+        """
+        fingerprint = self._jd_fingerprint(job_data)
+        ranked_ids = {ranking.candidate_id for ranking in current_rankings}
+        
+        reused, pending = [], []
+        for candidate in self._validate_and_flatten_candidates(candidates):
+            if candidate.candidate_id in ranked_ids:
+                continue
+            ranked_ids.add(candidate.candidate_id)
+            memoized = self._ranking_memo.get((fingerprint, candidate.candidate_id))
+            if memoized is not None:
+                reused.append(memoized)
+            else:
+                pending.append(candidate)
+        
+        self._heuristic_ids.clear()
+        new_rankings = self.rank_candidates(job_data, pending) if pending else []
+        for ranking in new_rankings:
+            # Heuristic (fallback/emergency) scores depend only on the candidate,
+            # so they merge consistently, but they are not memoized: the
+            # candidate gets a real AI score the next time it comes up.
+            if ranking.candidate_id not in self._heuristic_ids:
+                self._ranking_memo[(fingerprint, ranking.candidate_id)] = ranking
+        new_rankings.extend(reused)
+        new_rankings.sort(key=lambda x: x.overall_score, reverse=True)
+        
+        logger.info(f"Incremental ranking: {len(pending)} scored, {len(reused)} reused from memo")
+        merged = list(heapq.merge(current_rankings, new_rankings, key=lambda x: x.overall_score, reverse=True))
+        return merged, len(pending)
+    
     def rank_candidates_with_discovery(self, job_data: JobDescription, candidates: List[CandidateProfile], jd_file_path: Optional[str] = None, prompt_addon: Optional[str] = None) -> Dict[str, Any]:
         """Rank candidates with iterative discovery using Gemini 2.5 Pro."""
         logger.info(" Starting iterative candidate discovery process...")
         
         # Initial ranking
         logger.info(" Performing initial candidate ranking...")
-        initial_rankings = self.rank_candidates(job_data, candidates)
+        initial_rankings, scored = self._rank_incremental(job_data, candidates, [])
         
         if not initial_rankings:
             logger.warning("No initial candidates to use for discovery")
@@ -1532,7 +1616,7 @@ class CandidateRanker:
             }
         
         # Iterative discovery
-        all_candidates = list(candidates)  # Start with original candidates
+        pool = CandidatePool(candidates)  # Start with original candidates
         discovery_stats = {
             'iterations': 0,
             'candidates_discovered': 0,
@@ -1540,72 +1624,45 @@ class CandidateRanker:
             'successful_calls': 0,
             'failed_calls': 0,
             'initial_count': len(initial_rankings),
+            'candidates_scored': scored,
             'final_count': 0,
             'score_improvement': 0.0,
             'source_distribution': {'pdl_api': 0, 'uploaded_resume': 0, 'gemini_discovery': 0}
         }
         
+        # Kept sorted; each iteration only scores the newly discovered candidates
+        current_rankings = initial_rankings
+        
         for iteration in range(1, self.discovery_max_iterations + 1):
             logger.info(f"\n Discovery Iteration {iteration}/{self.discovery_max_iterations}")
             
             # Get top candidates as seeds
-            current_rankings = self.rank_candidates(job_data, all_candidates)
             top_seeds = current_rankings[:self.discovery_top_seeds]
             
             logger.info(f" Using top {len(top_seeds)} candidates as seeds")
             
-            iteration_candidates = []
-            
-            for seed_idx, seed_ranking in enumerate(top_seeds, 1):
-                logger.info(f" Processing seed {seed_idx}/{len(top_seeds)}: {seed_ranking.candidate_name}")
-                
-                # Find the original candidate profile for this ranking
-                seed_candidate = None
-                for candidate in all_candidates:
-                    if candidate.candidate_id == seed_ranking.candidate_id:
-                        seed_candidate = candidate
-                        break
-                
-                if not seed_candidate:
-                    logger.warning(f"Could not find original candidate profile for {seed_ranking.candidate_name}")
-                    continue
-                
-                # Discover similar candidates
-                discovered = self._discover_similar_candidates(
-                    job_data, seed_candidate, seed_ranking, iteration, jd_file_path, prompt_addon=prompt_addon
-                )
-                
-                discovery_stats['total_api_calls'] += 1
-                if discovered:
-                    discovery_stats['successful_calls'] += 1
-                    iteration_candidates.extend(discovered)
-                    logger.info(f"    Found {len(discovered)} valid candidates from seed")
-                else:
-                    discovery_stats['failed_calls'] += 1
-                    logger.info(f"    No valid candidates found from seed")
-            
-            # Deduplicate candidates
-            before_dedup = len(iteration_candidates)
-            iteration_candidates = self._deduplicate_candidates(iteration_candidates, all_candidates)
-            after_dedup = len(iteration_candidates)
+            # Seeds are explored concurrently; results are deduplicated as they arrive
+            before_dedup, iteration_candidates = self._discover_from_seeds(
+                job_data, top_seeds, pool, discovery_stats, iteration, jd_file_path, prompt_addon
+            )
             
-            logger.info(f" Deduplicated: {before_dedup} → {after_dedup} candidates")
+            logger.info(f" Deduplicated: {before_dedup} → {len(iteration_candidates)} candidates")
             
             if not iteration_candidates:
                 logger.warning(f"No new candidates discovered in iteration {iteration}")
                 continue
             
-            # Add to candidate pool
-            all_candidates.extend(iteration_candidates)
+            # Already added to the pool as they arrived
             discovery_stats['candidates_discovered'] += len(iteration_candidates)
             discovery_stats['iterations'] = iteration
             
             logger.info(f" Added {len(iteration_candidates)} new candidates to pool")
-            logger.info(f" Total candidates now: {len(all_candidates)}")
+            logger.info(f" Total candidates now: {len(pool)}")
+            
+            current_rankings, scored = self._rank_incremental(job_data, iteration_candidates, current_rankings)
+            discovery_stats['candidates_scored'] += scored
         
-        # Final ranking with all candidates
-        logger.info(" Performing final ranking with all discovered candidates...")
-        final_rankings = self.rank_candidates(job_data, all_candidates)
+        final_rankings = current_rankings
         
         # Update discovery statistics
         discovery_stats['final_count'] = len(final_rankings)
@@ -1634,6 +1691,60 @@ class CandidateRanker:
             'discovery_data': discovery_stats
         }
     
+    def _discover_from_seeds(self, job_data: JobDescription, top_seeds: List[CandidateRanking], pool: CandidatePool, discovery_stats: Dict[str, Any], iteration: int, jd_file_path: Optional[str] = None, prompt_addon: Optional[str] = None) -> Tuple[int, List[CandidateProfile]]:
+        """
+        Run discovery for all seeds with at most `discovery_concurrency` Gemini
+        calls in flight. Seeds still running after `discovery_seed_timeout`
+        seconds are abandoned and whatever arrived so far is used.
+        New unique candidates are added to `pool` as they arrive.
+        Returns (candidates found before dedup, new unique candidates).
+        """
+        seeds = []
+        for seed_ranking in top_seeds:
+            seed_candidate = pool.get(seed_ranking.candidate_id)
+            if not seed_candidate:
+                logger.warning(f"Could not find original candidate profile for {seed_ranking.candidate_name}")
+                continue
+            seeds.append((seed_candidate, seed_ranking))
+        if not seeds:
+            return 0, []
+        
+        found, unique = 0, []
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.discovery_concurrency, len(seeds))))
+        futures = {
+            executor.submit(
+                self._discover_similar_candidates, job_data, seed_candidate, seed_ranking,
+                iteration, jd_file_path, prompt_addon, seed_idx
+            ): seed_ranking
+            for seed_idx, (seed_candidate, seed_ranking) in enumerate(seeds, 1)
+        }
+        try:
+            for future in as_completed(futures, timeout=self.discovery_seed_timeout):
+                seed_ranking = futures[future]
+                discovery_stats['total_api_calls'] += 1
+                try:
+                    discovered = future.result()
+                except Exception as e:
+                    logger.error(f"Discovery failed for seed {seed_ranking.candidate_name}: {e}")
+                    discovered = []
+                if discovered:
+                    discovery_stats['successful_calls'] += 1
+                    found += len(discovered)
+                    unique.extend(pool.extend(discovered))
+                    logger.info(f"    Found {len(discovered)} valid candidates from seed {seed_ranking.candidate_name}")
+                else:
+                    discovery_stats['failed_calls'] += 1
+                    logger.info(f"    No valid candidates found from seed {seed_ranking.candidate_name}")
+        except FuturesTimeoutError:
+            pending = [futures[f].candidate_name for f in futures if not f.done()]
+            discovery_stats['total_api_calls'] += len(pending)
+            discovery_stats['failed_calls'] += len(pending)
+            logger.warning(f"Discovery timed out after {self.discovery_seed_timeout}s; continuing without seeds: {', '.join(pending)}")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return found, unique
+    
     def _validate_and_flatten_candidates(self, candidates: Any) -> List[CandidateProfile]:
         """Validate and flatten candidates, handling various input types safely."""
         validated = []
@@ -1840,6 +1951,7 @@ Return only valid JSON, no additional text.
                 max_tokens=self.openai_max_tokens,
                 timeout=self.openai_timeout
             )
+            record_llm_call('openai', response)
             
             content = response.choices[0].message.content.strip()
             logger.debug(" OpenAI request successful")
@@ -1860,6 +1972,7 @@ Return only valid JSON, no additional text.
                         max_tokens=min(self.openai_max_tokens, 2000),
                         timeout=30
                     )
+                    record_llm_call('openai', response)
                     return response.choices[0].message.content.strip()
                 except Exception as retry_error:
                     logger.error(f"Retry failed: {retry_error}")
@@ -1977,111 +2090,64 @@ Return only valid JSON, no additional text.
             return []
     
     def _create_fallback_rankings(self, candidates: List[CandidateProfile], job_data: JobDescription) -> List[CandidateRanking]:
-        """Create fallback rankings when AI analysis fails."""
+        """Create fallback rankings when AI analysis fails (heuristic scores, see vector_scorer)."""
         logger.info("Creating fallback rankings...")
         
-        rankings = []
+        features = pool_features(job_data, candidates)
+        scores = fallback_scores(features).tolist()
+        self._heuristic_ids.update(candidate.candidate_id for candidate in candidates)
         
-        for candidate in candidates:
-            # Simple scoring based on available data
-            score = 0.5  # Base score
-            
-            # Boost for resume candidates
-            if hasattr(candidate, 'source') and getattr(candidate, 'source') == 'uploaded_resume':
-                score += 0.1
-            
-            # Simple skill matching
-            if candidate.skills and job_data.required_skills:
-                skill_overlap = len(set(candidate.skills) & set(job_data.required_skills))
-                score += min(skill_overlap * 0.05, 0.2)
-            
-            # Location matching
-            if candidate.location and job_data.location:
-                if candidate.location.city == job_data.location.city:
-                    score += 0.1
-            
-            # Cap score
-            score = min(score, 1.0)
-            
-            # Create basic dimension scores
-            dimension_scores = DimensionScores(
-                technical_skills=score,
-                experience_relevance=score,
-                seniority_match=score,
-                education_fit=score,
-                industry_experience=score,
-                location_compatibility=score
-            )
-            
-            # Determine if resume candidate
-            is_resume_candidate = hasattr(candidate, 'source') and getattr(candidate, 'source') == 'uploaded_resume'
+        rankings = []
+        for candidate, score, is_resume_candidate in zip(candidates, scores, features.is_resume.tolist()):
             match_explanation = " UPLOADED RESUME CANDIDATE: Fallback analysis applied due to AI processing limitations." if is_resume_candidate else "Fallback analysis applied due to AI processing limitations."
             
-            ranking = CandidateRanking(
+            rankings.append(RankingRecord(
                 candidate_id=candidate.candidate_id,
                 candidate_name=candidate.full_name,
                 current_title=candidate.current_title,
                 current_company=candidate.current_company,
                 linkedin_url=candidate.linkedin_url,
                 overall_score=score,
-                dimension_scores=dimension_scores,
+                dimension_scores=DimensionScoresRecord.uniform(score),
                 strengths=["Profile available for review"],
                 concerns=["Limited automated analysis available"],
                 recommendations=["Manual review recommended"],
                 confidence_level=ConfidenceLevel.LOW,
                 match_explanation=match_explanation,
-                key_differentiators=[],
                 interview_focus_areas=["General background review"]
-            )
-            
-            rankings.append(ranking)
+            ))
         
         # Sort by score
-        rankings.sort(key=lambda x: x.overall_score, reverse=True)
-        
-        return rankings
+        return to_rankings(rankings)
     
     def _create_emergency_rankings(self, candidates: List[CandidateProfile], job_data: JobDescription) -> List[CandidateRanking]:
         """Create emergency rankings for completely invalid data."""
         logger.warning("Creating emergency rankings...")
         
-        rankings = []
+        candidate_ids = [getattr(candidate, 'candidate_id', f'emergency_{i}') for i, candidate in enumerate(candidates)]
+        self._heuristic_ids.update(candidate_ids)
         
-        for i, candidate in enumerate(candidates):
-            # Very basic ranking
-            score = 0.4 + (i * 0.01)  # Slight variation
-            
-            dimension_scores = DimensionScores(
-                technical_skills=score,
-                experience_relevance=score,
-                seniority_match=score,
-                education_fit=score,
-                industry_experience=score,
-                location_compatibility=score
-            )
-            
-            ranking = CandidateRanking(
-                candidate_id=getattr(candidate, 'candidate_id', f'emergency_{i}'),
+        rankings = []
+        for i, (candidate, candidate_id, score) in enumerate(zip(candidates, candidate_ids, emergency_scores(candidate_ids).tolist())):
+            rankings.append(RankingRecord(
+                candidate_id=candidate_id,
                 candidate_name=getattr(candidate, 'full_name', f'Candidate {i+1}'),
                 current_title=getattr(candidate, 'current_title', 'Unknown'),
                 current_company=getattr(candidate, 'current_company', 'Unknown'),
                 linkedin_url=getattr(candidate, 'linkedin_url', None),
                 overall_score=score,
-                dimension_scores=dimension_scores,
+                dimension_scores=DimensionScoresRecord.uniform(score),
                 strengths=["Candidate profile available"],
                 concerns=["Automated analysis unavailable"],
                 recommendations=["Manual review required"],
                 confidence_level=ConfidenceLevel.LOW,
                 match_explanation="Emergency ranking applied due to system limitations.",
-                key_differentiators=[],
                 interview_focus_areas=["Complete profile review"]
-            )
-            
-            rankings.append(ranking)
+            ))
         
-        return rankings
+        return to_rankings(rankings)
     
-    def _discover_similar_candidates(self, job_data: JobDescription, seed_candidate: CandidateProfile, seed_ranking: CandidateRanking, iteration: int = 1, jd_file_path: Optional[str] = None, prompt_addon: Optional[str] = None) -> List[CandidateProfile]:
+    def _discover_similar_candidates(self, job_data: JobDescription, seed_candidate: CandidateProfile, seed_ranking: CandidateRanking, iteration: int = 1, jd_file_path: Optional[str] = None, prompt_addon: Optional[str] = None, seed_index: int = 0) -> List[CandidateProfile]:
         """Discover similar candidates using Gemini 2.5 Pro with Google Search grounding."""
         try:
             # Create discovery prompt
@@ -2094,7 +2160,7 @@ Return only valid JSON, no additional text.
                 return []
             
             # Parse candidates from response
-            candidates = self._parse_gemini_candidates(response, iteration)
+            candidates = self._parse_gemini_candidates(response, iteration, seed_index)
             
             return candidates
             
@@ -2236,6 +2302,7 @@ CRITICAL INSTRUCTIONS:
                     contents=prompt,
                     config=config
                 )
+                record_llm_call('gemini', response)
                 # --- End of your existing logic ---
 
                 # If the request succeeds, check for empty text and return
@@ -2270,7 +2337,7 @@ CRITICAL INSTRUCTIONS:
         return None
 
     
-    def _parse_gemini_candidates(self, response: str, iteration: int = 1) -> List[CandidateProfile]:
+    def _parse_gemini_candidates(self, response: str, iteration: int = 1, seed_index: int = 0) -> List[CandidateProfile]:
         """Parse candidates from Gemini response with OpenAI 4o assistance and save to JSON/CSV."""
         import json
         import csv
@@ -2294,7 +2361,8 @@ CRITICAL INSTRUCTIONS:
             candidates_data = self._extract_candidates_with_openai(response)
             
             # Step 2: Save raw response and parsed data to JSON
-            json_filename = f"gemini_candidates_iter{iteration}_{timestamp}.json"
+            # Seeds run concurrently, so the seed index keeps filenames unique
+            json_filename = f"gemini_candidates_iter{iteration}_seed{seed_index}_{timestamp}.json"
             json_path = os.path.join(results_dir, json_filename)
             
             json_data = {
@@ -2312,7 +2380,7 @@ CRITICAL INSTRUCTIONS:
             logger.info(f" Gemini response saved to JSON: {json_path}")
             
             # Step 3: Save candidates to CSV
-            csv_filename = f"gemini_candidates_iter{iteration}_{timestamp}.csv"
+            csv_filename = f"gemini_candidates_iter{iteration}_seed{seed_index}_{timestamp}.csv"
             csv_path = os.path.join(results_dir, csv_filename)
             
             self._save_candidates_to_csv(candidates_data, csv_path)
@@ -2366,7 +2434,7 @@ CRITICAL INSTRUCTIONS:
                     
                     # Create candidate profile with discovery metadata
                     candidate = CandidateProfile(
-                        candidate_id=f"gemini_iter{iteration}_{hash(candidate_data.get('full_name'))}_{int(time.time())}_{i}",
+                        candidate_id=f"gemini_iter{iteration}_s{seed_index}_{hash(candidate_data.get('full_name'))}_{int(time.time())}_{i}",
                         full_name=candidate_data.get('full_name'),
                         email=email,  # Now properly validated
                         phone=phone,
@@ -2460,6 +2528,7 @@ CRITICAL INSTRUCTIONS:
                 max_tokens=3000,  # Reduced to fit within limits
                 timeout=60
             )
+            record_llm_call('openai', response)
             
             content = response.choices[0].message.content.strip()
             
@@ -2585,23 +2654,8 @@ CRITICAL INSTRUCTIONS:
 
     
     def _deduplicate_candidates(self, new_candidates: List[CandidateProfile], existing_candidates: List[CandidateProfile]) -> List[CandidateProfile]:
-        """Remove duplicate candidates based on name and company."""
-        
-        # Create set of existing candidate signatures
-        existing_signatures = set()
-        for candidate in existing_candidates:
-            signature = f"{candidate.full_name.lower()}_{candidate.current_company.lower() if candidate.current_company else 'unknown'}"
-            existing_signatures.add(signature)
-        
-        # Filter new candidates
-        unique_candidates = []
-        for candidate in new_candidates:
-            signature = f"{candidate.full_name.lower()}_{candidate.current_company.lower() if candidate.current_company else 'unknown'}"
-            if signature not in existing_signatures:
-                unique_candidates.append(candidate)
-                existing_signatures.add(signature)
-        
-        return unique_candidates
+        """Remove duplicate candidates (same id, LinkedIn URL, email, or name and company)."""
+        return CandidatePool(existing_candidates).extend(new_candidates)
     
     def _filter_candidates_by_criteria(self, candidates: List[CandidateProfile], job_data: JobDescription) -> List[CandidateProfile]:
         """Filter candidates based on job criteria."""
@@ -2691,14 +2745,11 @@ CRITICAL INSTRUCTIONS:
         """Enhance rankings with discovery metadata for better tracking."""
         
         enhanced_rankings = []
+        pool = all_candidates if isinstance(all_candidates, CandidatePool) else CandidatePool(all_candidates)
         
         for ranking in rankings:
             # Find the original candidate to get discovery metadata
-            original_candidate = None
-            for candidate in all_candidates:
-                if candidate.candidate_id == ranking.candidate_id:
-                    original_candidate = candidate
-                    break
+            original_candidate = pool.get(ranking.candidate_id)
             
             # Check if this is a discovered candidate
             if original_candidate and hasattr(original_candidate, '_discovery_iteration'):
@@ -2709,24 +2760,9 @@ CRITICAL INSTRUCTIONS:
                 if ' GEMINI 2.5 PRO DISCOVERED CANDIDATE' not in ranking.match_explanation:
                     enhanced_explanation = f" GEMINI 2.5 PRO DISCOVERED CANDIDATE (Iteration {iteration}): {ranking.match_explanation}"
                     
-                    # Create a new ranking with enhanced explanation
-                    enhanced_ranking = CandidateRanking(
-                        candidate_id=ranking.candidate_id,
-                        candidate_name=ranking.candidate_name,
-                        current_title=ranking.current_title,
-                        current_company=ranking.current_company,
-                        linkedin_url=ranking.linkedin_url,
-                        overall_score=ranking.overall_score,
-                        dimension_scores=ranking.dimension_scores,
-                        strengths=ranking.strengths,
-                        concerns=ranking.concerns,
-                        recommendations=ranking.recommendations,
-                        confidence_level=ranking.confidence_level,
-                        match_explanation=enhanced_explanation,
-                        key_differentiators=ranking.key_differentiators,
-                        interview_focus_areas=ranking.interview_focus_areas
-                    )
-                    enhanced_rankings.append(enhanced_ranking)
+                    # Copy with the enhanced explanation; the rest was validated already.
+                    # Trim to match_explanation's max_length since the copy is not re-validated.
+                    enhanced_rankings.append(ranking.model_copy(update={'match_explanation': enhanced_explanation[:1000]}))
                 else:
                     enhanced_rankings.append(ranking)
             else:
@@ -1,11 +1,20 @@
 import logging
 import json
 import time
-from typing import List, Dict, Any, Optional, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator, List, Dict, Any, Optional, Union
 import requests
 
 # Import models
 from src.core.models import CandidateProfile
+from src.core.candidate_pool import CandidatePool
+from src.core.usage import record_api_call, record_llm_call
+from src.modules.candidate_retrieval.search_terms_cache import SearchTermsCache
+
+# Bump when the search-terms prompt or validation changes; cached terms from
+# older versions are then ignored.
+SEARCH_TERMS_PROMPT_VERSION = "1"
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +27,17 @@ class PDLAPIClient:
         self.api_key = self.settings.pdl_api_key
         self.base_url = "https://api.peopledatalabs.com/v5"
         
+        self.search_terms_cache = None
+        if getattr(self.settings, 'search_terms_cache_enabled', False):
+            try:
+                self.search_terms_cache = SearchTermsCache(
+                    self.settings.search_terms_cache_path,
+                    ttl_seconds=self.settings.search_terms_cache_ttl_seconds,
+                    max_entries=self.settings.search_terms_cache_max_entries,
+                )
+            except Exception as e:
+                logger.warning(f"Search terms cache unavailable: {e}")
+        
         # Initialize OpenAI if available
         try:
             if hasattr(self.settings, 'openai_api_key') and self.settings.openai_api_key and self.settings.openai_api_key != "your_openai_api_key_here":
@@ -38,15 +58,33 @@ class PDLAPIClient:
             logger.error(f" OpenAI initialization failed: {e} - this client requires OpenAI for operation")
             raise
     
-    def search_candidates(self, job_description: str, max_candidates: int = 10) -> List[Dict[str, Any]]:
-        """Search for candidates using PDL API with 100% AI-generated terms."""
+    def search_candidates(self, job_description: str, max_candidates: int = 10, concurrent: Optional[bool] = None) -> List[Dict[str, Any]]:
+        """
+        Search for candidates using PDL API with 100% AI-generated terms.
+        With `concurrent` (default: settings.pdl_concurrent_strategies) all
+        strategies are sent at once and merged as they return.
+        """
+        all_candidates = []
+        for page in self.iter_search_pages(job_description, max_candidates, concurrent):
+            all_candidates.extend(page)
+        return all_candidates[:max_candidates]
+    
+    def iter_search_pages(self, job_description: str, max_candidates: int = 10, concurrent: Optional[bool] = None, stop: Optional[threading.Event] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Like search_candidates, but yields each strategy's new unique
+        candidates as soon as its response is in, so callers can start
+        converting and ranking the first page early. Setting `stop` ends the
+        search after the current request.
+        """
+        if concurrent is None:
+            concurrent = getattr(self.settings, 'pdl_concurrent_strategies', False)
         logger.info(f" Starting AI-powered candidate search for: {job_description[:100]}...")
         logger.info(f" Target: {max_candidates} candidates")
         
         # Generate search terms using ONLY AI
         search_terms = self.generate_search_terms(job_description)
         
-        all_candidates = []
+        pool = CandidatePool()
         
         # Search strategies
         search_strategies = [
@@ -55,37 +93,78 @@ class PDLAPIClient:
             ("basic_terms", self._search_basic_terms)
         ]
         
+        if concurrent:
+            for page in self._search_strategies_concurrently(search_strategies, search_terms, max_candidates, pool):
+                yield page
+                if stop is not None and stop.is_set():
+                    break
+            logger.info(f"🎯 Total unique candidates found: {len(pool)}")
+            return
+        
         for strategy_name, strategy_func in search_strategies:
-            if len(all_candidates) >= max_candidates:
+            if len(pool) >= max_candidates or (stop is not None and stop.is_set()):
                 break
                 
             logger.info(f"🔍 Trying {strategy_name} search...")
             try:
-                new_candidates = strategy_func(search_terms, max_candidates - len(all_candidates))
-                
-                # Deduplicate by LinkedIn URL
-                existing_urls = {c.get('linkedin_url') for c in all_candidates if c.get('linkedin_url')}
-                unique_new = [
-                    c for c in new_candidates 
-                    if c.get('linkedin_url') and c.get('linkedin_url') not in existing_urls
-                ]
+                new_candidates = strategy_func(search_terms, max_candidates - len(pool))
                 
-                all_candidates.extend(unique_new)
+                # Deduplicate by id, LinkedIn URL, email and name+company
+                unique_new = pool.extend(c for c in new_candidates if c.get('linkedin_url'))
                 logger.info(f" {strategy_name} added {len(unique_new)} new candidates")
-                
-                if len(all_candidates) >= max_candidates:
-                    break
                     
             except Exception as e:
                 logger.warning(f"⚠️ {strategy_name} search failed: {e}")
                 continue
+            
+            if unique_new:
+                yield unique_new
         
-        logger.info(f"🎯 Total unique candidates found: {len(all_candidates)}")
-        return all_candidates[:max_candidates]
+        logger.info(f"🎯 Total unique candidates found: {len(pool)}")
+    
+    def _search_strategies_concurrently(self, search_strategies: List, search_terms: Dict[str, Any], max_candidates: int, pool: CandidatePool) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Run every strategy in parallel, each asking for `max_candidates`, and
+        merge results into `pool` in arrival order, yielding each strategy's
+        new candidates. Once the pool is full, strategies not yet started are
+        cancelled and the responses of those still in flight are discarded.
+        """
+        executor = ThreadPoolExecutor(max_workers=len(search_strategies))
+        futures = {
+            executor.submit(strategy_func, search_terms, max_candidates): strategy_name
+            for strategy_name, strategy_func in search_strategies
+        }
+        try:
+            for future in as_completed(futures):
+                strategy_name = futures[future]
+                try:
+                    new_candidates = future.result()
+                except Exception as e:
+                    logger.warning(f"⚠️ {strategy_name} search failed: {e}")
+                    continue
+                
+                unique_new = pool.extend(c for c in new_candidates if c.get('linkedin_url'))
+                logger.info(f" {strategy_name} added {len(unique_new)} new candidates")
+                if unique_new:
+                    yield unique_new
+                
+                if len(pool) >= max_candidates:
+                    skipped = [futures[f] for f in futures if not f.done()]
+                    if skipped:
+                        logger.info(f" Target reached; dropping {', '.join(skipped)} search")
+                    break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
     
     def generate_search_terms(self, job_description: str) -> Dict[str, Any]:
         """Generate search terms using ONLY AI - no fallback, no hardcoded elements."""
         
+        if self.search_terms_cache:
+            cached = self.search_terms_cache.get(job_description, SEARCH_TERMS_PROMPT_VERSION)
+            if cached:
+                logger.info(" Using cached AI search terms for this job description")
+                return cached
+        
         if not self.openai_client:
             raise ValueError("OpenAI client is required for pure AI term generation")
         
@@ -94,6 +173,8 @@ class PDLAPIClient:
             try:
                 ai_terms = self._generate_pure_ai_terms(job_description)
                 if ai_terms:
+                    if self.search_terms_cache:
+                        self.search_terms_cache.put(job_description, SEARCH_TERMS_PROMPT_VERSION, ai_terms)
                     return ai_terms
                 logger.warning(f"AI attempt {attempt + 1} failed, retrying...")
             except Exception as e:
@@ -103,6 +184,12 @@ class PDLAPIClient:
         
         raise RuntimeError("Failed to generate terms using AI after 3 attempts")
     
+    def invalidate_search_terms(self, job_description: str) -> None:
+        """Forget cached search terms for a JD, e.g. after it has been edited."""
+        if self.search_terms_cache:
+            removed = self.search_terms_cache.invalidate(job_description)
+            logger.info(f" Invalidated {removed} cached search term entries")
+    
     def _generate_pure_ai_terms(self, job_description: str) -> Optional[Dict[str, Any]]:
         """Generate ALL search terms using OpenAI 4o - completely dynamic, zero hardcoded elements."""
         
@@ -185,6 +272,7 @@ class PDLAPIClient:
                 max_tokens=500,
                 response_format={"type": "json_object"}
             )
+            record_llm_call('openai', response)
             
             content = response.choices[0].message.content.strip()
             terms = json.loads(content)
@@ -375,6 +463,7 @@ class PDLAPIClient:
                 json=query,
                 timeout=30
             )
+            record_api_call('pdl')
             
             if response.status_code == 200:
                 data = response.json()
@@ -417,10 +506,20 @@ class ResearchBasedCandidateConverter:
         
         logger.info(f" Converting {len(pdl_data)} PDL candidates...")
         
-        converted_candidates = []
-        conversion_errors = 0
+        return list(ResearchBasedCandidateConverter.iter_convert_pdl_data(pdl_data))
+    
+    @staticmethod
+    def iter_convert_pdl_data(pdl_data: Iterable[Any], stats: Optional[Dict[str, int]] = None) -> Iterator[CandidateProfile]:
+        """
+        Convert PDL records lazily, one at a time, so a stream of records can
+        be converted as it arrives without holding every raw record.
+        `stats`, if given, receives 'total', 'converted' and 'errors' counts.
+        """
+        stats = stats if stats is not None else {}
+        stats.update(total=0, converted=0, errors=0)
         
         for i, candidate_data in enumerate(pdl_data):
+            stats['total'] += 1
             try:
                 # Handle different data formats
                 if isinstance(candidate_data, str):
@@ -428,30 +527,29 @@ class ResearchBasedCandidateConverter:
                         candidate_data = json.loads(candidate_data)
                     except json.JSONDecodeError:
                         logger.warning(f"Candidate {i+1}: Invalid JSON string")
-                        conversion_errors += 1
+                        stats['errors'] += 1
                         continue
                 
                 if not isinstance(candidate_data, dict):
                     logger.warning(f"Candidate {i+1}: Expected dict, got {type(candidate_data)}")
-                    conversion_errors += 1
+                    stats['errors'] += 1
                     continue
                 
                 # Convert single candidate
                 candidate = ResearchBasedCandidateConverter._convert_single_candidate(candidate_data)
-                if candidate:
-                    converted_candidates.append(candidate)
-                else:
-                    conversion_errors += 1
-                    
             except Exception as e:
                 logger.warning(f"Failed to convert candidate {i+1}: {e}")
-                conversion_errors += 1
+                stats['errors'] += 1
                 continue
+            
+            if candidate:
+                stats['converted'] += 1
+                yield candidate
+            else:
+                stats['errors'] += 1
         
-        success_rate = (len(converted_candidates) / len(pdl_data)) * 100 if pdl_data else 0
-        logger.info(f" Successfully converted {len(converted_candidates)} out of {len(pdl_data)} candidates ({success_rate:.1f}%)")
-        
-        return converted_candidates
+        success_rate = (stats['converted'] / stats['total']) * 100 if stats['total'] else 0
+        logger.info(f" Successfully converted {stats['converted']} out of {stats['total']} candidates ({success_rate:.1f}%)")
     
     @staticmethod
     def _convert_single_candidate(person_data: Dict[str, Any]) -> Optional[CandidateProfile]:
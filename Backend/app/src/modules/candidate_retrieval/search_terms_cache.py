@@ -0,0 +1,111 @@
+"""
+Persistent cache for AI-generated PDL search terms.
+
+Entries are keyed by a hash of the normalized job description plus the
+prompt version, so an unchanged JD skips the OpenAI calls in
+PDLAPIClient.generate_search_terms, and changing the prompt retires old
+entries automatically. Only terms that passed _validate_pure_ai_terms are
+stored. Backed by a small SQLite file; entries expire after a TTL and the
+least recently used ones are evicted past a size limit.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def jd_hash(job_description: str) -> str:
+    """Hash of the JD with case and whitespace differences removed."""
+    normalized = _WHITESPACE.sub(" ", (job_description or "").lower()).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class SearchTermsCache:
+    """SQLite-backed search terms cache with TTL and LRU size limit."""
+
+    def __init__(self, path: str, ttl_seconds: int = 7 * 24 * 3600, max_entries: int = 1000):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS search_terms (
+                    jd_hash TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    terms TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    PRIMARY KEY (jd_hash, prompt_version)
+                )
+                """
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    def get(self, job_description: str, prompt_version: str) -> Optional[Dict[str, Any]]:
+        key = (jd_hash(job_description), prompt_version)
+        now = time.time()
+        try:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute(
+                    "SELECT terms, created_at FROM search_terms WHERE jd_hash = ? AND prompt_version = ?", key
+                ).fetchone()
+                if row is None:
+                    return None
+                if now - row[1] > self.ttl_seconds:
+                    conn.execute("DELETE FROM search_terms WHERE jd_hash = ? AND prompt_version = ?", key)
+                    return None
+                conn.execute(
+                    "UPDATE search_terms SET last_used = ? WHERE jd_hash = ? AND prompt_version = ?", (now, *key)
+                )
+                return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Search terms cache read failed: {e}")
+            return None
+
+    def put(self, job_description: str, prompt_version: str, terms: Dict[str, Any]) -> None:
+        now = time.time()
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO search_terms VALUES (?, ?, ?, ?, ?)",
+                    (jd_hash(job_description), prompt_version, json.dumps(terms), now, now),
+                )
+                conn.execute("DELETE FROM search_terms WHERE created_at < ?", (now - self.ttl_seconds,))
+                conn.execute(
+                    """
+                    DELETE FROM search_terms WHERE rowid NOT IN (
+                        SELECT rowid FROM search_terms ORDER BY last_used DESC LIMIT ?
+                    )
+                    """,
+                    (self.max_entries,),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Search terms cache write failed: {e}")
+
+    def invalidate(self, job_description: str) -> int:
+        """Drop every cached entry for this JD (all prompt versions). Returns rows removed."""
+        try:
+            with closing(self._connect()) as conn, conn:
+                cursor = conn.execute("DELETE FROM search_terms WHERE jd_hash = ?", (jd_hash(job_description),))
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"Search terms cache invalidation failed: {e}")
+            return 0
+
+    def clear(self) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM search_terms")
@@ -14,6 +14,7 @@ from pathlib import Path
 
 from src.core.models import JobDescription, Location, ExperienceYears, ExperienceLevel, EmploymentType, CompanySize
 from src.config.settings import get_settings, get_logger
+from src.core.usage import record_llm_call
 
 logger = get_logger()
 
@@ -197,6 +198,7 @@ class JobDescriptionParser:
         response.raise_for_status()
         
         result = response.json()
+        record_llm_call('openai', result)
         content = result['choices'][0]['message']['content'].strip()
         
         # Clean up JSON response
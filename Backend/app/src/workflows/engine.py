@@ -0,0 +1,187 @@
+"""
+Async execution engine for workflow steps.
+
+Steps declare `required_inputs` and `outputs`; the engine treats those as a
+DAG and starts every step whose inputs are available, so independent steps
+run concurrently. A step may also publish an output before it finishes by
+handing downstream steps a StreamChannel, which lets e.g. ranking start on
+the first page of candidates while later pages are still being fetched.
+
+Each step runs under its own timeout. When a critical step fails, every
+other running step is cancelled.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Set
+
+from src.config.settings import get_logger
+
+logger = get_logger()
+
+# handler(state, publish) -> None; publish(output_name) marks an output available early
+StepHandler = Callable[[Dict[str, Any], Callable[[str], None]], Awaitable[None]]
+
+
+class WorkflowStepError(Exception):
+    """Raised when a critical step fails; carries the step name."""
+
+    def __init__(self, step_name: str, message: str):
+        super().__init__(f"Critical step failed: {step_name} - {message}")
+        self.step_name = step_name
+
+
+class StreamChannel:
+    """
+    Append-only stream of items produced by one step and read by others.
+    Every reader sees all items from the start, in batches as they arrive.
+    Must be fed from the event loop thread (see pump_batches for threads).
+    """
+
+    def __init__(self):
+        self.items: List[Any] = []
+        self.closed = False
+        self.error: Optional[BaseException] = None
+        self._changed = asyncio.Event()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    def put_many(self, items: Iterable[Any]) -> None:
+        if self.closed:
+            return
+        self.items.extend(items)
+        self._notify()
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.error = error
+        self._notify()
+
+    async def batches(self):
+        """Yield lists of new items until the channel is closed."""
+        position = 0
+        while True:
+            changed = self._changed
+            if position < len(self.items):
+                batch = self.items[position:]
+                position = len(self.items)
+                yield batch
+                continue
+            if self.closed:
+                if self.error is not None:
+                    raise self.error
+                return
+            await changed.wait()
+
+
+async def pump_batches(batches: Callable[[threading.Event], Iterator[List[Any]]], channel: StreamChannel) -> None:
+    """
+    Run a blocking batch generator in a worker thread, forwarding each batch
+    into `channel`. The generator receives a stop event that is set when this
+    coroutine is cancelled, so it can stop between batches.
+    """
+    loop = asyncio.get_running_loop()
+    stop = threading.Event()
+
+    def drain():
+        for batch in batches(stop):
+            if stop.is_set():
+                break
+            loop.call_soon_threadsafe(channel.put_many, batch)
+
+    try:
+        await asyncio.to_thread(drain)
+    finally:
+        stop.set()
+
+
+async def run_steps(
+    steps: List[Any],
+    handlers: Dict[str, StepHandler],
+    state: Dict[str, Any],
+    critical_steps: Iterable[str] = (),
+    default_timeout: Optional[float] = None,
+) -> None:
+    """
+    Run `steps` (WorkflowStep objects) as a DAG over `state`. Step status,
+    timing and errors are recorded on the step objects and in state["errors"].
+    Raises WorkflowStepError if a step in `critical_steps` fails.
+    """
+    critical = set(critical_steps)
+    available: Set[str] = {key for key, value in state.items() if value is not None}
+    pending = list(steps)
+    running: Dict[asyncio.Task, Any] = {}
+    wake = asyncio.Event()
+
+    def publish(name: str) -> None:
+        if name not in available:
+            available.add(name)
+            wake.set()
+
+    async def execute(step) -> None:
+        step.start_time = time.time()
+        timeout = step.timeout_seconds if step.timeout_seconds is not None else default_timeout
+        logger.info(f"Executing step: {step.name}")
+        try:
+            await asyncio.wait_for(handlers[step.name](state, publish), timeout)
+            step.success = True
+            for output in step.outputs:
+                publish(output)
+            logger.info(f"Step {step.name} completed successfully")
+        except asyncio.TimeoutError:
+            step.error_message = f"timed out after {timeout}s"
+            raise
+        except asyncio.CancelledError:
+            step.error_message = step.error_message or "cancelled"
+            raise
+        except Exception as e:
+            step.error_message = str(e)
+            raise
+        finally:
+            step.end_time = time.time()
+            logger.debug(f"Step {step.name} took {step.end_time - step.start_time:.2f} seconds")
+
+    async def cancel_running() -> None:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        running.clear()
+
+    try:
+        while pending or running:
+            for step in [s for s in pending if all(name in available for name in s.required_inputs)]:
+                pending.remove(step)
+                state["current_step"] = step.name
+                running[asyncio.create_task(execute(step), name=step.name)] = step
+
+            if not running:
+                for step in pending:
+                    missing = [name for name in step.required_inputs if name not in available]
+                    step.error_message = f"inputs never became available: {', '.join(missing)}"
+                    state["errors"].append(f"{step.name}: {step.error_message}")
+                    if step.name in critical:
+                        raise WorkflowStepError(step.name, step.error_message)
+                break
+
+            wake.clear()
+            wake_task = asyncio.create_task(wake.wait())
+            done, _ = await asyncio.wait([*running, wake_task], return_when=asyncio.FIRST_COMPLETED)
+            wake_task.cancel()
+
+            for task in [t for t in done if t in running]:
+                step = running.pop(task)
+                if task.cancelled() or task.exception() is None:
+                    continue
+                step.success = False
+                state["errors"].append(f"{step.name}: {step.error_message}")
+                logger.error(f"Step {step.name} failed: {step.error_message}")
+                if step.name in critical:
+                    raise WorkflowStepError(step.name, step.error_message)
+    finally:
+        # Critical failure, or the whole run was cancelled from outside
+        await cancel_running()
@@ -3,6 +3,9 @@ This module orchestrates the complete recruitment workflow
 for state management and workflow coordination.
 """
 
+import asyncio
+import heapq
+import sqlite3
 import time
 from datetime import datetime
 from typing import Dict, List, Optional, Any, TypedDict
@@ -12,10 +15,18 @@ from src.core.models import (
     JobDescription, CandidateProfile, CandidateRanking, 
     SearchMetadata, WorkflowResult
 )
+from src.core.usage import usage_counter
 from src.modules.jd_parser.parser import JobDescriptionParser
 from src.modules.candidate_retrieval.client import PDLAPIClient, CandidateConverter
 from src.modules.candidate_ranking.ranker import CandidateRanker
 from src.config.settings import get_settings, get_logger
+from src.workflows.engine import StreamChannel, WorkflowStepError, pump_batches, run_steps
+
+try:
+    from app.services.workflow_metrics_store import WorkflowMetricsStore
+except ImportError:
+    # CLI runs with Backend/app as the import root
+    from services.workflow_metrics_store import WorkflowMetricsStore
 
 logger = get_logger()
 
@@ -49,12 +60,19 @@ class WorkflowStep:
     description: str
     required_inputs: List[str]
     outputs: List[str]
+    # Async engine only; None uses settings.workflow_step_timeout_seconds
+    timeout_seconds: Optional[float] = None
     
     def __post_init__(self):
+        self.reset()
+    
+    def reset(self):
         self.start_time: Optional[float] = None
         self.end_time: Optional[float] = None
         self.success: bool = False
         self.error_message: Optional[str] = None
+        # Candidates coming out of this step, filled in at the end of the run
+        self.candidates: Optional[int] = None
 
 
 class RecruitmentWorkflow:
@@ -69,6 +87,8 @@ class RecruitmentWorkflow:
         self.pdl_client = PDLAPIClient()
         self.candidate_converter = CandidateConverter()
         self.candidate_ranker = CandidateRanker()
+        # LLM/API call counts of the last run (see src.core.usage)
+        self.last_run_usage: Dict[str, int] = {}
         
         # Define workflow steps
         self.workflow_steps = [
@@ -81,7 +101,8 @@ class RecruitmentWorkflow:
             WorkflowStep(
                 name="search_candidates",
                 description="Search for candidates using PDL API",
-                required_inputs=["parsed_job", "max_candidates"],
+                # Searches on the raw JD text, so it can overlap JD parsing
+                required_inputs=["job_description_text", "max_candidates"],
                 outputs=["raw_candidates"]
             ),
             WorkflowStep(
@@ -122,6 +143,9 @@ class RecruitmentWorkflow:
             warnings=[],
             workflow_result=None
         )
+        state["usage_start"] = usage_counter.snapshot()
+        for step in self.workflow_steps:
+            step.reset()
         
         try:
             # Execute workflow steps
@@ -143,6 +167,21 @@ class RecruitmentWorkflow:
             logger.error(f"Workflow failed: {e}")
             # Create error result
             return self._create_error_result(state, str(e))
+        finally:
+            self._finish_run(state)
+    
+    def _finish_run(self, state: WorkflowState) -> None:
+        """Record candidates per stage and the run's LLM/API usage for WorkflowMonitor."""
+        raw = state.get("raw_candidates")
+        counts = {
+            "search_candidates": state.get("raw_candidates_found", len(raw) if isinstance(raw, list) else 0),
+            "convert_candidates": len(state["candidate_profiles"] or []),
+            "rank_candidates": len(state["candidate_rankings"] or []),
+        }
+        for step in self.workflow_steps:
+            if step.start_time is not None and step.name in counts:
+                step.candidates = counts[step.name]
+        self.last_run_usage = usage_counter.since(state["usage_start"])
     
     def _execute_step(self, step: WorkflowStep, state: WorkflowState) -> WorkflowState:
         """Execute a single workflow step."""
@@ -241,12 +280,12 @@ class RecruitmentWorkflow:
                 
                 logger.info(f"🔍 Calling PDL API for 1 candidate with job description: {search_text[:100]}...")
                 
-                raw_candidates = self.pdl_client.search_candidates(
-                    search_text, 
+                # Lazy: records are fetched page by page as conversion pulls them
+                state["raw_candidates"] = self._iter_raw_candidates(
+                    state,
+                    search_text,
                     state["max_candidates"] # This will always be 1 at this point
                 )
-                state["raw_candidates"] = raw_candidates
-                logger.info(f"Found {len(raw_candidates)} raw candidates from PDL.")
             
             else:
                 # If we ARE in discovery mode, we do not call PDL at all.
@@ -262,53 +301,62 @@ class RecruitmentWorkflow:
         
         return state
     
-    def _convert_candidates(self, state: WorkflowState) -> WorkflowState:
-        """Convert candidates step."""
+    def _iter_raw_candidates(self, state: WorkflowState, search_text: str, max_candidates: int):
+        """Yield raw PDL records page by page; search errors become warnings, as before."""
+        found = 0
         try:
-            candidate_profiles = []
-            conversion_errors = 0
-            
-            for raw_candidate in state["raw_candidates"]:
-                try:
-                    profile = self.candidate_converter.convert_to_candidate_profile(raw_candidate)
-                    if profile:
-                        candidate_profiles.append(profile)
-                    else:
-                        conversion_errors += 1
-                except Exception as e:
-                    conversion_errors += 1
-                    logger.warning(f"Failed to convert candidate: {e}")
-            
-            state["candidate_profiles"] = candidate_profiles
-            
-            if conversion_errors > 0:
-                warning_msg = f"Failed to convert {conversion_errors} candidates"
-                if "warnings" not in state:
-                    state["warnings"] = []
-                state["warnings"].append(warning_msg)
-                logger.warning(warning_msg)
-            
-            logger.info(f"Successfully converted {len(candidate_profiles)} candidates")
-            
+            for page in self.pdl_client.iter_search_pages(search_text, max_candidates):
+                for raw_candidate in page[:max_candidates - found]:
+                    found += 1
+                    yield raw_candidate
+                if found >= max_candidates:
+                    break
         except Exception as e:
-            logger.error(f"Candidate conversion failed: {e}")
-            raise
-        
+            logger.error(f"Candidate search failed: {e}")
+            if "warnings" not in state:
+                state["warnings"] = []
+            state["warnings"].append(f"Candidate search failed: {str(e)}")
+        state["raw_candidates_found"] = found
+        logger.info(f"Found {found} raw candidates from PDL.")
+    
+    def _convert_candidates(self, state: WorkflowState) -> WorkflowState:
+        """
+        Convert candidates step. Sets up a lazy conversion stream that the
+        ranking step pulls from; converted profiles are collected into
+        state["candidate_profiles"] as they pass through, raw records are not kept.
+        """
+        candidate_profiles = []
+        state["candidate_profiles"] = candidate_profiles
+        state["profile_stream"] = self._iter_profiles(state, candidate_profiles)
         return state
     
+    def _iter_profiles(self, state: WorkflowState, candidate_profiles: List[CandidateProfile]):
+        stats = {}
+        for profile in self.candidate_converter.iter_convert_pdl_data(state["raw_candidates"], stats):
+            candidate_profiles.append(profile)
+            yield profile
+        
+        if stats["errors"] > 0:
+            warning_msg = f"Failed to convert {stats['errors']} candidates"
+            if "warnings" not in state:
+                state["warnings"] = []
+            state["warnings"].append(warning_msg)
+            logger.warning(warning_msg)
+        
+        logger.info(f"Successfully converted {len(candidate_profiles)} candidates")
+    
     def _rank_candidates(self, state: WorkflowState) -> WorkflowState:
-        """Rank candidates step."""
+        """Rank candidates step: ranks each batch as soon as the conversion stream fills it."""
+        stream = state.pop("profile_stream", None) or iter(state["candidate_profiles"])
+        candidate_rankings: List[CandidateRanking] = []
         try:
-            if not state["candidate_profiles"]:
-                logger.warning("No candidates to rank")
-                state["candidate_rankings"] = []
-                return state
-            
-            candidate_rankings = self.candidate_ranker.rank_candidates(
-                state["parsed_job"],
-                state["candidate_profiles"]
-            )
+            for batch_rankings in self.candidate_ranker.iter_rank_batches(state["parsed_job"], stream):
+                candidate_rankings = list(heapq.merge(
+                    candidate_rankings, batch_rankings, key=lambda r: r.overall_score, reverse=True
+                ))
             state["candidate_rankings"] = candidate_rankings
+            if not candidate_rankings:
+                logger.warning("No candidates to rank")
             logger.info(f"Successfully ranked {len(candidate_rankings)} candidates")
             
         except Exception as e:
@@ -319,6 +367,11 @@ class RecruitmentWorkflow:
             state["warnings"].append(f"Ranking failed: {str(e)}")
             state["candidate_rankings"] = []
         
+        finally:
+            # Finish the stream so every converted profile reaches the result
+            for _ in stream:
+                pass
+        
         return state
     
     def _finalize_results(self, state: WorkflowState) -> WorkflowState:
@@ -334,7 +387,7 @@ class RecruitmentWorkflow:
                 timestamp=datetime.now(),
                 workflow_version=self.settings.workflow_version,
                 search_queries_used=[],  # Could be populated from PDL client
-                api_calls_made=0  # Could be tracked
+                api_calls_made=self._api_calls_since(state)
             )
             
             # Create final result
@@ -354,6 +407,10 @@ class RecruitmentWorkflow:
         
         return state
     
+    def _api_calls_since(self, state: WorkflowState) -> int:
+        usage = usage_counter.since(state.get("usage_start", {}))
+        return usage.get("llm_calls", 0) + usage.get("api_calls", 0)
+    
     def _create_error_result(self, state: WorkflowState, error_message: str) -> WorkflowResult:
         """Create an error result when workflow fails."""
         total_time = time.time() - state["start_time"]
@@ -447,54 +504,231 @@ class RecruitmentWorkflow:
         
         return validation_result
     
-    def run_workflow_async(self, job_description_text: str, max_candidates: int = 10):
-        """Placeholder for async workflow execution (would require asyncio implementation)."""
-        # This would be implemented with proper async/await patterns
-        # For now, we'll just call the sync version
-        logger.info("Async workflow not implemented, falling back to sync execution")
-        return self.run_workflow(job_description_text, max_candidates)
+    async def run_workflow_async(self, job_description_text: str, max_candidates: int = 10, with_discovery: bool = False) -> WorkflowResult:
+        """
+        Run the workflow on the async step engine. Steps start as soon as their
+        declared inputs exist, so the PDL search overlaps JD parsing, and
+        candidates are converted and ranked page by page while later PDL
+        pages are still being fetched. Each step has its own timeout.
+        """
+        logger.info("Starting async recruitment workflow...")
+        
+        state = WorkflowState(
+            job_description_text=job_description_text,
+            max_candidates=max_candidates,
+            parsed_job=None,
+            raw_candidates=None,
+            candidate_profiles=None,
+            candidate_rankings=None,
+            start_time=time.time(),
+            current_step="initialization",
+            errors=[],
+            warnings=[],
+            workflow_result=None
+        )
+        state["with_discovery"] = with_discovery
+        state["usage_start"] = usage_counter.snapshot()
+        for step in self.workflow_steps:
+            step.reset()
+        
+        # Streamed outputs, read by downstream steps while still being produced
+        streams = {"raw_candidates": StreamChannel(), "candidate_profiles": StreamChannel()}
+        handlers = {
+            "parse_job_description": self._parse_job_description_async,
+            "search_candidates": lambda state, publish: self._search_candidates_async(state, publish, streams),
+            "convert_candidates": lambda state, publish: self._convert_candidates_async(state, publish, streams),
+            "rank_candidates": lambda state, publish: self._rank_candidates_async(state, publish, streams),
+            "finalize_results": self._finalize_results_async,
+        }
+        
+        try:
+            await run_steps(
+                self.workflow_steps,
+                handlers,
+                state,
+                critical_steps=["parse_job_description", "search_candidates"],
+                default_timeout=getattr(self.settings, 'workflow_step_timeout_seconds', None),
+            )
+            if state["workflow_result"]:
+                logger.info("Async workflow completed successfully")
+                return state["workflow_result"]
+            raise Exception("Workflow completed but no result generated")
+        except Exception as e:
+            logger.error(f"Async workflow failed: {e}")
+            return self._create_error_result(state, str(e))
+        finally:
+            for channel in streams.values():
+                channel.close(WorkflowStepError("workflow", "stopped"))
+            self._finish_run(state)
+    
+    async def _parse_job_description_async(self, state: WorkflowState, publish) -> None:
+        await asyncio.to_thread(self._parse_job_description, state)
+    
+    async def _search_candidates_async(self, state: WorkflowState, publish, streams: Dict[str, StreamChannel]) -> None:
+        """Publish raw candidates page by page; same safety net as _search_candidates."""
+        channel = streams["raw_candidates"]
+        publish("raw_candidates")
+        error = None
+        try:
+            if state.get("with_discovery", False):
+                logger.info("Discovery mode is active. Skipping new PDL search.")
+            elif state["max_candidates"] > 1:
+                error_message = f"SAFETY_NET: Aborted PDL search. A request was made for {state['max_candidates']} candidates, but the strict limit is 1."
+                logger.error(error_message)
+                state["warnings"].append(error_message)
+            else:
+                search_text = str(state["job_description_text"])
+                logger.info(f"🔍 Calling PDL API for 1 candidate with job description: {search_text[:100]}...")
+                await pump_batches(
+                    lambda stop: self.pdl_client.iter_search_pages(search_text, state["max_candidates"], stop=stop),
+                    channel,
+                )
+        except Exception as e:
+            # Non-fatal, as in the sync step: continue with no candidates
+            logger.error(f"Candidate search failed: {e}")
+            state["warnings"].append(f"Candidate search failed: {str(e)}")
+        except BaseException:
+            # Cancelled or timed out: let readers fail instead of waiting forever
+            error = WorkflowStepError("search_candidates", "stopped before finishing")
+            raise
+        finally:
+            channel.close(error)
+            state["raw_candidates"] = channel.items[:state["max_candidates"]]
+            logger.info(f"Found {len(state['raw_candidates'])} raw candidates from PDL.")
+    
+    async def _convert_candidates_async(self, state: WorkflowState, publish, streams: Dict[str, StreamChannel]) -> None:
+        profiles = streams["candidate_profiles"]
+        publish("candidate_profiles")
+        error = None
+        conversion_errors = 0
+        converted = 0
+        try:
+            async for page in streams["raw_candidates"].batches():
+                page = page[:max(0, state["max_candidates"] - converted)]
+                batch = []
+                for raw_candidate in page:
+                    converted += 1
+                    try:
+                        profile = self.candidate_converter.convert_to_candidate_profile(raw_candidate)
+                    except Exception as e:
+                        logger.warning(f"Failed to convert candidate: {e}")
+                        profile = None
+                    if profile:
+                        batch.append(profile)
+                    else:
+                        conversion_errors += 1
+                profiles.put_many(batch)
+        except BaseException as e:
+            error = e if isinstance(e, WorkflowStepError) else WorkflowStepError("convert_candidates", "stopped before finishing")
+            raise
+        finally:
+            profiles.close(error)
+            state["candidate_profiles"] = list(profiles.items)
+        
+        if conversion_errors > 0:
+            warning_msg = f"Failed to convert {conversion_errors} candidates"
+            state["warnings"].append(warning_msg)
+            logger.warning(warning_msg)
+        logger.info(f"Successfully converted {len(profiles.items)} candidates")
+    
+    async def _rank_candidates_async(self, state: WorkflowState, publish, streams: Dict[str, StreamChannel]) -> None:
+        """Rank each page of profiles as it arrives and merge into one sorted list."""
+        rankings: List[CandidateRanking] = []
+        try:
+            async for batch in streams["candidate_profiles"].batches():
+                ranked = await asyncio.to_thread(self.candidate_ranker.rank_candidates, state["parsed_job"], batch)
+                rankings = list(heapq.merge(rankings, ranked, key=lambda r: r.overall_score, reverse=True))
+        except (asyncio.CancelledError, WorkflowStepError):
+            raise
+        except Exception as e:
+            logger.error(f"Candidate ranking failed: {e}")
+            # Don't raise - we can continue with unranked candidates
+            state["warnings"].append(f"Ranking failed: {str(e)}")
+            rankings = []
+        state["candidate_rankings"] = rankings
+        if not rankings:
+            logger.warning("No candidates to rank")
+        logger.info(f"Successfully ranked {len(rankings)} candidates")
+    
+    async def _finalize_results_async(self, state: WorkflowState, publish) -> None:
+        self._finalize_results(state)
 
 
 class WorkflowMonitor:
-    """Monitor and track workflow execution metrics."""
+    """
+    Records workflow runs in the persistent metrics store (step durations,
+    candidates per stage, LLM/API usage) and reads rolling stats back from it.
+    """
     
-    def __init__(self):
-        self.execution_history: List[Dict[str, Any]] = []
+    def __init__(self, store: Optional[WorkflowMetricsStore] = None):
+        self._store = store
     
-    def record_execution(self, workflow_result: WorkflowResult, execution_time: float):
+    @property
+    def store(self) -> Optional[WorkflowMetricsStore]:
+        """Opened on first use; None when metrics are disabled or the file can't be opened."""
+        if self._store is None:
+            settings = get_settings()
+            if not settings.workflow_metrics_enabled:
+                return None
+            try:
+                self._store = WorkflowMetricsStore(settings.workflow_metrics_db, settings.workflow_metrics_retention_days)
+            except (sqlite3.Error, OSError) as e:
+                logger.warning(f"Workflow metrics store unavailable: {e}")
+                return None
+        return self._store
+    
+    def record_execution(self, workflow_result: WorkflowResult, execution_time: float,
+                         steps: Optional[List[WorkflowStep]] = None, usage: Optional[Dict[str, int]] = None):
         """Record a workflow execution for monitoring."""
-        execution_record = {
-            'timestamp': datetime.now().isoformat(),
-            'job_title': workflow_result.job_data.title,
-            'candidates_found': workflow_result.metadata.candidates_found,
-            'candidates_ranked': workflow_result.metadata.candidates_ranked,
-            'execution_time': execution_time,
-            'success': len(workflow_result.candidates) > 0
-        }
-        
-        self.execution_history.append(execution_record)
+        store = self.store
+        if store is None:
+            return
         
-        # Keep only last 100 executions
-        if len(self.execution_history) > 100:
-            self.execution_history = self.execution_history[-100:]
+        step_records = [
+            {
+                'name': step.name,
+                'duration': step.end_time - step.start_time if step.end_time is not None else None,
+                'success': step.success,
+                'candidates': step.candidates,
+                'error': step.error_message,
+            }
+            for step in steps or []
+            if step.start_time is not None
+        ]
+        try:
+            store.record_run(
+                execution_time=execution_time,
+                success=len(workflow_result.candidates) > 0,
+                job_title=workflow_result.job_data.title,
+                candidates_found=workflow_result.metadata.candidates_found,
+                candidates_ranked=workflow_result.metadata.candidates_ranked,
+                steps=step_records,
+                usage=usage,
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to record workflow metrics: {e}")
     
-    def get_performance_metrics(self) -> Dict[str, Any]:
-        """Get performance metrics from execution history."""
-        if not self.execution_history:
+    def get_status(self, recent: int = 10) -> Dict[str, Any]:
+        """Run totals over the retention period plus the latest runs."""
+        store = self.store
+        if store is None:
+            return {'total_executions': 0, 'success_rate': 0.0, 'average_execution_time': None, 'recent_executions': []}
+        return {**store.totals(), 'recent_executions': store.recent_runs(recent)}
+    
+    def get_performance_metrics(self, window_hours: int = 24) -> Dict[str, Any]:
+        """Totals and rolling percentiles per metric over the last `window_hours`."""
+        store = self.store
+        window_seconds = window_hours * 3600
+        totals = store.totals(window_seconds) if store else {'total_executions': 0}
+        if not totals['total_executions']:
             return {'message': 'No execution history available'}
         
-        successful_executions = [e for e in self.execution_history if e['success']]
-        
-        metrics = {
-            'total_executions': len(self.execution_history),
-            'successful_executions': len(successful_executions),
-            'success_rate': len(successful_executions) / len(self.execution_history),
-            'average_execution_time': sum(e['execution_time'] for e in self.execution_history) / len(self.execution_history),
-            'average_candidates_found': sum(e['candidates_found'] for e in self.execution_history) / len(self.execution_history),
-            'recent_performance': self.execution_history[-10:] if len(self.execution_history) >= 10 else self.execution_history
+        return {
+            **totals,
+            'window_hours': window_hours,
+            'metrics': store.summary(window_seconds),
+            'recent_performance': store.recent_runs(10),
         }
-        
-        return metrics
 
 
 # Global workflow monitor instance
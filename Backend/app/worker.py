@@ -19,14 +19,64 @@ celery_app = Celery(
     backend="redis://redis:6379/0"
 )
 
+# Task results are small manifests (see _ranking_manifest); ranked rows live in
+# Postgres and are paged by the results endpoints. Expire result keys so Redis
+# does not grow with every run, and compress whatever does get stored.
+celery_app.conf.update(
+    result_expires=int(os.getenv("CELERY_RESULT_EXPIRES_SEC", "86400")),
+    result_compression="zlib",
+)
+
 
-@celery_app.task
-def apollo_search_task(jd_id: str, custom_prompt: str, user_id: str, search_mode: str):
+def _ranking_manifest(supabase, table: str, jd_id: str, source: str) -> dict:
+    """
+    Build the task result for a finished ranking run: counts and identifiers only.
+    The candidates themselves are read back from `table` by the results endpoint.
+    """
+    logger = logging.getLogger(__name__)
+    ranked_count = None
+    try:
+        resp = supabase.table(table).select("rank_id", count="exact").eq("jd_id", jd_id).limit(1).execute()
+        ranked_count = getattr(resp, "count", None)
+    except Exception:
+        logger.exception("Failed to count ranked rows in %s for JD %s", table, jd_id)
+
+    return {
+        "status": "completed",
+        "jd_id": jd_id,
+        "source": source,
+        "ranked_count": ranked_count,
+    }
+
+
+def _task_owner_key(task_id: str) -> str:
+    return f"task-owner-{task_id}"
+
+
+def register_task_owner(task_id: str, user_id: str) -> None:
+    """
+    Record who started a task. Celery reports unknown ids as PENDING, so the
+    polling endpoints use this key to tell a queued job from an unknown one.
+    Stored in the result backend and expires with the task results.
+    """
+    celery_app.backend.set(_task_owner_key(task_id), str(user_id))
+
+
+def get_task_owner(task_id: str):
+    """User id that started `task_id`, or None for unknown/expired tasks."""
+    owner = celery_app.backend.get(_task_owner_key(task_id))
+    if isinstance(owner, bytes):
+        owner = owner.decode()
+    return owner
+
+
+@celery_app.task(bind=True)
+def apollo_search_task(self, jd_id: str, custom_prompt: str, user_id: str, search_mode: str):
     """
     Celery task to run the EnhancedDeepResearchAgent in the requested search_mode.
     After the search completes and candidates are saved to the 'search' table,
     this task will run the ProfileRanker to rank those saved profiles and return
-    the ranked candidates as the task result.
+    a manifest (jd_id, counts); the ranked rows stay in Postgres.
 
     Parameters:
       - jd_id: job description id
@@ -57,25 +107,16 @@ def apollo_search_task(jd_id: str, custom_prompt: str, user_id: str, search_mode
         asyncio.run(ranker_agent.run_ranking_for_api(jd_id=jd_id))
         logger.info("Apollo task - Step 2 Complete: Ranking finished.")
 
-        # Step 3: Fetch the final ranked candidates via RPC
-        logger.info("Apollo task - Step 3: Fetching final ranked candidates...")
-        rpc_params = {'jd_id_param': jd_id}
-        try:
-            ranked_response = ranker_agent.supabase.rpc('get_ranked_candidates_with_details', rpc_params).execute()
-            final_results = ranked_response.data if getattr(ranked_response, 'data', None) else []
-        except Exception as e:
-            logger.exception("Failed to fetch ranked candidates via RPC; returning empty results.")
-            final_results = []
-
-        logger.info(f"Apollo task: pipeline finished. Found {len(final_results)} ranked candidates.")
-        return {"status": "completed", "result": final_results}
+        manifest = _ranking_manifest(ranker_agent.supabase, "ranked_candidates", jd_id, "ranked_candidates")
+        logger.info(f"Apollo task: pipeline finished. {manifest['ranked_count']} ranked candidates for JD {jd_id}.")
+        return manifest
     except Exception as e:
         logger.exception(f"An error occurred in apollo_search_task: {e}")
         return {"status": "failed", "error": str(e)}
 
 
-@celery_app.task
-def search_and_rank_pipeline_task(jd_id: str, custom_prompt: str, user_id: str):
+@celery_app.task(bind=True)
+def search_and_rank_pipeline_task(self, jd_id: str, custom_prompt: str, user_id: str):
     """
     Legacy compatibility task: full search + ranking pipeline.
     Uses the new EnhancedDeepResearchAgent but hardcodes search_mode to APOLLO_ONLY
@@ -98,24 +139,20 @@ def search_and_rank_pipeline_task(jd_id: str, custom_prompt: str, user_id: str):
         asyncio.run(ranker_agent.run_ranking_for_api(jd_id=jd_id))
         logger.info("Worker - Step 2 Complete: Ranking finished.")
 
-        logger.info("Worker - Step 3: Fetching final ranked candidates...")
-        rpc_params = {'jd_id_param': jd_id}
-        ranked_response = ranker_agent.supabase.rpc('get_ranked_candidates_with_details', rpc_params).execute()
-        final_results = ranked_response.data if ranked_response.data else []
-
-        logger.info(f"Celery worker: Pipeline finished. Found {len(final_results)} ranked candidates.")
-        return {"status": "completed", "result": final_results}
+        manifest = _ranking_manifest(ranker_agent.supabase, "ranked_candidates", jd_id, "ranked_candidates")
+        logger.info(f"Celery worker: Pipeline finished. {manifest['ranked_count']} ranked candidates for JD {jd_id}.")
+        return manifest
     except Exception as e:
         logger.exception(f"An error occurred in search_and_rank_pipeline_task: {e}")
         return {"status": "failed", "error": str(e)}
 
 
-@celery_app.task
-def rank_resumes_task(jd_id: str, user_id: str):
+@celery_app.task(bind=True)
+def rank_resumes_task(self, jd_id: str, user_id: str):
     """
     Celery task to rank resumes using the in-app async DatabaseProfileRanker service.
     Replaces the old subprocess-based approach to avoid blocking workers.
-    This task is unchanged and will continue to be used when the frontend triggers resume-ranking.
+    Returns a manifest; ranked rows are read from ranked_candidates_from_resume.
     """
     logger = logging.getLogger(__name__)
     logger.info(f"Celery worker: Starting resume ranking for JD ID: {jd_id} user_id: {user_id}")
@@ -133,17 +170,75 @@ def rank_resumes_task(jd_id: str, user_id: str):
         # Run the async runner synchronously using asyncio.run
         results = asyncio.run(ranker.run(jd_id))
 
-        # After the ranker has written results to DB, fetch the final detailed rows
-        try:
-            rpc_params = {'jd_id_param': jd_id}
-            ranked_response = supabase.rpc('get_ranked_resumes_with_details', rpc_params).execute()
-            final_results = ranked_response.data if getattr(ranked_response, 'data', None) else []
-        except Exception as e:
-            logger.exception("Failed to fetch ranked results via RPC, returning runner results as fallback.")
-            final_results = results or []
-
-        logger.info(f"Celery worker: Resume ranking finished. Found {len(final_results)} candidates.")
-        return {"status": "completed", "result": final_results}
+        manifest = _ranking_manifest(
+            supabase, "ranked_candidates_from_resume", jd_id, "ranked_candidates_from_resume"
+        )
+        manifest["newly_ranked"] = len(results or [])
+        logger.info(f"Celery worker: Resume ranking finished. {manifest['ranked_count']} ranked resumes for JD {jd_id}.")
+        return manifest
     except Exception as e:
         logger.exception(f"An error occurred during resume ranking task: {e}")
         return {"status": "failed", "error": str(e)}
+
+
+@celery_app.task(bind=True)
+def ingest_resumes_task(self, jd_id: str, user_id: str, job_dir: str, files: list, scope_id: str = None):
+    """
+    Celery task for bulk resume uploads. `files` are the spooled uploads
+    ({"filename", "path"}) written under `job_dir` by /upload/resumes;
+    `scope_id` is the org whose parse cache is shared.
+    Per-file progress is published as PROGRESS state meta so
+    /upload/resumes/jobs/{task_id} can report it while the job runs.
+    """
+    logger = logging.getLogger(__name__)
+    logger.info(f"Celery worker: Starting resume ingestion of {len(files)} files for JD ID: {jd_id}")
+
+    from pathlib import Path
+    from app.services.resume_ingestion_service import IngestionProgress, ingest_resumes, remove_job_dir
+    from app.dependencies import get_supabase_client
+
+    progress = IngestionProgress(
+        [f["filename"] for f in files],
+        on_change=lambda meta: self.update_state(state="PROGRESS", meta=meta),
+    )
+    try:
+        summary = asyncio.run(ingest_resumes(get_supabase_client(), files, jd_id, user_id, progress, scope_id))
+        return {"status": "completed", "jd_id": jd_id, **summary, **progress.snapshot()}
+    except Exception as e:
+        logger.exception(f"An error occurred during resume ingestion task: {e}")
+        return {"status": "failed", "jd_id": jd_id, "error": str(e), **progress.snapshot()}
+    finally:
+        remove_job_dir(Path(job_dir))
+
+
+@celery_app.task(bind=True, acks_late=True)
+def ingest_resume_zip_task(self, jd_id: str, user_id: str, job_dir: str, zip_path: str, scope_id: str = None):
+    """
+    Celery task for ZIP resume imports uploaded to /upload/resumes/zip.
+    Entries are streamed out of the archive a window at a time (see
+    zip_import_service). acks_late lets a task lost with its worker be
+    redelivered; the rerun resumes from the checkpoint in `job_dir`.
+    Progress is published as PROGRESS state meta, like ingest_resumes_task.
+    """
+    logger = logging.getLogger(__name__)
+    logger.info(f"Celery worker: Starting ZIP resume import for JD ID: {jd_id}")
+
+    from pathlib import Path
+    from app.services.resume_ingestion_service import IngestionProgress, remove_job_dir
+    from app.services.zip_import_service import import_resume_zip
+    from app.dependencies import get_supabase_client
+
+    def progress_factory(filenames):
+        return IngestionProgress(filenames, on_change=lambda meta: self.update_state(state="PROGRESS", meta=meta))
+
+    progress = None
+    try:
+        summary, progress = asyncio.run(import_resume_zip(
+            get_supabase_client(), Path(zip_path), Path(job_dir), jd_id, user_id, progress_factory, scope_id
+        ))
+        return {"status": "completed", "jd_id": jd_id, **summary, **progress.snapshot()}
+    except Exception as e:
+        logger.exception(f"An error occurred during ZIP resume import task: {e}")
+        return {"status": "failed", "jd_id": jd_id, "error": str(e), **(progress.snapshot() if progress else {})}
+    finally:
+        remove_job_dir(Path(job_dir))
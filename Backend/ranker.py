@@ -96,28 +96,35 @@ class ProfileRanker:
 
     # ### CLI UPDATE ###: Method now requires a jd_id to filter queries
     async def get_unranked_candidates(self, jd_id: str) -> List[Dict]:
-        """Fetches unranked candidates for a specific jd_id."""
+        """
+        Fetches candidates for a specific jd_id that need scoring: never ranked, or
+        ranked against an older JD fingerprint (those carry the stale `rank_id`).
+        """
         try:
             logger.info(f"Fetching candidates for JD ID: {jd_id}...")
             
             # Filter all queries by the provided jd_id
+            jd_response = self.supabase.table("jds").select("summary_fingerprint").eq("jd_id", jd_id).execute()
             resumes_response = self.supabase.table("resume").select("...").eq("jd_id", jd_id).execute()
             searches_response = self.supabase.table("search").select("...").eq("jd_id", jd_id).execute()
-            ranked_response = self.supabase.table("ranked_candidates").select("profile_id").eq("jd_id", jd_id).execute()
+            ranked_response = self.supabase.table("ranked_candidates").select("rank_id,profile_id,jd_fingerprint").eq("jd_id", jd_id).execute()
             
+            fingerprint = jd_response.data[0].get("summary_fingerprint") if jd_response.data else None
             resumes = resumes_response.data if resumes_response.data else []
             searches = searches_response.data if searches_response.data else []
-            ranked_ids = {r["profile_id"] for r in ranked_response.data} if ranked_response.data else set()
+            ranked_rows = ranked_response.data or []
+            ranked_ids = {r["profile_id"] for r in ranked_rows if fingerprint is None or r.get("jd_fingerprint") == fingerprint}
+            stale = {r["profile_id"]: r["rank_id"] for r in ranked_rows if r["profile_id"] not in ranked_ids}
             
-            logger.info(f"Found {len(resumes)} resumes, {len(searches)} searches. {len(ranked_ids)} candidates are already ranked for this JD.")
+            logger.info(f"Found {len(resumes)} resumes, {len(searches)} searches. {len(ranked_ids)} candidates are already ranked for this JD, {len(stale)} against an outdated JD.")
             
             candidates = []
             for r in resumes:
                 if r["resume_id"] not in ranked_ids:
-                    candidates.append({"jd_id": r["jd_id"], "profile_id": r["resume_id"], "person_name": r.get("person_name"), "role": r.get("role"), "company": r.get("company"), "summary": r.get("json_content"), "source": "resume"})
+                    candidates.append({"jd_id": r["jd_id"], "profile_id": r["resume_id"], "person_name": r.get("person_name"), "role": r.get("role"), "company": r.get("company"), "summary": r.get("json_content"), "source": "resume", "rank_id": stale.get(r["resume_id"])})
             for s in searches:
                 if s["profile_id"] not in ranked_ids:
-                    candidates.append({"jd_id": s["jd_id"], "profile_id": s["profile_id"], "person_name": s.get("profile_name"), "role": s.get("role"), "company": s.get("company"), "summary": s.get("summary"), "source": "search"})
+                    candidates.append({"jd_id": s["jd_id"], "profile_id": s["profile_id"], "person_name": s.get("profile_name"), "role": s.get("role"), "company": s.get("company"), "summary": s.get("summary"), "source": "search", "rank_id": stale.get(s["profile_id"])})
             
             logger.info(f"Found {len(candidates)} unranked candidates for this JD.")
             return candidates
@@ -259,9 +266,9 @@ Based on your detailed analysis from Step 1, now create a single JSON object wit
                 if "Error" in formatted_summary:
                     raise Exception(formatted_summary)
 
-                ranking_data = {"user_id": self.config.user_id, "jd_id": candidate["jd_id"], "profile_id": candidate["profile_id"], "rank": None, "match_score": match_score, "strengths": formatted_summary}
+                ranking_data = {"user_id": self.config.user_id, "jd_id": candidate["jd_id"], "profile_id": candidate["profile_id"], "rank": None, "match_score": match_score, "strengths": formatted_summary, "jd_fingerprint": jd.get("summary_fingerprint")}
                 
-                self.supabase.table("ranked_candidates").insert(ranking_data).execute()
+                self._save_ranking(ranking_data, candidate.get("rank_id"))
                 logger.info(f"Professionally ranked {candidate['profile_id']}: {match_score:.1f}%")
                 
                 return {"profile_id": candidate["profile_id"], "match_score": match_score, "strengths": formatted_summary}
@@ -275,11 +282,19 @@ Based on your detailed analysis from Step 1, now create a single JSON object wit
                     logger.error(f"Failed to rank candidate {candidate['profile_id']} after {self.config.max_retries} attempts.")
                     try:
                         error_ranking = {"user_id": self.config.user_id, "jd_id": candidate["jd_id"], "profile_id": candidate["profile_id"], "rank": None, "match_score": 0.0, "strengths": f"Evaluation failed: {error_str[:500]}"}
-                        self.supabase.table("ranked_candidates").insert(error_ranking).execute()
+                        self._save_ranking(error_ranking, candidate.get("rank_id"))
                     except Exception as db_error:
                         logger.error(f"Failed to save error ranking: {db_error}")
                     return None
 
+    def _save_ranking(self, ranking_data: Dict, rank_id: Optional[str] = None):
+        """Insert a new ranking, or rescore a stale row in place (keeps favorite/outreach flags)."""
+        table = self.supabase.table("ranked_candidates")
+        if rank_id:
+            table.update(ranking_data).eq("rank_id", rank_id).execute()
+        else:
+            table.insert(ranking_data).execute()
+
     async def process_candidates_batch(self, candidates: List[Dict]) -> List[Dict]:
         """Processes candidates in smaller batches suitable for the powerful model."""
         # This function remains the same
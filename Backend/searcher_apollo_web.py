@@ -107,6 +107,10 @@ LOCATION_INDICATORS = os.getenv("DR_LOCATION_INDICATORS", "india,mumbai,bangalor
 LOG_LEVEL = os.getenv("DR_LOG_LEVEL", "INFO")
 ENABLE_AUDIT_TRAIL = os.getenv("DR_ENABLE_AUDIT_TRAIL", "true").lower() == "true"
 
+# Persistence Configuration
+# Rows per upsert request when saving candidates; failing chunks are bisected.
+SAVE_CHUNK_SIZE = max(1, int(os.getenv("DR_SAVE_CHUNK_SIZE", "50")))
+
 # Fallback behavior
 MAX_MODEL_FALLBACKS = int(os.getenv("DR_MAX_MODEL_FALLBACKS", "3"))
 FALLBACK_BACKOFF_SEC = float(os.getenv("DR_FALLBACK_BACKOFF_SEC", "1.0"))
@@ -118,6 +122,24 @@ class SearchMode(str, Enum):
     APOLLO_AND_WEB = "apollo_and_web"
 
 
+@dataclass
+class SaveResult:
+    """Outcome of save_candidates_to_supabase, split by what the database did with each row."""
+    new_rows: List[dict]
+    existing_rows: List[dict]
+    failed_rows: List[dict]
+    requests: int = 0
+
+    def __bool__(self) -> bool:
+        # Truthy when every candidate is now present in the table (new or already known).
+        return bool(self.new_rows or self.existing_rows) and not self.failed_rows
+
+
+def search_dedup_key(name: Optional[str], company: Optional[str]) -> str:
+    """Natural key for the `search` table; mirrors search_set_dedup_key() in the DB."""
+    return f"{(name or '').strip().lower()}|{(company or '').strip().lower()}"
+
+
 class Candidate(BaseModel):
     """Structured candidate schema with evidence tracking."""
     full_name: str = Field(description="Full name of the candidate")
@@ -1239,18 +1261,61 @@ class EnhancedDeepResearchAgent:
         
         return "continue_research"
 
-    def save_candidates_to_supabase(self, candidates: List[dict], jd_id: str, user_id: str) -> bool:
-        """Save validated candidates to Supabase."""
+    def _upsert_search_chunk(self, rows: List[dict], result: SaveResult) -> None:
+        """
+        Upsert one chunk; on failure split it in half and retry each half, so a
+        single bad row is isolated in O(log n) requests instead of n.
+        """
+        result.requests += 1
+        try:
+            response = (
+                self.supabase.table("search")
+                .upsert(rows, on_conflict="jd_id,dedup_key", ignore_duplicates=True)
+                .execute()
+            )
+        except Exception as err:
+            if len(rows) == 1:
+                self._log("ERROR", f"❌ Failed: {rows[0]['profile_name']}: {err}")
+                result.failed_rows.append(rows[0])
+                return
+            mid = len(rows) // 2
+            self._log("WARNING", f"Chunk of {len(rows)} failed ({err}); bisecting")
+            self._upsert_search_chunk(rows[:mid], result)
+            self._upsert_search_chunk(rows[mid:], result)
+            return
+
+        # ignore_duplicates returns only the rows that were actually inserted.
+        inserted_ids = {r.get("profile_id") for r in (response.data or [])}
+        for row in rows:
+            if row["profile_id"] in inserted_ids:
+                result.new_rows.append(row)
+            else:
+                result.existing_rows.append(row)
+
+    def save_candidates_to_supabase(self, candidates: List[dict], jd_id: str, user_id: str) -> SaveResult:
+        """
+        Save validated candidates to Supabase with chunked upserts keyed on
+        (jd_id, lower(name), lower(company)). Returns a SaveResult listing which
+        rows were new and which were already known for this JD.
+        """
+        result = SaveResult(new_rows=[], existing_rows=[], failed_rows=[])
         if not candidates:
             self._log("WARNING", "No candidates to save")
-            return True
+            return result
         
         self._log("INFO", f"Saving {len(candidates)} candidates")
         
         rows = []
+        seen_keys: Set[str] = set()
         now = datetime.utcnow().isoformat()
         
         for candidate in candidates:
+            # Duplicate keys in one statement would be dropped by the DB anyway.
+            key = search_dedup_key(candidate["full_name"], candidate["current_company"])
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+
             # Build summary with source type
             source_type = candidate.get("source_type", "web")
             summary_parts = [
@@ -1290,41 +1355,17 @@ class EnhancedDeepResearchAgent:
             }
             rows.append(row)
         
-        try:
-            result = self.supabase.table("search").insert(rows).execute()
-            
-            if result.data:
-                self._log("INFO", f"✅ Saved {len(result.data)} candidates")
-                for i, c in enumerate(candidates, 1):
-                    source = c.get('source_type', 'unknown').upper()
-                    self._log("INFO", f"   {i}. {c['full_name']} ({source})")
-                return True
-            else:
-                self._log("ERROR", "No data returned")
-                return False
-            
-        except Exception as err:
-            self._log("ERROR", f"Save failed: {err}")
-            
-            # Try individual saves
-            self._log("INFO", "Trying individual saves...")
-            saved = 0
-            
-            for row in rows:
-                try:
-                    individual = self.supabase.table("search").insert([row]).execute()
-                    if individual.data:
-                        saved += 1
-                        self._log("INFO", f"✅ Saved: {row['profile_name']}")
-                except Exception as e:
-                    self._log("ERROR", f"❌ Failed: {row['profile_name']}")
-            
-            if saved > 0:
-                self._log("INFO", f"✅ Saved {saved}/{len(rows)} individually")
-                return True
-            else:
-                self._log("ERROR", "❌ Failed to save any")
-                return False
+        for i in range(0, len(rows), SAVE_CHUNK_SIZE):
+            self._upsert_search_chunk(rows[i:i + SAVE_CHUNK_SIZE], result)
+
+        self._log(
+            "INFO",
+            f"✅ Saved {len(result.new_rows)} new, {len(result.existing_rows)} already known, "
+            f"{len(result.failed_rows)} failed ({result.requests} requests)"
+        )
+        for i, row in enumerate(result.new_rows, 1):
+            self._log("INFO", f"   {i}. {row['profile_name']}")
+        return result
 
     def build_graph(self) -> StateGraph:
         """Build the research workflow graph."""
@@ -1499,8 +1540,10 @@ class EnhancedDeepResearchAgent:
                     iter_web = len(iteration_candidates) - iter_apollo
 
                     # Save to Supabase
-                    success = self.save_candidates_to_supabase(iteration_candidates, jd_id, resolved_user_id)
-                    if success:
+                    save_result = self.save_candidates_to_supabase(iteration_candidates, jd_id, resolved_user_id)
+                    if save_result.failed_rows:
+                        print(f"\n⚠️ Iteration {iteration}: {len(save_result.failed_rows)} candidates could not be saved")
+                    if save_result.new_rows or save_result.existing_rows:
                         all_saved.extend(iteration_candidates)
                         total_found += len(iteration_candidates)
                         apollo_count += iter_apollo
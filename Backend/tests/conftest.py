@@ -0,0 +1,21 @@
+# backend/tests/conftest.py
+# Behaviour tests for the backend services. Run from Backend/: python -m pytest tests
+import os
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+# `app.*` imports resolve from Backend/, the CLI package's `src.*` imports from
+# Backend/app/. The latter goes last: app/supabase.py would shadow the supabase package.
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+if str(BACKEND_DIR / "app") not in sys.path:
+    sys.path.append(str(BACKEND_DIR / "app"))
+
+# app.config requires these; the tests never reach the real services.
+for name in (
+    "SESSION_SECRET_KEY", "GOOGLE_CLIENT_ID", "GOOGLE_CLIENT_SECRET", "JWT_PRIVATE_KEY",
+    "JWT_PUBLIC_KEY", "DATABASE_URL", "SUPABASE_URL", "SUPABASE_KEY", "OPENAI_API_KEY",
+    "GEMINI_API_KEY",
+):
+    os.environ.setdefault(name, "test")
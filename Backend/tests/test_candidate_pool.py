@@ -0,0 +1,37 @@
+from src.core.candidate_pool import CandidatePool, candidate_keys, normalize_linkedin_url
+
+
+def test_seeds_are_kept_even_when_they_share_a_name_and_company():
+    # No company on either profile: both fall into the 'unknown' company bucket.
+    first = {"id": "pdl_1", "full_name": "Jane Doe"}
+    second = {"id": "pdl_2", "full_name": "jane doe"}
+
+    pool = CandidatePool([first, second])
+
+    assert len(pool) == 2
+    assert pool.get("pdl_1") is first
+    assert pool.get("pdl_2") is second
+
+
+def test_extend_dedups_against_the_seeds():
+    pool = CandidatePool([{"id": "a", "full_name": "Jane Doe", "current_company": "Acme"}])
+
+    added = pool.extend([
+        {"id": "b", "full_name": "JANE DOE", "current_company": " acme "},
+        {"id": "c", "linkedin_url": "https://www.linkedin.com/in/Sam-Lee/?trk=x"},
+        {"id": "d", "linkedin_url": "linkedin.com/in/sam-lee"},
+        {"id": "a"},
+    ])
+
+    assert [c["id"] for c in added] == ["c"]
+    assert [c["id"] for c in pool] == ["a", "c"]
+
+
+def test_placeholder_emails_are_not_identity_keys():
+    keys = candidate_keys({"id": "x", "email": "noreply@placeholder.email"})
+    assert keys == [("id", "x")]
+
+
+def test_normalize_linkedin_url():
+    assert normalize_linkedin_url("https://www.LinkedIn.com/in/Jane-Doe/?x=1") == "linkedin.com/in/jane-doe"
+    assert normalize_linkedin_url(None) is None
@@ -0,0 +1,85 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.base import Base
+from app.models.candidate import RankedCandidate, SearchProfile
+from app.services.ranked_candidates_service import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    fetch_ranked_page,
+)
+
+JD_ID = uuid.uuid4()
+USER_ID = uuid.uuid4()
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[RankedCandidate.__table__, SearchProfile.__table__])
+    with Session(engine) as session:
+        yield session
+
+
+def _add_ranked(db, scores, jd_id=JD_ID):
+    for i, score in enumerate(scores):
+        profile_id = uuid.uuid4()
+        db.add(SearchProfile(profile_id=profile_id, jd_id=jd_id, profile_name=f"Candidate {i}"))
+        db.add(RankedCandidate(
+            rank_id=uuid.uuid4(), user_id=USER_ID, jd_id=jd_id, profile_id=profile_id,
+            match_score=None if score is None else Decimal(str(score)), strengths="long text",
+        ))
+    db.commit()
+
+
+def _all_pages(db, limit, **kwargs):
+    pages, cursor = [], None
+    while True:
+        page = fetch_ranked_page(db, str(JD_ID), limit=limit, cursor=cursor, **kwargs)
+        pages.append(page["data"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    rank_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(Decimal("87.50"), rank_id)) == (Decimal("87.50"), rank_id)
+    assert decode_cursor(encode_cursor(None, rank_id)) == (Decimal("0"), rank_id)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", encode_cursor(Decimal("1"), uuid.uuid4())[:-4]])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_keyset_pages_cover_every_row_once_in_score_order(db):
+    # Ties and NULL scores exercise the (score, rank_id) tie-break.
+    _add_ranked(db, [90, 75.5, 75.5, 75.5, None, 60, 60, 10, None])
+    _add_ranked(db, [99], jd_id=uuid.uuid4())
+
+    pages = _all_pages(db, limit=2)
+
+    rows = [row for page in pages for row in page]
+    assert [len(page) for page in pages] == [2, 2, 2, 2, 1]
+    assert len({row["rank_id"] for row in rows}) == 9
+    keys = [(row["match_score"] or 0, row["rank_id"]) for row in rows]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_fields_projection_and_min_score(db):
+    _add_ranked(db, [80, 40])
+
+    page = fetch_ranked_page(db, str(JD_ID), fields=["profile_name"], min_score=50)
+
+    assert page["next_cursor"] is None
+    assert [set(row) for row in page["data"]] == [
+        {"profile_id", "rank_id", "match_score", "profile_name", "source"}
+    ]
+    assert page["data"][0]["profile_name"] == "Candidate 0"
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+
+from app.services import resume_parsing_service as parsing
+
+
+def _item(item_id, tokens, text="Jane Doe jane@example.org", fields=("person_name",)):
+    return {"id": item_id, "text": text, "parsed": None, "fields": list(fields), "excerpt": text, "tokens": tokens}
+
+
+@pytest.fixture
+def batch_limits(monkeypatch):
+    def set_limits(size, budget):
+        monkeypatch.setattr(parsing.settings, "RESUME_BATCH_SIZE", size)
+        monkeypatch.setattr(parsing.settings, "RESUME_BATCH_TOKEN_BUDGET", budget)
+    return set_limits
+
+
+def test_pack_batches_respects_token_budget_and_item_cap(batch_limits):
+    batch_limits(size=3, budget=100)
+    items = [_item(i, tokens) for i, tokens in enumerate([40, 10, 30, 20, 10, 5])]
+
+    batches = parsing._pack_batches(items)
+
+    assert [[it["tokens"] for it in batch] for batch in batches] == [[5, 10, 10], [20, 30, 40]]
+    assert sorted(it["id"] for batch in batches for it in batch) == list(range(6))
+
+
+def test_pack_batches_sends_an_oversized_resume_alone(batch_limits):
+    batch_limits(size=8, budget=100)
+
+    batches = parsing._pack_batches([_item(0, 30), _item(1, 500), _item(2, 30)])
+
+    assert [[it["id"] for it in batch] for batch in batches] == [[0, 2], [1]]
+    assert parsing._pack_batches([]) == []
+
+
+@pytest.mark.parametrize("answer", [
+    None,
+    {"id": 1, "person_name": "N/A"},
+    {"id": 1, "person_name": "  unknown "},
+    {"id": 1, "person_name": "John Smith"},
+])
+def test_batch_answer_is_rejected(answer):
+    assert not parsing._matches_source(answer, _item(1, 10))
+
+
+def test_batch_answer_needs_json_content_when_requested():
+    item = _item(1, 10, fields=("person_name", "json_content"))
+    blank = {"email": "", "skills": [], "experience": []}
+
+    assert not parsing._matches_source({"person_name": "Jane Doe", "json_content": blank}, item)
+    assert parsing._matches_source({"person_name": "Jane Doe", "json_content": {"email": "jane@example.org"}}, item)
+
+
+def test_parse_stream_sends_batches_before_finish(monkeypatch, batch_limits):
+    batch_limits(size=2, budget=10 ** 6)
+    monkeypatch.setattr(parsing.settings, "RESUME_HYBRID_PARSE", False)
+    sent = []
+
+    def fake_run_batch(batch):
+        sent.append([item["id"] for item in batch])
+        return {item["id"]: {"person_name": f"Person {item['id']}"} for item in batch}
+
+    monkeypatch.setattr(parsing, "_run_batch", fake_run_batch)
+
+    async def ingest():
+        stream = parsing.ResumeParseStream(max_workers=2)
+        for i in range(3):
+            await stream.add(i, f"resume text {i}")
+        # Let the full batch run while the last item is still waiting.
+        for _ in range(50):
+            if sent:
+                break
+            await asyncio.sleep(0.01)
+        sent_before_finish = [list(b) for b in sent]
+        return sent_before_finish, await stream.finish()
+
+    sent_before_finish, results = asyncio.run(ingest())
+
+    assert sent_before_finish == [[0, 1]]
+    assert sent == [[0, 1], [2]]
+    assert results == {i: {"person_name": f"Person {i}"} for i in range(3)}
+
+
+def test_parse_stream_reports_a_failed_batch_per_item(monkeypatch, batch_limits):
+    batch_limits(size=2, budget=10 ** 6)
+    monkeypatch.setattr(parsing.settings, "RESUME_HYBRID_PARSE", False)
+
+    def failing_run_batch(batch):
+        raise RuntimeError("quota exceeded")
+
+    monkeypatch.setattr(parsing, "_run_batch", failing_run_batch)
+
+    async def ingest():
+        stream = parsing.ResumeParseStream()
+        await stream.add(0, "resume text")
+        await stream.add(1, "resume text")
+        return await stream.finish()
+
+    results = asyncio.run(ingest())
+
+    assert set(results) == {0, 1}
+    assert all(isinstance(r, RuntimeError) for r in results.values())
@@ -0,0 +1,54 @@
+import pytest
+
+from app.schemas.parsing import ResumeDetails
+from app.services.resume_rule_parser import parse_resume_rules, resume_details
+
+RESUME = """{title}
+Jane Q Doe
+jane@example.org | +1 415 555 1234 | linkedin.com/in/janedoe
+Experience
+Senior Data Engineer at Acme Corp
+Jan 2020 - Present
+- Built the ingestion pipelines
+Data Analyst | Beta Inc (2017 - 2019)
+Education
+B.Tech Computer Science, IIT Delhi, 2017
+Skills
+Python, SQL, Spark
+"""
+
+
+@pytest.mark.parametrize("title", ["CURRICULUM VITAE", "Curriculum Vitae", "Resume", "Personal Profile:"])
+def test_document_title_is_not_taken_as_the_name(title):
+    parse = parse_resume_rules(RESUME.format(title=title))
+
+    assert parse.values["person_name"] == "Jane Q Doe"
+    # The title line above the name does not lower the name's confidence.
+    assert parse.confidence["person_name"] == 0.9
+
+
+@pytest.mark.parametrize("heading", ["PROFESSIONAL SUMMARY", "Work Experience", "Technical Skills"])
+def test_section_heading_is_not_a_name(heading):
+    parse = parse_resume_rules(f"{heading}\nBuilt data platforms for ten years.\n")
+    assert "person_name" not in parse.values
+
+
+def test_headline_fields():
+    parse = parse_resume_rules(RESUME.format(title="RESUME"))
+
+    assert parse.values["role"] == "Senior Data Engineer"
+    assert parse.values["company"] == "Acme Corp"
+    assert parse.values["profile_url"] == "https://www.linkedin.com/in/janedoe"
+    assert parse.values["skills"] == ["Python", "SQL", "Spark"]
+
+
+def test_resume_details_matches_the_llm_schema():
+    details = resume_details(parse_resume_rules(RESUME.format(title="RESUME")))
+
+    # Same json_content shape as the Gemini path, so both validate against ResumeDetails.
+    assert set(details) == set(ResumeDetails.model_fields)
+    ResumeDetails.model_validate(details)
+    assert details["experience"][0]["start_date"] == "Jan 2020"
+    assert details["experience"][0]["end_date"] == "Present"
+    assert details["experience"][1]["company"] == "Beta Inc"
+    assert details["education"] == [{"degree": "B.Tech Computer Science", "institution": "IIT Delhi", "year": "2017"}]
@@ -0,0 +1,83 @@
+import multiprocessing
+import os
+import time
+import uuid
+
+import pytest
+
+from app.services import text_extraction_service as extraction
+
+
+def _in_future(seconds):
+    return time.monotonic() + seconds
+
+
+def _extract_in_daemon(path, queue):
+    try:
+        pool = extraction.ExtractionPool(1)
+        worker_pid = pool.submit(_in_future(30), os.getpid).result()
+        queue.put((extraction.extract_text(path), worker_pid != os.getpid()))
+    except Exception as e:
+        queue.put((repr(e), None))
+
+
+def test_extraction_runs_in_worker_processes_inside_a_daemonic_process(tmp_path):
+    # Celery prefork workers are daemonic; multiprocessing would refuse to start children.
+    path = tmp_path / "resume.txt"
+    path.write_text(f"Jane Doe {uuid.uuid4()}")
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+
+    worker = ctx.Process(target=_extract_in_daemon, args=(path, queue), daemon=True)
+    worker.start()
+    text, used_child_process = queue.get(timeout=60)
+    worker.join(timeout=30)
+
+    assert text == path.read_text()
+    assert used_child_process is True
+
+
+def test_hung_task_worker_is_reclaimed():
+    # A single worker: if the hung process kept its slot, the next task could never run.
+    pool = extraction.ExtractionPool(1)
+    hung_pid = pool.submit(_in_future(30), os.getpid).result()
+
+    started = time.monotonic()
+    with pytest.raises(extraction.ExtractionTimeoutError):
+        pool.submit(_in_future(0.5), time.sleep, 60).result()
+    assert time.monotonic() - started < 10
+
+    assert pool.submit(_in_future(30), len, "abc").result() == 3
+    assert pool.submit(_in_future(30), os.getpid).result() != hung_pid
+    with pytest.raises(ProcessLookupError):
+        os.kill(hung_pid, 0)
+
+
+def test_task_errors_keep_the_worker():
+    pool = extraction.ExtractionPool(1)
+    pid = pool.submit(_in_future(30), os.getpid).result()
+
+    with pytest.raises(ValueError):
+        pool.submit(_in_future(30), int, "not a number").result()
+
+    assert pool.submit(_in_future(30), os.getpid).result() == pid
+
+
+def test_extract_text_times_out_only_the_slow_file(monkeypatch, tmp_path):
+    monkeypatch.setattr(extraction, "_pool", extraction.ExtractionPool(1))
+    slow = tmp_path / "slow.txt"
+    slow.write_text("slow")
+    fine = tmp_path / "fine.txt"
+    fine.write_text(f"fine {uuid.uuid4()}")
+    original = extraction._extract_whole
+
+    def hang_on_slow(path):
+        if path.endswith("slow.txt"):
+            time.sleep(60)
+        return original(path)
+
+    monkeypatch.setattr(extraction, "_extract_whole", hang_on_slow)
+
+    with pytest.raises(extraction.ExtractionTimeoutError, match="slow.txt"):
+        extraction.extract_text(slow, timeout=0.5)
+    assert extraction.extract_text(fine, timeout=30) == fine.read_text()
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import zipfile
+
+import pytest
+
+from app.services import zip_import_service as zip_import
+from app.services.resume_ingestion_service import STATUS_DONE, STATUS_FAILED, IngestionProgress
+
+# The archive fixture repeats an entry name on purpose.
+pytestmark = pytest.mark.filterwarnings("ignore:Duplicate name:UserWarning")
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = tmp_path / "resumes.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("team-a/cv.pdf", b"first")
+        zf.writestr("team-b/cv.pdf", b"second")
+        # Same name as the first entry, different content.
+        zf.writestr("team-a/cv.pdf", b"third")
+        zf.writestr("notes.exe", b"skip me")
+    return path
+
+
+@pytest.fixture
+def job_dir(tmp_path):
+    path = tmp_path / "job"
+    path.mkdir()
+    return path
+
+
+def _fake_ingest(calls, fail_window=None):
+    async def ingest(supabase, batch, jd_id, user_id, progress, scope_id):
+        calls.append([item["progress_index"] for item in batch])
+        # The first file finishes before the window fails.
+        progress.set(batch[0]["progress_index"], STATUS_DONE)
+        if len(calls) == fail_window:
+            raise RuntimeError("worker lost its database connection")
+        for item in batch[1:]:
+            progress.set(item["progress_index"], STATUS_DONE)
+        return {"successful_uploads": len(batch)}
+    return ingest
+
+
+def _run(archive, job_dir):
+    return asyncio.run(zip_import.import_resume_zip(None, archive, job_dir, "jd", "user", IngestionProgress))
+
+
+def test_failed_window_is_checkpointed_and_the_import_continues(monkeypatch, archive, job_dir):
+    calls = []
+    monkeypatch.setattr(zip_import.settings, "ZIP_IMPORT_WINDOW", 2)
+    monkeypatch.setattr(zip_import, "ingest_resumes", _fake_ingest(calls, fail_window=1))
+
+    summary, progress = _run(archive, job_dir)
+
+    assert calls == [[0, 1], [2]]
+    assert [f["status"] for f in progress.files] == [STATUS_DONE, STATUS_FAILED, STATUS_DONE, STATUS_FAILED]
+    assert summary["successful_uploads"] == 1
+    records = [json.loads(line) for line in (job_dir / zip_import.CHECKPOINT_FILE).read_text().splitlines()]
+    # Entries that share a name are checkpointed under distinct keys.
+    assert [(r["key"].split(":")[0], r["status"]) for r in records] == [
+        ("0", STATUS_DONE), ("1", STATUS_FAILED), ("2", STATUS_DONE),
+    ]
+
+
+def test_rerun_skips_checkpointed_entries(monkeypatch, archive, job_dir):
+    calls = []
+    monkeypatch.setattr(zip_import.settings, "ZIP_IMPORT_WINDOW", 2)
+    monkeypatch.setattr(zip_import, "ingest_resumes", _fake_ingest(calls, fail_window=1))
+    _run(archive, job_dir)
+
+    calls.clear()
+    _, progress = _run(archive, job_dir)
+
+    assert calls == []
+    assert [f["status"] for f in progress.files][:3] == [STATUS_DONE, STATUS_FAILED, STATUS_DONE]
+
+
+def test_truncated_checkpoint_line_reruns_only_that_entry(monkeypatch, archive, job_dir):
+    entries, _ = zip_import.scan_archive(archive)
+    first = zip_import.entry_key(*entries[0])
+    (job_dir / zip_import.CHECKPOINT_FILE).write_text(
+        json.dumps({"key": first, "status": STATUS_DONE, "error": None}) + '\n{"key": "1:'
+    )
+    calls = []
+    monkeypatch.setattr(zip_import, "ingest_resumes", _fake_ingest(calls))
+
+    _run(archive, job_dir)
+
+    assert calls == [[1, 2]]
@@ -16,8 +16,43 @@ interface TaskStatusResponse {
   status: 'processing' | 'completed' | 'failed';
   data?: Candidate[];
   error?: string;
+  next_cursor?: string | null;
 }
 
+/**
+ * Polls a task results endpoint. Completed results are paged by the backend,
+ * so once the task is done every page is fetched by following `next_cursor`
+ * and the candidates are returned as one list.
+ */
+const getAllTaskResults = async (url: string, errorMessage: string): Promise<TaskStatusResponse> => {
+  const fetchPage = async (cursor?: string | null): Promise<TaskStatusResponse> => {
+    const pageUrl = cursor ? `${url}?cursor=${encodeURIComponent(cursor)}` : url;
+    const response = await fetch(pageUrl, {
+      method: 'GET',
+      credentials: 'include',
+    });
+
+    if (!response.ok) {
+      const errorData = await response.json().catch(() => ({ detail: errorMessage }));
+      throw new Error(errorData.detail || errorMessage);
+    }
+
+    return response.json();
+  };
+
+  const first = await fetchPage();
+  if (first.status !== 'completed') return first;
+
+  const data = [...(first.data ?? [])];
+  let cursor = first.next_cursor;
+  while (cursor) {
+    const page = await fetchPage(cursor);
+    data.push(...(page.data ?? []));
+    cursor = page.next_cursor;
+  }
+  return { ...first, data, next_cursor: null };
+};
+
 // --- MAIN SEARCH & RANK PIPELINE ---
 
 /**
@@ -87,21 +122,10 @@ export const startApolloSearchTask = async (jdId: string, prompt: string, search
 /**
  * Polls the backend for the result of the search and rank task.
  * @param taskId The ID of the background task.
- * @returns The current status of the task and the final data if completed.
+ * @returns The current status of the task and, once completed, every ranked candidate.
  */
 export const getSearchResults = async (taskId: string): Promise<TaskStatusResponse> => {
-  // 2. Prepend API_URL and remove '/api'
-  const response = await fetch(`${API_URL}/search/search/results/${taskId}`, {
-    method: 'GET',
-    credentials: 'include', // 3. Keep credentials: 'include'
-  });
-
-  if (!response.ok) {
-    const errorData = await response.json().catch(() => ({ detail: 'Failed to get task results' }));
-    throw new Error(errorData.detail || 'Failed to get task results');
-  }
-
-  return response.json();
+  return getAllTaskResults(`${API_URL}/search/search/results/${taskId}`, 'Failed to get task results');
 };
 
 
@@ -135,21 +159,10 @@ export const startRankResumesTask = async (jdId: string, prompt: string): Promis
 /**
  * Polls the backend for the result of the resume ranking task.
  * @param taskId The ID of the background task.
- * @returns The current status of the task and the final data if completed.
+ * @returns The current status of the task and, once completed, every ranked resume.
  */
 export const getRankResumesResults = async (taskId: string): Promise<TaskStatusResponse> => {
-  // 2. Prepend API_URL and remove '/api'
-  const response = await fetch(`${API_URL}/search/rank-resumes/results/${taskId}`, {
-    method: 'GET',
-    credentials: 'include', // 3. Keep credentials: 'include'
-  });
-
-  if (!response.ok) {
-    const errorData = await response.json().catch(() => ({ detail: 'Failed to get resume ranking results' }));
-    throw new Error(errorData.detail || 'Failed to get resume ranking results');
-  }
-
-  return response.json();
+  return getAllTaskResults(`${API_URL}/search/rank-resumes/results/${taskId}`, 'Failed to get resume ranking results');
 };
 
 
@@ -29,17 +29,37 @@ export const uploadJdFile = async (file: File) => {
   return response.json();
 };
 
+export interface ResumeUploadFileStatus {
+  filename: string;
+  status: 'queued' | 'extracting' | 'parsing' | 'storing' | 'done' | 'duplicate' | 'failed';
+  error: string | null;
+}
+
+export interface ResumeUploadJobStatus {
+  status: 'queued' | 'processing' | 'completed' | 'failed';
+  total?: number;
+  done?: number;
+  duplicates?: number;
+  failed?: number;
+  files?: ResumeUploadFileStatus[];
+  successful_uploads?: number;
+  duplicate_uploads?: number;
+  failed_uploads?: { filename: string; error: string | null }[];
+  error?: string;
+}
+
 /**
  * Uploads multiple resume files for a specific JD.
  *
  * This function sends the `jdId` in the form data, aligning it
- * with the backend's `/upload/resumes` endpoint.
+ * with the backend's `/upload/resumes` endpoint. Parsing runs as a
+ * background job; poll `getResumeUploadJob` with the returned task_id.
  *
  * @param files The list of resume files to upload.
  * @param jdId The ID of the job description to associate the resumes with.
- * @returns The result of the upload process from the backend.
+ * @returns The background job's task_id and the number of accepted files.
  */
-export const uploadResumeFiles = async (files: FileList, jdId: string): Promise<{ success: boolean; message: string }> => {
+export const uploadResumeFiles = async (files: FileList, jdId: string): Promise<{ task_id: string; status: 'processing'; total: number }> => {
   const formData = new FormData();
   
   formData.append('jd_id', jdId);
@@ -62,4 +82,28 @@ export const uploadResumeFiles = async (files: FileList, jdId: string): Promise<
   }
 
   return response.json();
-};
\ No newline at end of file
+};
+
+/**
+ * Polls the progress of a bulk resume upload job.
+ * @param taskId The task_id returned by `uploadResumeFiles`.
+ * @returns Overall counts and per-file status.
+ */
+export const getResumeUploadJob = async (taskId: string): Promise<ResumeUploadJobStatus> => {
+  const response = await fetch(`${API_URL}/upload/resumes/jobs/${encodeURIComponent(taskId)}`, {
+    method: 'GET',
+    credentials: 'include',
+  });
+
+  // Unknown, expired or someone else's job: the status will never change, so stop polling.
+  if (response.status === 404) {
+    throw new Error('Upload job not found or expired.');
+  }
+
+  if (!response.ok) {
+    const errorData = await response.json().catch(() => ({ detail: 'Failed to get upload status' }));
+    throw new Error(errorData.detail || 'Failed to get upload status');
+  }
+
+  return response.json();
+};
@@ -3,7 +3,7 @@ import { Header } from '../components/layout/Header';
 import { CandidateRow } from '../components/ui/CandidateRow';
 import { Plus, UploadCloud, Search as SearchIcon, SendHorizonal, Bot, Eye, History, RefreshCw, XCircle } from 'lucide-react';
 import type { User } from '../types/user';
-import { uploadJdFile, uploadResumeFiles } from '../api/upload';
+import { uploadJdFile, uploadResumeFiles, getResumeUploadJob } from '../api/upload';
 import { fetchJdsForUser, type JdSummary } from '../api/roles';
 import CandidatePopupCard from '../components/ui/CandidatePopupCard';
 import JdPopupCard from '../components/ui/JdPopupCard'; // <-- NEW IMPORT
@@ -250,9 +250,21 @@ export function SearchPage({ user }: { user: User }) {
 
     try {
       if (resumeFiles && resumeFiles.length > 0) {
-        await uploadResumeFiles(resumeFiles, currentJd.jd_id);
+        const uploadJob = await uploadResumeFiles(resumeFiles, currentJd.jd_id);
         setResumeFiles(null);
         if (resumeInputRef.current) resumeInputRef.current.value = "";
+
+        // Resumes are parsed in a background job; wait for it before ranking.
+        let job = await getResumeUploadJob(uploadJob.task_id);
+        while (job.status === 'queued' || job.status === 'processing') {
+          setUploadStatus({
+            message: `Processing resumes... ${(job.done ?? 0) + (job.duplicates ?? 0)}/${job.total ?? uploadJob.total}`,
+            type: 'success',
+          });
+          await new Promise((resolve) => setTimeout(resolve, 2000));
+          job = await getResumeUploadJob(uploadJob.task_id);
+        }
+        if (job.status === 'failed') throw new Error(job.error || 'Resume processing failed.');
         setUploadStatus({ message: 'Resumes uploaded. Starting ranking...', type: 'success' });
       }
 